@@ -4,6 +4,9 @@ from .models.player_model import Player
 from .models.league_model import League
 from .models.season_model import Season
 from .models.match_model import Match
+from .models.standings_snapshot_model import StandingsSnapshot
+from .models.player_team_spell_model import PlayerTeamSpell
+from .models.team_rating_model import TeamRating
 
 # Register your models here.
 admin.site.register(PlayerStats)
@@ -13,4 +16,7 @@ admin.site.register(CustomUser)
 admin.site.register(Player)
 admin.site.register(League)
 admin.site.register(Season)
-admin.site.register(Match)
\ No newline at end of file
+admin.site.register(Match)
+admin.site.register(StandingsSnapshot)
+admin.site.register(PlayerTeamSpell)
+admin.site.register(TeamRating)
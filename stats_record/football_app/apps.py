@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class FootballAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'football_app'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .db_pool import record_connection_opened
+
+        connection_created.connect(record_connection_opened)
@@ -0,0 +1,43 @@
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+def authenticate_request(request):
+    """Resolve the user of a plain Django request, outside of DRF views.
+
+    Middleware runs before DRF authenticates the request, so API clients
+    sending a JWT still look anonymous there. Falls back to the session user.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        result = None
+    if result is None:
+        return user or AnonymousUser()
+    return result[0]
+
+
+def get_request_user_id(request):
+    """Return the id of the user making the request without loading the user.
+
+    Reads the JWT claim directly; falls back to the user id stored in the
+    session, if any, so the user row is never queried.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            return str(authentication.get_validated_token(raw_token)[jwt_settings.USER_ID_CLAIM])
+        except (InvalidToken, TokenError, KeyError):
+            return None
+    session = getattr(request, 'session', None)
+    user_id = session.get(SESSION_KEY) if session is not None else None
+    return str(user_id) if user_id is not None else None
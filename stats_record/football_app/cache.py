@@ -0,0 +1,39 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import record_cache_lookup
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    """Records cache hits and misses in the ``football_cache_requests`` metric."""
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.metrics_alias = params.get('METRICS_ALIAS', 'default')
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version=version)
+        if value is _missing:
+            record_cache_lookup(self.metrics_alias, hit=False)
+            return default
+        record_cache_lookup(self.metrics_alias, hit=True)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        if values:
+            record_cache_lookup(self.metrics_alias, hit=True, count=len(values))
+        if len(keys) > len(values):
+            record_cache_lookup(self.metrics_alias, hit=False, count=len(keys) - len(values))
+        return values
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    pass
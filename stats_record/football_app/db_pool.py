@@ -0,0 +1,49 @@
+import time
+
+from django.db import connections
+
+from .metrics import DB_CONNECTIONS_OPENED, DB_POOL
+
+# Seconds between two samples of the pool gauges in a worker.
+POOL_STATS_INTERVAL = 15
+
+_pool_stats_sampled_at = float('-inf')
+
+
+def prewarm_connections():
+    """Open a connection on every alias so the first request skips the handshake.
+
+    Called from gunicorn's ``post_worker_init`` hook. In pool mode this opens
+    the pool (``min_size`` connections); in persistent mode the connection is
+    kept for ``CONN_MAX_AGE`` seconds and reused by the worker's requests.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        if getattr(connection, 'pool', None):
+            connection.close()  # hand it back to the pool
+    record_pool_stats()
+
+
+def record_pool_stats():
+    for connection in connections.all(initialized_only=True):
+        pool = getattr(connection, 'pool', None)
+        if pool:
+            stats = pool.get_stats()
+            DB_POOL.labels(connection.alias, 'size').set(stats.get('pool_size', 0))
+            DB_POOL.labels(connection.alias, 'available').set(stats.get('pool_available', 0))
+            DB_POOL.labels(connection.alias, 'waiting').set(stats.get('requests_waiting', 0))
+        else:
+            DB_POOL.labels(connection.alias, 'open').set(int(connection.connection is not None))
+
+
+def sample_pool_stats():
+    """``record_pool_stats``, at most once every ``POOL_STATS_INTERVAL`` seconds per worker."""
+    global _pool_stats_sampled_at
+    now = time.monotonic()
+    if now - _pool_stats_sampled_at >= POOL_STATS_INTERVAL:
+        _pool_stats_sampled_at = now
+        record_pool_stats()
+
+
+def record_connection_opened(sender, connection, **kwargs):
+    DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
@@ -0,0 +1,40 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_read_from_replica = ContextVar('football_app_read_from_replica', default=False)
+
+
+def start_replica_reads():
+    """Send ORM reads to a read replica until ``stop_replica_reads(token)``."""
+    return _read_from_replica.set(True)
+
+
+def stop_replica_reads(token):
+    _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Routes reads to a random replica while replica reads are switched on.
+
+    ``ReplicaRoutingMiddleware`` switches them on for safe requests to
+    football_app views. Everything else (writes, migrations, management
+    commands, non-GET requests) goes to ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICA_ALIASES
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
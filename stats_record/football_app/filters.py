@@ -0,0 +1,30 @@
+import django_filters
+
+from .models import PlayerStats
+from .models.model_player_stat import EFFICIENCY_FIELDS
+
+
+def _range_filters(names):
+    """``<name>__gte`` and ``<name>__lte`` filters on annotated fields."""
+    filters = {}
+    for name in names:
+        filters[f'{name}__gte'] = django_filters.NumberFilter(field_name=name, lookup_expr='gte')
+        filters[f'{name}__lte'] = django_filters.NumberFilter(field_name=name, lookup_expr='lte')
+    return filters
+
+
+class PlayerStatsFilter(django_filters.FilterSet):
+    """Filters PlayerStats by player, team, season and match, and by the efficiency annotations.
+
+    Expects a queryset from ``PlayerStats.objects.with_efficiency()``.
+    """
+
+    class Meta:
+        model = PlayerStats
+        fields = ['player', 'current_team', 'season_played', 'match_type', 'start_match']
+
+    @classmethod
+    def get_filters(cls):
+        filters = super().get_filters()
+        filters.update(_range_filters(EFFICIENCY_FIELDS))
+        return filters
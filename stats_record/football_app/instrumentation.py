@@ -0,0 +1,133 @@
+import heapq
+import os
+import time
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+_current_stats = ContextVar('football_app_request_stats', default=None)
+
+# Frames from the instrumentation itself say nothing about where a query came from.
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+_IGNORED_PATHS = (
+    os.path.abspath(__file__),
+    os.path.join(_APP_DIR, 'middleware'),
+    os.path.join(_APP_DIR, 'serializers', 'base_serializer.py'),
+)
+
+
+class RequestStats:
+    """Accumulates database and serialization time for a single request.
+
+    Instances are used as ``execute_wrapper`` callables, so every statement
+    executed while :meth:`track` is active is counted and timed.
+
+    Attributes:
+        query_count (int): Number of statements executed.
+        query_time (float): Total time spent in the database, in seconds.
+        timings (dict): Extra named timings (e.g. ``serializer``), in seconds.
+        statements (list): Every statement executed, when ``capture_statements`` is set.
+    """
+
+    def __init__(self, keep_slowest=5, capture_statements=False):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.timings = defaultdict(float)
+        self.keep_slowest = keep_slowest
+        self.statements = [] if capture_statements else None
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.query_time += duration
+            self._record(sql, duration, context['connection'].alias)
+
+    def _record(self, sql, duration, alias):
+        if self.statements is not None:
+            self.statements.append({
+                'sql': sql,
+                'alias': alias,
+                'duration_ms': round(duration * 1000, 3),
+            })
+        if not self.keep_slowest:
+            return
+        # Only walk the stack for statements that make it into the top N.
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, (duration, self.query_count, sql, alias, _query_origin()))
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (duration, self.query_count, sql, alias, _query_origin()))
+
+    @property
+    def slowest(self):
+        """Return the slowest statements, slowest first."""
+        return [
+            {
+                'sql': sql,
+                'alias': alias,
+                'duration_ms': round(duration * 1000, 3),
+                'origin': origin,
+            }
+            for duration, _, sql, alias, origin in sorted(self._slowest, reverse=True)
+        ]
+
+    def add_timing(self, name, seconds):
+        self.timings[name] += seconds
+
+    @contextmanager
+    def track(self):
+        """Install this object on every database connection and make it current."""
+        token = _current_stats.set(self)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self))
+                yield self
+        finally:
+            _current_stats.reset(token)
+
+
+def current_stats():
+    """Return the :class:`RequestStats` of the request being handled, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` timing."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_timing(name, time.perf_counter() - start)
+
+
+def _query_origin():
+    """Return the frame that led to the current statement.
+
+    Prefers the innermost frame of our own code; falls back to the innermost
+    library frame outside ``django.db`` (e.g. a DRF mixin evaluating a queryset).
+    """
+    base_dir = str(settings.BASE_DIR)
+    fallback = None
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename.startswith(_IGNORED_PATHS) or f'{os.sep}django{os.sep}db{os.sep}' in filename:
+            continue
+        if filename.startswith(base_dir) and 'site-packages' not in filename:
+            return f'{filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}'
+        if fallback is None:
+            fallback = f'{filename}:{frame.lineno} in {frame.name}'
+    return fallback
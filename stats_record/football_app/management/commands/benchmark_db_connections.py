@@ -0,0 +1,75 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares per-request database latency of a fresh connection per request "
+        "with the configured connection mode (DB_CONNECTION_MODE)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode.')
+        parser.add_argument('--database', default='default', help='Database alias to benchmark.')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        connection = connections[options['database']]
+        count = options['requests']
+
+        before = [self.fresh_connection_request(connection) for _ in range(count)]
+        opened = []
+
+        def count_opened(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(count_opened, weak=False, dispatch_uid='benchmark_db_connections')
+        try:
+            after = [self.configured_request(connection) for _ in range(count)]
+        finally:
+            connection_created.disconnect(dispatch_uid='benchmark_db_connections')
+
+        self.report('new connection per request', before, connections_opened=count)
+        self.report(f'DB_CONNECTION_MODE={settings.DB_CONNECTION_MODE}', after, connections_opened=len(opened))
+        speedup = statistics.median(before) / statistics.median(after)
+        self.stdout.write(self.style.SUCCESS(f'median speed-up: {speedup:.1f}x'))
+
+    def fresh_connection_request(self, connection):
+        # What every request paid without CONN_MAX_AGE: connect (TLS, backend startup), query, close.
+        start = time.perf_counter()
+        raw = connection.Database.connect(**connection.get_connection_params())
+        try:
+            cursor = raw.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            cursor.close()
+        finally:
+            raw.close()
+        return time.perf_counter() - start
+
+    def configured_request(self, connection):
+        # Same query through Django's request cycle, which reuses or recycles connections.
+        start = time.perf_counter()
+        request_started.send(sender=self.__class__)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        request_finished.send(sender=self.__class__)
+        return time.perf_counter() - start
+
+    def report(self, label, timings, connections_opened):
+        if self.verbosity > 1:
+            self.stdout.write(f'{label}: ' + ' '.join(f'{timing * 1000:.2f}' for timing in timings) + ' (ms)')
+        timings = sorted(timings)
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f'{label:<40} {len(timings)} requests, {connections_opened} connections opened  '
+            f'mean {statistics.mean(timings) * 1000:7.2f}ms  p50 {statistics.median(timings) * 1000:7.2f}ms  '
+            f'p95 {p95 * 1000:7.2f}ms  max {timings[-1] * 1000:7.2f}ms'
+        )
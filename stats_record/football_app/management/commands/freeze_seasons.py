@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...models import Season
+from ...services.freeze_service import SeasonNotEnded, freeze_season
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders ended seasons into static gzipped JSON artefacts. Seasons already frozen are "
+        "only re-rendered when their data changed, so it is safe to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', help='Season ID to freeze; all ended seasons when omitted.')
+        parser.add_argument('--force', action='store_true', help='Re-render even if the data did not change.')
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.live().select_related('league')
+        if options['season']:
+            seasons = seasons.filter(pk=options['season'])
+            if not seasons.exists():
+                raise CommandError(f"Season {options['season']} does not exist.")
+        else:
+            seasons = seasons.filter(is_current=False, end_date__lt=timezone.localdate())
+        for season in seasons.iterator():
+            try:
+                frozen = freeze_season(season, force=options['force'])
+            except SeasonNotEnded as error:
+                raise CommandError(str(error))
+            self.stdout.write(f'Froze {season}' if frozen else f'{season} is unchanged')
@@ -0,0 +1,39 @@
+from datetime import date, time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Season
+from ...services.fixture_service import DEFAULT_KICK_OFF, generate_season_fixtures
+
+
+class Command(BaseCommand):
+    help = "Generates a season's double round-robin fixtures between its league's teams."
+
+    def add_arguments(self, parser):
+        parser.add_argument('season', help='Season ID.')
+        parser.add_argument('--start-date', type=date.fromisoformat, help='First matchday (YYYY-MM-DD); the season start by default.')
+        parser.add_argument('--days-between', type=int, default=7, help='Days between matchdays.')
+        parser.add_argument('--kick-off', type=time.fromisoformat, default=DEFAULT_KICK_OFF, help='Kick-off time (HH:MM).')
+        parser.add_argument('--replace', action='store_true', help="Replace the season's existing scheduled fixtures.")
+
+    def handle(self, *args, **options):
+        try:
+            season = Season.objects.select_related('league').get(pk=options['season'])
+        except (Season.DoesNotExist, ValueError):
+            raise CommandError(f"Season {options['season']} does not exist.")
+        if options['days_between'] < 1:
+            raise CommandError('--days-between must be at least 1.')
+        try:
+            matches = generate_season_fixtures(
+                season,
+                start_date=options['start_date'],
+                days_between=options['days_between'],
+                kick_off=options['kick_off'],
+                replace=options['replace'],
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.stdout.write(
+            f'Created {len(matches)} fixtures for {season}, '
+            f'{matches[0].match_date:%Y-%m-%d} to {matches[-1].match_date:%Y-%m-%d}'
+        )
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...views.schema_view import SCHEMA_FORMATS, UNVERSIONED, generate_schema, schema_artefact_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the OpenAPI schema for the current CODE_VERSION into OPENAPI_SCHEMA_DIR, "
+        "so API workers serve it without walking the views. Run it at deploy time."
+    )
+
+    def handle(self, *args, **options):
+        if settings.CODE_VERSION == UNVERSIONED:
+            raise CommandError('Set CODE_VERSION (e.g. to the git SHA): an unversioned schema artefact could be served after the next deploy.')
+        for schema_format in SCHEMA_FORMATS:
+            path = schema_artefact_path(schema_format)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(generate_schema(schema_format))
+            self.stdout.write(f'Wrote {path}')
+        self.stdout.write(self.style.SUCCESS(f'OpenAPI schema generated for {settings.CODE_VERSION}'))
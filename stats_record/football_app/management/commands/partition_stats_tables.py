@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.partition_service import PartitioningError, partition_stats_tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Partitions the PlayerStats and TeamStats tables by season on PostgreSQL. "
+        "Run with --convert once to rebuild the existing tables (locks them while their rows are copied), "
+        "then again whenever seasons are added to create their partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true', help='Rebuild tables that are not partitioned yet as partitioned tables.')
+        parser.add_argument('--season', type=UUID, action='append', dest='seasons', help='Season ID to create a partition for; all seasons when omitted.')
+
+    def handle(self, *args, **options):
+        try:
+            created = partition_stats_tables(convert=options['convert'], season_ids=options['seasons'])
+        except PartitioningError as error:
+            raise CommandError(str(error))
+        if not created:
+            self.stdout.write('No partitioned tables; run with --convert to partition them.')
+        for table, names in created.items():
+            self.stdout.write(f'{table}: created {len(names)} partitions')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ...models import League, Season, Team
+from ...services.deletion_service import DELETE_BATCH_SIZE, delete_in_batches
+
+
+class Command(BaseCommand):
+    help = "Deletes the leagues, seasons and teams still marked for deletion, e.g. after a lost background job."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE, help='Rows deleted per statement.')
+
+    def handle(self, *args, **options):
+        # Teams and seasons first: deleting a league would cascade into them anyway.
+        for model in (Team, Season, League):
+            for pk in model.objects.pending_deletion().values_list('pk', flat=True):
+                delete_in_batches(model, pk, options['batch_size'])
+                self.stdout.write(f'Deleted {model._meta.verbose_name} {pk}')
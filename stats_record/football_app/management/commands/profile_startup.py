@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots a fresh interpreter and reports per-app import, models and ready() times, "
+        "plus settings, middleware and URLconf loading."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            default=os.environ.get('DJANGO_SETTINGS_MODULE'),
+            help='Settings module to boot, e.g. stats_record.settings_api.',
+        )
+        parser.add_argument('--runs', type=int, default=3, help='Boots to average over.')
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': options['profile'],
+            'PYTHONPATH': os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.environ.get('PYTHONPATH')])),
+        }
+        runs = [self.boot(env) for _ in range(options['runs'])]
+
+        def average(get):
+            return sum(get(run) for run in runs) / len(runs) * 1000
+
+        self.stdout.write(f"Startup of {options['profile']} (average of {len(runs)} runs, ms)")
+        self.stdout.write(f"{'app':<28}{'import':>9}{'models':>9}{'ready':>9}{'total':>9}")
+        rows = {
+            label: [average(lambda run: run['apps'][label].get(phase, 0)) for phase in ('import', 'models', 'ready')]
+            for label in runs[0]['apps']
+        }
+        for label, row in sorted(rows.items(), key=lambda item: -sum(item[1])):
+            self.stdout.write(f"{label:<28}{row[0]:9.1f}{row[1]:9.1f}{row[2]:9.1f}{sum(row):9.1f}")
+        for phase in ('settings', 'setup', 'middleware', 'urlconf', 'total'):
+            self.stdout.write(f"{phase:<28}{'':>27}{average(lambda run: run[phase]):9.1f}")
+
+    def boot(self, env):
+        result = subprocess.run(
+            [sys.executable, '-m', 'football_app.startup_profile'],
+            env=env,
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Booting {env["DJANGO_SETTINGS_MODULE"]} failed:\n{result.stderr}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
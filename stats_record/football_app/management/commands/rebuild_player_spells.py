@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Player
+from ...services.career_service import rebuild_player_spells
+
+
+class Command(BaseCommand):
+    help = "Rebuilds players' team spells (career timelines) from their PlayerStats."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--player', help='Player ID to rebuild; all players when omitted.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Players rebuilt per transaction.')
+
+    def handle(self, *args, **options):
+        players = Player.objects.order_by('pk').values_list('pk', flat=True)
+        if options['player']:
+            players = players.filter(pk=options['player'])
+        batch, rebuilt = [], 0
+        for player_id in players.iterator():
+            batch.append(player_id)
+            if len(batch) >= options['batch_size']:
+                rebuild_player_spells(batch)
+                rebuilt, batch = rebuilt + len(batch), []
+        if batch:
+            rebuild_player_spells(batch)
+            rebuilt += len(batch)
+        self.stdout.write(f'Rebuilt team spells for {rebuilt} players')
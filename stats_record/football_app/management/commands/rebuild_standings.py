@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Season
+from ...services.standings_service import rebuild_standings_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-matchday standings snapshots from completed matches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', help='Season ID to rebuild; all seasons when omitted.')
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.all()
+        if options['season']:
+            seasons = seasons.filter(pk=options['season'])
+        for season in seasons.iterator():
+            rebuild_standings_snapshots(season.pk)
+            self.stdout.write(f'Rebuilt standings snapshots for {season}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ...services.rating_service import rebuild_team_ratings, update_team_ratings
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the Elo team ratings from completed matches, in one streaming pass over every league."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only re-rate matches from this date-time (ISO 8601) on.')
+
+    def handle(self, *args, **options):
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('Use an ISO 8601 date-time for --since.')
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            update_team_ratings(since)
+            self.stdout.write(f'Re-rated matches since {since}')
+        else:
+            rebuild_team_ratings()
+            self.stdout.write('Rebuilt team ratings')
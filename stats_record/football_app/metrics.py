@@ -0,0 +1,78 @@
+"""Prometheus metrics exported on ``/metrics``.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (as it must be under multi-worker
+gunicorn) every worker writes its samples to that directory and the
+``/metrics`` view aggregates them with a ``MultiProcessCollector``.
+"""
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+REQUEST_LATENCY = Histogram(
+    'football_http_request_duration_seconds',
+    'Time spent handling a request, by URL name and method.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'football_http_requests',
+    'Requests handled, by URL name, method and status code.',
+    ['view', 'method', 'status'],
+)
+RESPONSE_SIZE = Histogram(
+    'football_http_response_size_bytes',
+    'Size of non-streaming response bodies.',
+    ['view', 'method'],
+    buckets=SIZE_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'football_db_queries_per_request',
+    'Number of SQL statements executed per request.',
+    ['view', 'method'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    'football_db_duration_seconds',
+    'Time spent in the database per request.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+SERIALIZER_DURATION = Histogram(
+    'football_serializer_duration_seconds',
+    'Time spent in serializers per request.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'football_cache_requests',
+    'Cache lookups, by cache alias and result (hit or miss).',
+    ['cache', 'result'],
+)
+DB_CONNECTIONS_OPENED = Counter(
+    'football_db_connections_opened',
+    'New database connections established, by alias.',
+    ['alias'],
+)
+DB_POOL = Gauge(
+    'football_db_pool_connections',
+    'Connection pool state, by alias: size, available, waiting (pool mode) or open (persistent mode).',
+    ['alias', 'state'],
+    multiprocess_mode='livesum',
+)
+
+
+def record_cache_lookup(alias, hit, count=1):
+    CACHE_REQUESTS.labels(alias, 'hit' if hit else 'miss').inc(count)
+
+
+def metrics_registry():
+    """Return the registry to expose, aggregating all workers in multiprocess mode."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
@@ -0,0 +1,38 @@
+import time
+
+from .. import metrics
+from ..db_pool import sample_pool_stats
+
+
+class PrometheusMetricsMiddleware:
+    """Records request latency, response size, DB and serializer time per URL name.
+
+    Must sit above ``QueryBudgetMiddleware`` so the per-request ``query_stats``
+    collected there are available once the response comes back.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else '<unresolved>'
+        method = request.method
+
+        metrics.REQUEST_LATENCY.labels(view, method).observe(duration)
+        metrics.REQUESTS.labels(view, method, str(response.status_code)).inc()
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(view, method).observe(len(response.content))
+
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            metrics.DB_QUERIES.labels(view, method).observe(stats.query_count)
+            metrics.DB_DURATION.labels(view, method).observe(stats.query_time)
+            if 'serializer' in stats.timings:
+                metrics.SERIALIZER_DURATION.labels(view, method).observe(stats.timings['serializer'])
+        sample_pool_stats()
+        return response
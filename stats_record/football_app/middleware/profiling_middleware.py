@@ -0,0 +1,106 @@
+import cProfile
+import json
+import marshal
+import pstats
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from ..authentication import authenticate_request
+from ..instrumentation import RequestStats
+from ..profiling import SORT_KEYS, collapsed_stacks, top_functions
+from ..views.permissions import IsSuperAdmin
+
+
+class ProfilingMiddleware:
+    """Runs a request under cProfile when a superadmin adds ``?_profile=<format>``.
+
+    Formats:
+        ``1`` or ``json``: top functions (``_profile_sort`` = cumulative, tottime
+        or calls), collapsed stacks and the SQL executed, as JSON.
+        ``collapsed``: collapsed stacks only, ready for flamegraph.pl/speedscope.
+        ``pstats``: the raw profile, for snakeviz or ``python -m pstats``.
+
+    When ``PROFILE_STORAGE_DIR`` is set the profile, stacks and SQL are also
+    written there. Requests without ``_profile`` only pay for a substring check.
+    """
+
+    permission = IsSuperAdmin()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if '_profile=' not in request.META.get('QUERY_STRING', ''):
+            return self.get_response(request)
+
+        request.user = authenticate_request(request)
+        if not self.permission.has_permission(request, None):
+            return self.get_response(request)
+
+        stats = RequestStats(keep_slowest=0, capture_statements=True)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with stats.track():
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        total = time.perf_counter() - start
+        return self.profile_response(request, response, profiler, stats, total)
+
+    def profile_response(self, request, response, profiler, stats, total):
+        profile = pstats.Stats(profiler)
+        output = request.GET.get('_profile')
+        collapsed = collapsed_stacks(profile)
+        stored = self.store(request, profile, collapsed, stats)
+
+        if output == 'collapsed':
+            return HttpResponse(collapsed, content_type='text/plain; charset=utf-8')
+        if output == 'pstats':
+            dump = HttpResponse(marshal.dumps(profile.stats), content_type='application/octet-stream')
+            dump['Content-Disposition'] = 'attachment; filename="profile.prof"'
+            return dump
+
+        sort = request.GET.get('_profile_sort', 'cumulative')
+        if sort not in SORT_KEYS:
+            sort = 'cumulative'
+        try:
+            limit = int(request.GET.get('_profile_limit', 50))
+        except ValueError:
+            limit = 50
+        return JsonResponse({
+            'method': request.method,
+            'path': request.path,
+            'status_code': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'sql_count': stats.query_count,
+            'sql_time_ms': round(stats.query_time * 1000, 3),
+            'sql': stats.statements,
+            'sort': sort,
+            'functions': top_functions(profile, sort=sort, limit=limit),
+            'collapsed_stacks': collapsed,
+            'stored': stored,
+        })
+
+    def store(self, request, profile, collapsed, stats):
+        directory = getattr(settings, 'PROFILE_STORAGE_DIR', None)
+        if not directory:
+            return None
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        url_name = request.resolver_match.url_name if request.resolver_match else 'unresolved'
+        stem = directory / f'{timezone.now():%Y%m%dT%H%M%S%f}-{request.method.lower()}-{url_name}'
+
+        profile.dump_stats(f'{stem}.prof')
+        Path(f'{stem}.collapsed').write_text(collapsed)
+        Path(f'{stem}.sql.json').write_text(json.dumps(stats.statements, indent=2))
+        return {
+            'profile': f'{stem}.prof',
+            'collapsed_stacks': f'{stem}.collapsed',
+            'sql': f'{stem}.sql.json',
+        }
@@ -0,0 +1,100 @@
+import logging
+import time
+
+from django.conf import settings
+
+from ..instrumentation import RequestStats
+
+logger = logging.getLogger('football_app.query_budget')
+
+
+class QueryBudgetMiddleware:
+    """Counts queries and database time per request and enforces per-view budgets.
+
+    Budgets come from ``settings.QUERY_BUDGET``; the ``VIEWS`` entry maps URL
+    names to overrides of the ``DEFAULT`` budget. Requests that go over budget
+    are logged together with their slowest statements and where in the code
+    they were issued. Every response gets a ``Server-Timing`` header splitting
+    the request time into database, serializer and render time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'QUERY_BUDGET', {})
+        self.default_budget = config.get('DEFAULT', {})
+        self.view_budgets = config.get('VIEWS', {})
+        self.keep_slowest = config.get('SLOWEST_STATEMENTS', 5)
+        self.server_timing = config.get('SERVER_TIMING', True)
+
+    def __call__(self, request):
+        stats = RequestStats(keep_slowest=self.keep_slowest)
+        request.query_stats = stats
+        start = time.perf_counter()
+        with stats.track():
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        self.check_budget(request, stats, total)
+        if self.server_timing:
+            response['Server-Timing'] = self.server_timing_header(stats, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the render.
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            start = time.perf_counter()
+
+            def record_render(rendered):
+                stats.add_timing('render', time.perf_counter() - start)
+
+            response.add_post_render_callback(record_render)
+        return response
+
+    def get_budget(self, request):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        return {**self.default_budget, **self.view_budgets.get(url_name, {})}
+
+    def check_budget(self, request, stats, total):
+        budget = self.get_budget(request)
+        max_queries = budget.get('queries')
+        max_db_time_ms = budget.get('db_time_ms')
+        db_time_ms = stats.query_time * 1000
+
+        over_queries = max_queries is not None and stats.query_count > max_queries
+        over_time = max_db_time_ms is not None and db_time_ms > max_db_time_ms
+        if not (over_queries or over_time):
+            return
+
+        logger.warning(
+            'Query budget exceeded for %s %s: %d queries (budget %s), %.1fms in database (budget %s), %.1fms total',
+            request.method,
+            request.path,
+            stats.query_count,
+            max_queries,
+            db_time_ms,
+            max_db_time_ms,
+            total * 1000,
+            extra={
+                'url_name': request.resolver_match.url_name if request.resolver_match else None,
+                'query_count': stats.query_count,
+                'db_time_ms': db_time_ms,
+                'slowest_statements': stats.slowest,
+            },
+        )
+        for statement in stats.slowest:
+            logger.warning(
+                '  %.1fms [%s] %s (from %s)',
+                statement['duration_ms'],
+                statement['alias'],
+                statement['sql'],
+                statement['origin'],
+            )
+
+    def server_timing_header(self, stats, total):
+        entries = [f'db;dur={stats.query_time * 1000:.1f};desc="{stats.query_count} queries"']
+        for name in ('serializer', 'render'):
+            if name in stats.timings:
+                entries.append(f'{name};dur={stats.timings[name] * 1000:.1f}')
+        entries.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(entries)
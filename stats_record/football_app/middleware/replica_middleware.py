@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from ..authentication import get_request_user_id
+from ..db_router import start_replica_reads, stop_replica_reads
+
+
+class ReplicaRoutingMiddleware:
+    """Serves safe requests to football_app views from the read replicas.
+
+    After a successful write, the user's reads stay on the primary for
+    ``REPLICA_STICKINESS_SECONDS`` so they always see their own changes even
+    if the replicas lag. The pin lives in the cache, so use a shared (Redis)
+    cache when running several workers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.stickiness = settings.REPLICA_STICKINESS_SECONDS
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICA_ALIASES:
+            return self.get_response(request)
+
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                stop_replica_reads(request.replica_token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = get_request_user_id(request)
+            if user_id is not None:
+                cache.set(self.pin_key(user_id), True, self.stickiness)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.DATABASE_REPLICA_ALIASES:
+            return None
+        if request.method not in SAFE_METHODS or not view_func.__module__.startswith('football_app.'):
+            return None
+
+        user_id = get_request_user_id(request)
+        if user_id is not None and cache.get(self.pin_key(user_id)):
+            return None
+
+        # Reset in __call__, once the response has been rendered.
+        request.replica_token = start_replica_reads()
+        return None
+
+    @staticmethod
+    def pin_key(user_id):
+        return f'replica-pin:{user_id}'
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0002_standingssnapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='teamstats',
+            name='team_logo',
+        ),
+        migrations.AddField(
+            model_name='teamstats',
+            name='match',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='team_stats', to='football_app.match'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamstats',
+            constraint=models.UniqueConstraint(fields=('match', 'team_name'), name='unique_team_stats_per_match'),
+        ),
+    ]
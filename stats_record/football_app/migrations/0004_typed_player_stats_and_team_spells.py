@@ -0,0 +1,216 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:58
+
+import re
+from datetime import datetime
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+DATE_FIELDS = ['joined_team_at', 'left_team_at']
+MINUTE_FIELDS = ['sub_in_at', 'sub_out_at']
+ADDED_TIME_FIELDS = {'sub_in_at': 'sub_in_added_time', 'sub_out_at': 'sub_out_added_time'}
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%Y/%m/%d', '%d %B %Y', '%d %b %Y', '%B %d, %Y', '%b %d, %Y']
+BATCH_SIZE = 2000
+
+
+def parse_date_text(value):
+    """Parse a free-text date such as "2023-07-01", "01/07/2023" or "1 July 2023"."""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_minute_text(value):
+    """The match minute of a free-text minute such as "63", "63'" or "90+4" (90)."""
+    minutes = re.findall(r'\d+', value or '')
+    minute = int(minutes[0]) if minutes else 0
+    return minute if 0 < minute <= 32767 else None
+
+
+def parse_added_time_text(value):
+    """The added time of a free-text minute in stoppage time, e.g. 4 for "90+4"; None otherwise."""
+    if parse_minute_text(value) is None:
+        return None
+    minutes = re.findall(r'\d+', value or '')
+    added = int(minutes[1]) if len(minutes) > 1 else 0
+    return added if 0 < added <= 32767 else None
+
+
+def format_typed_value(value):
+    return None if value is None else str(value)
+
+
+def format_minute(minute, added_time):
+    if minute is None:
+        return None
+    return f'{minute}+{added_time}' if added_time else str(minute)
+
+
+def _convert(apps, conversions):
+    """Rewrite every PlayerStats row in batches.
+
+    ``conversions`` are ``(target, sources, convert)`` triples; ``convert``
+    gets the values of the ``sources`` fields.
+    """
+    PlayerStats = apps.get_model('football_app', 'PlayerStats')
+    targets = [target for target, _, _ in conversions]
+    sources = {source for _, names, _ in conversions for source in names}
+    batch = []
+    for stats in PlayerStats.objects.only('pk', *sources).iterator(chunk_size=BATCH_SIZE):
+        for target, names, convert in conversions:
+            setattr(stats, target, convert(*(getattr(stats, name) for name in names)))
+        batch.append(stats)
+        if len(batch) >= BATCH_SIZE:
+            PlayerStats.objects.bulk_update(batch, targets)
+            batch = []
+    PlayerStats.objects.bulk_update(batch, targets)
+
+
+def parse_text_columns(apps, schema_editor):
+    """Copy the free-text transfer dates and substitution minutes into the typed columns.
+
+    A minute in stoppage time, such as "45+2", keeps its added time in its
+    own column. Values that cannot be parsed are left empty.
+    """
+    _convert(
+        apps,
+        [(f'typed_{name}', [name], parse_date_text) for name in DATE_FIELDS]
+        + [(f'typed_{name}', [name], parse_minute_text) for name in MINUTE_FIELDS]
+        + [(ADDED_TIME_FIELDS[name], [name], parse_added_time_text) for name in MINUTE_FIELDS],
+    )
+
+
+def format_typed_columns(apps, schema_editor):
+    _convert(
+        apps,
+        [(name, [f'typed_{name}'], format_typed_value) for name in DATE_FIELDS]
+        + [(name, [f'typed_{name}', ADDED_TIME_FIELDS[name]], format_minute) for name in MINUTE_FIELDS],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0003_teamstats_match'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerTeamSpell',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('spell_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('joined_at', models.DateField(blank=True, null=True)),
+                ('left_at', models.DateField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='typed_joined_team_at',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='typed_left_team_at',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='typed_sub_in_at',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Match minute; 45 for 45+2', null=True),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='sub_in_added_time',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Minutes into stoppage time; 2 for 45+2', null=True),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='typed_sub_out_at',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Match minute; 45 for 45+2', null=True),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='sub_out_added_time',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Minutes into stoppage time; 2 for 45+2', null=True),
+        ),
+        migrations.RunPython(parse_text_columns, format_typed_columns),
+        migrations.RemoveField(
+            model_name='playerstats',
+            name='joined_team_at',
+        ),
+        migrations.RenameField(
+            model_name='playerstats',
+            old_name='typed_joined_team_at',
+            new_name='joined_team_at',
+        ),
+        migrations.RemoveField(
+            model_name='playerstats',
+            name='left_team_at',
+        ),
+        migrations.RenameField(
+            model_name='playerstats',
+            old_name='typed_left_team_at',
+            new_name='left_team_at',
+        ),
+        migrations.RemoveField(
+            model_name='playerstats',
+            name='sub_in_at',
+        ),
+        migrations.RenameField(
+            model_name='playerstats',
+            old_name='typed_sub_in_at',
+            new_name='sub_in_at',
+        ),
+        migrations.RemoveField(
+            model_name='playerstats',
+            name='sub_out_at',
+        ),
+        migrations.RenameField(
+            model_name='playerstats',
+            old_name='typed_sub_out_at',
+            new_name='sub_out_at',
+        ),
+        migrations.AddIndex(
+            model_name='playerstats',
+            index=models.Index(fields=['current_team', 'joined_team_at'], name='player_stats_team_joined_idx'),
+        ),
+        migrations.AddField(
+            model_name='playerteamspell',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='playerteamspell',
+            name='player',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_spells', to='football_app.player'),
+        ),
+        migrations.AddField(
+            model_name='playerteamspell',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_spells', to='football_app.team'),
+        ),
+        migrations.AddField(
+            model_name='playerteamspell',
+            name='updated_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='playerteamspell',
+            index=models.Index(fields=['player', 'joined_at'], name='player_spell_joined_idx'),
+        ),
+    ]
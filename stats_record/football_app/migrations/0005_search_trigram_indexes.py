@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# (index name, table, column) of the name columns searched by /search/.
+SEARCH_COLUMNS = [
+    ('player_first_name', 'football_app_player', 'first_name'),
+    ('player_last_name', 'football_app_player', 'last_name'),
+    ('team_team_name', 'football_app_team', 'team_name'),
+    ('league_name', 'football_app_league', 'name'),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    """Trigram GIN indexes for fuzzy matches and pattern indexes for prefix matches, on PostgreSQL only."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name}_trgm ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name}_prefix ON {table} (UPPER({column}::text) text_pattern_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}_trgm')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}_prefix')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0004_typed_player_stats_and_team_spells'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
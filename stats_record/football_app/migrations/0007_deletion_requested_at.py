@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0006_match_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
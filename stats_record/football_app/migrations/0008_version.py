@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0007_deletion_requested_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='playerstats',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='playerteamspell',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='standingssnapshot',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+        migrations.AddField(
+            model_name='teamstats',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0008_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playerstats',
+            index=models.Index(fields=['season_played', 'updated_at'], name='player_stats_season_upd_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:16
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0009_player_stats_season_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRating',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('version', models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, for optimistic concurrency control')),
+                ('rating_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('match_date', models.DateTimeField()),
+                ('rating_before', models.FloatField()),
+                ('rating_after', models.FloatField()),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_ratings', to='football_app.match')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ratings', to='football_app.team')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'match_date'], name='team_rating_team_date_idx'), models.Index(fields=['match_date'], name='team_rating_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('team', 'match'), name='unique_team_rating_per_match')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0010_teamrating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='frozen_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='frozen_manifest',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
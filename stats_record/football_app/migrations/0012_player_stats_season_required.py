@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def set_season_from_match(apps, schema_editor):
+    """Rows saved without a season take the season of their match."""
+    PlayerStats = apps.get_model('football_app', 'PlayerStats')
+    Match = apps.get_model('football_app', 'Match')
+    PlayerStats.objects.filter(season_played__isnull=True).update(
+        season_played=Subquery(Match.objects.filter(pk=OuterRef('match_type')).values('season')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0011_season_frozen'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_season_from_match, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='playerstats',
+            name='season_played',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='football_app.season'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:10
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Q
+
+
+def link_team_stats(apps, schema_editor):
+    """Link TeamStats entered by hand, before they had a match, to the match they describe.
+
+    Rows of a team against an opponent in a season are paired, oldest first,
+    with the completed matches between the two in kick-off order. Where the
+    match already has derived stats for the team, the hand-entered row is
+    superseded: its possession, which cannot be derived, is kept and the
+    row deleted. Rows left without a match stay as they are.
+    """
+    TeamStats = apps.get_model('football_app', 'TeamStats')
+    Match = apps.get_model('football_app', 'Match')
+
+    unlinked = defaultdict(list)
+    for stats in TeamStats.objects.filter(match__isnull=True).order_by('created_at', 'pk'):
+        unlinked[stats.season_id, stats.team_name_id, stats.opposing_team_name].append(stats)
+
+    for (season_id, team_id, opponent), rows in unlinked.items():
+        matches = Match.objects.filter(
+            Q(home_team_id=team_id, away_team__team_name=opponent) | Q(away_team_id=team_id, home_team__team_name=opponent),
+            season_id=season_id,
+            status='completed',
+        ).order_by('match_date', 'match_id')
+        for stats, match in zip(rows, matches):
+            derived = TeamStats.objects.filter(match=match, team_name_id=team_id).first()
+            if derived is None:
+                TeamStats.objects.filter(pk=stats.pk).update(match=match)
+                continue
+            if derived.match_possession is None and stats.match_possession is not None:
+                TeamStats.objects.filter(pk=derived.pk).update(match_possession=stats.match_possession)
+            stats.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_app', '0012_player_stats_season_required'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_team_stats, migrations.RunPython.noop),
+    ]
@@ -3,3 +3,10 @@ from .model_player_stat import PlayerStats
 from .model_team import Team
 from .model_team_stat import TeamStats
 from .base_model import BaseModel
+from .player_model import Player
+from .league_model import League
+from .season_model import Season
+from .match_model import Match
+from .standings_snapshot_model import StandingsSnapshot
+from .player_team_spell_model import PlayerTeamSpell
+from .team_rating_model import TeamRating
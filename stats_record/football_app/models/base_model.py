@@ -1,7 +1,22 @@
+from copy import deepcopy
 from django.utils import timezone
-from django.db import models
+from django.db import DatabaseError, models
 from django.conf import settings
 
+class DeferredDeletionQuerySet(models.QuerySet):
+    """QuerySet of models deleted in the background, which keep a ``deletion_requested_at`` until then."""
+
+    def live(self):
+        return self.filter(deletion_requested_at__isnull=True)
+
+    def pending_deletion(self):
+        return self.filter(deletion_requested_at__isnull=False)
+
+
+class ConcurrentUpdateError(DatabaseError):
+    """The row was changed by someone else since it was loaded (its version moved on)."""
+
+
 class BaseModel(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -19,13 +34,92 @@ class BaseModel(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False, help_text="Incremented on every update, for optimistic concurrency control")
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_loaded_values()
+        return instance
+
+    def _snapshot_loaded_values(self, fields=None):
+        """Remember the current value of the loaded fields, to detect changes on save."""
+        snapshot = getattr(self, '_loaded_values', {})
+        for field in fields or self._meta.concrete_fields:
+            if field.attname in self.__dict__:
+                value = self.__dict__[field.attname]
+                # JSON values are mutable, so compare against a copy.
+                snapshot[field.attname] = deepcopy(value) if isinstance(field, models.JSONField) else value
+        self._loaded_values = snapshot
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot_loaded_values(None if fields is None else [self._meta.get_field(name) for name in fields])
+
+    def get_changed_fields(self):
+        """Names of the fields changed since the instance was loaded or last saved."""
+        loaded = getattr(self, '_loaded_values', {})
+        deferred = self.get_deferred_fields()
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+            and (field.attname not in loaded or loaded[field.attname] != self.__dict__[field.attname])
+        ]
+
     def save(self, *args, **kwargs):
+        """Save, writing only the fields changed since load.
+
+        ``user`` (optional) is recorded as ``created_by``/``updated_by``. An
+        existing row is updated with ``update_fields`` set to the changed
+        fields plus ``updated_at`` and ``updated_by``, and not written at all
+        when nothing changed. Passing ``update_fields`` explicitly bypasses this.
+
+        Updates bump ``version`` and only apply while the row still has the
+        version it was loaded with (``UPDATE ... WHERE version = ?``); if
+        someone else updated it in between, ``ConcurrentUpdateError`` is raised.
+        """
         user = kwargs.pop('user', None)
-        if not self.pk:  # if the object is being created
-            self.created_by = user
-        self.updated_by = user
-        super().save(*args, **kwargs)
+        if user is not None:
+            if self._state.adding:  # if the object is being created
+                self.created_by = user
+            self.updated_by = user
+
+        tracked = not self._state.adding and hasattr(self, '_loaded_values')
+        if tracked and kwargs.get('update_fields') is None and not kwargs.get('force_insert') and not args:
+            changed = self.get_changed_fields()
+            if not changed:
+                return
+            kwargs['update_fields'] = {*changed, 'updated_at', 'updated_by'}
+
+        expected_version = getattr(self, '_loaded_values', {}).get('version') if tracked else None
+        if expected_version is not None:
+            self.version = expected_version + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        self._expected_version = expected_version
+        try:
+            super().save(*args, **kwargs)
+        except ConcurrentUpdateError:
+            self.version = expected_version
+            raise
+        finally:
+            self._expected_version = None
+        update_fields = kwargs.get('update_fields')
+        self._snapshot_loaded_values(
+            None if update_fields is None else [self._meta.get_field(name) for name in update_fields]
+        )
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if not super()._do_update(base_qs.filter(version=expected_version), using, pk_val, values, update_fields, True):
+            raise ConcurrentUpdateError(
+                f'{self._meta.label} {pk_val} was changed by someone else since version {expected_version}.'
+            )
+        return True
+
@@ -1,6 +1,6 @@
 from uuid import uuid4
 from django.db import models
-from .base_model import BaseModel
+from .base_model import BaseModel, DeferredDeletionQuerySet
 
 class League(BaseModel):
     """Represents a league for a MySQL database.
@@ -12,6 +12,8 @@ class League(BaseModel):
         founded_year (IntegerField): The year the league was founded.
         logo (ImageField): The league's logo path.
         teams (ManyToManyField): The teams participating in the league.
+        deletion_requested_at (DateTimeField): When deletion was requested; set while
+            the background job deletes the row and its dependents.
     """
     league_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     name = models.CharField(max_length=128, unique=True)
@@ -19,6 +21,9 @@ class League(BaseModel):
     founded_year = models.IntegerField()
     logo = models.ImageField(upload_to='league_logos/', null=True, blank=True)
     teams = models.ManyToManyField('Team', related_name='leagues', blank=True)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = DeferredDeletionQuerySet.as_manager()
 
     def __str__(self):
         return self.name
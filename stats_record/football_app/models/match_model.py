@@ -18,6 +18,9 @@ class Match(BaseModel):
         status (CharField): The status of the match (e.g., scheduled, completed).
         match_type (CharField): The type of match (e.g., league, knockout).
     """
+    SCHEDULED = 'scheduled'
+    COMPLETED = 'completed'
+
     match_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     season = models.ForeignKey('Season', on_delete=models.CASCADE, related_name='matches')
     league = models.ForeignKey('League', on_delete=models.CASCADE, related_name='matches')
@@ -27,7 +30,7 @@ class Match(BaseModel):
     venue = models.CharField(max_length=255)
     home_team_score = models.IntegerField(null=True, blank=True)
     away_team_score = models.IntegerField(null=True, blank=True)
-    status = models.CharField(max_length=20, default='scheduled')
+    status = models.CharField(max_length=20, default=SCHEDULED)
 
     MATCH_TYPE_CHOICES = [
         ('league', 'League'),
@@ -40,5 +43,13 @@ class Match(BaseModel):
     ]
     match_type = models.CharField(max_length=20, choices=MATCH_TYPE_CHOICES, default='league')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['match_date'], name='match_date_idx'),
+            models.Index(fields=['league', 'match_date'], name='match_league_date_idx'),
+            models.Index(fields=['home_team', 'match_date'], name='match_home_team_date_idx'),
+            models.Index(fields=['away_team', 'match_date'], name='match_away_team_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.home_team} vs {self.away_team} - {self.match_date.strftime('%Y-%m-%d')}"
@@ -1,7 +1,85 @@
 from uuid import uuid4
 from django.db import models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
 from .base_model import BaseModel
 
+MATCH_MINUTES = 90
+
+# name of the success rate -> paired counter prefix
+SUCCESS_RATES = {
+    'pass_success_rate': 'one_touch_pass',
+    'duel_success_rate': 'duel',
+    'dribble_success_rate': 'dribble',
+    'shot_success_rate': 'shoot',
+    'tackle_success_rate': 'tackle',
+    'penalty_success_rate': 'penalty_kick',
+    'cross_success_rate': 'cross',
+    'control_success_rate': 'control',
+    'interception_success_rate': 'interception',
+    'clearance_success_rate': 'clearance',
+}
+
+# name of the per-90 rate -> counters it adds up
+PER_90_RATES = {
+    'goals_per_90': ['goal_scored'],
+    'assists_per_90': ['assists'],
+    'shots_per_90': ['shoot_success', 'shoot_fail'],
+    'tackles_won_per_90': ['tackle_success'],
+    'interceptions_per_90': ['interception_success'],
+    'dribbles_completed_per_90': ['dribble_success'],
+}
+
+EFFICIENCY_FIELDS = ['minutes_played', *SUCCESS_RATES, *PER_90_RATES]
+
+
+def minutes_played():
+    """Minutes on the pitch of one PlayerStats row.
+
+    Starters play from kick-off, substitutes from ``sub_in_at``, both until
+    ``sub_out_at`` or the final whistle; a substitute never brought on played 0.
+    Stoppage time counts towards the minutes, as "90+4" is four minutes after "90".
+    """
+    came_on = Case(
+        When(start_match=True, then=Value(0)),
+        default=F('sub_in_at') + Coalesce('sub_in_added_time', 0),
+        output_field=models.IntegerField(),
+    )
+    went_off = Case(
+        When(sub_out_at__isnull=False, then=F('sub_out_at') + Coalesce('sub_out_added_time', 0)),
+        default=Value(MATCH_MINUTES),
+        output_field=models.IntegerField(),
+    )
+    return Case(
+        When(start_match=False, sub_in_at__isnull=True, then=Value(0)),
+        default=Greatest(went_off - came_on, Value(0)),
+        output_field=models.IntegerField(),
+    )
+
+
+def efficiency_expressions(total=F, minutes=None):
+    """Expressions of the success rates and per-90 rates, keyed by annotation name.
+
+    ``total`` maps a counter name to its expression, ``F`` for single rows or
+    ``Sum`` to rate a group of rows; ``minutes`` is the matching minutes played.
+    Rates with nothing to divide by are NULL.
+    """
+    minutes = minutes_played() if minutes is None else minutes
+    expressions = {}
+    for name, prefix in SUCCESS_RATES.items():
+        success, fail = total(f'{prefix}_success'), total(f'{prefix}_fail')
+        expressions[name] = Cast(success, FloatField()) / NullIf(success + fail, Value(0))
+    for name, counters in PER_90_RATES.items():
+        count = sum((total(counter) for counter in counters[1:]), total(counters[0]))
+        expressions[name] = Cast(count, FloatField()) * Value(float(MATCH_MINUTES)) / NullIf(minutes, Value(0))
+    return expressions
+
+
+class PlayerStatsQuerySet(models.QuerySet):
+    def with_efficiency(self):
+        """Annotate each row with ``minutes_played``, the success rates and the per-90 rates."""
+        return self.annotate(minutes_played=minutes_played()).annotate(**efficiency_expressions(minutes=F('minutes_played')))
+
 class PlayerStats(BaseModel):
     """Represents player statistics for a MySQL database.
     
@@ -10,13 +88,15 @@ class PlayerStats(BaseModel):
         player (ForeignKey): The player these statistics belong to.
         current_team (ForeignKey): The current team of the player.
         previous_team (ForeignKey): The previous team of the player.
-        joined_team_at (CharField): When the player joined the team.
-        left_team_at (CharField): When the player left the team.
+        joined_team_at (DateField): When the player joined the team.
+        left_team_at (DateField): When the player left the team.
         season_played (ForeignKey): The season the statistics were recorded.
         match_half_played (CharField): The match half played.
         start_match (BooleanField): Whether the player started the match.
-        sub_in_at (CharField): The time the player was substituted in.
-        sub_out_at (CharField): The time the player was substituted out.
+        sub_in_at (PositiveSmallIntegerField): The match minute the player was substituted in.
+        sub_in_added_time (PositiveSmallIntegerField): The minutes into stoppage time, if the player came on then.
+        sub_out_at (PositiveSmallIntegerField): The match minute the player was substituted out.
+        sub_out_added_time (PositiveSmallIntegerField): The minutes into stoppage time, if the player went off then.
         opposing_team (CharField): The opposing team.
         match_type (ForeignKey): The type of match.
         control_success (IntegerField): Number of successful controls.
@@ -64,13 +144,15 @@ class PlayerStats(BaseModel):
     player = models.ForeignKey('Player', on_delete=models.CASCADE, related_name='player_stats')
     current_team = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='current_team_stats')
     previous_team = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='previous_team_stats', null=True, blank=True)
-    joined_team_at = models.CharField(max_length=128, null=True, blank=True)
-    left_team_at = models.CharField(max_length=128, null=True, blank=True)
-    season_played = models.ForeignKey('Season', on_delete=models.CASCADE, related_name='player_stats', null=True)
+    joined_team_at = models.DateField(null=True, blank=True)
+    left_team_at = models.DateField(null=True, blank=True)
+    season_played = models.ForeignKey('Season', on_delete=models.CASCADE, related_name='player_stats')
     match_half_played = models.CharField(max_length=128, null=True, blank=True)
     start_match = models.BooleanField(default=False)
-    sub_in_at = models.CharField(max_length=128, null=True, blank=True)
-    sub_out_at = models.CharField(max_length=128, null=True, blank=True)
+    sub_in_at = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Match minute; 45 for 45+2")
+    sub_in_added_time = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Minutes into stoppage time; 2 for 45+2")
+    sub_out_at = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Match minute; 45 for 45+2")
+    sub_out_added_time = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Minutes into stoppage time; 2 for 45+2")
     opposing_team = models.CharField(max_length=128)
     match_type = models.ForeignKey('Match', on_delete=models.CASCADE, related_name='player_stats')
     control_success = models.IntegerField(default=0)
@@ -114,5 +196,13 @@ class PlayerStats(BaseModel):
     throw_in_fail = models.IntegerField(default=0)
     goal_scored_time = models.JSONField(default=list, help_text="List of times when goals were scored")
 
+    objects = PlayerStatsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['current_team', 'joined_team_at'], name='player_stats_team_joined_idx'),
+            models.Index(fields=['season_played', 'updated_at'], name='player_stats_season_upd_idx'),
+        ]
+
     def __str__(self):
         return f"Stats for {self.player} in {self.season_played}"
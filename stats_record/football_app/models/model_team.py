@@ -1,6 +1,6 @@
 from uuid import uuid4
 from django.db import models
-from .base_model import BaseModel
+from .base_model import BaseModel, DeferredDeletionQuerySet
 
 class Team(BaseModel):
     """Represents a team for a MySQL database.
@@ -11,12 +11,17 @@ class Team(BaseModel):
         team_logo (ImageField): The team's logo path.
         manager_name (CharField): The team's manager name.
         league (ForeignKey): The league in which the team competes.
+        deletion_requested_at (DateTimeField): When deletion was requested; set while
+            the background job deletes the row and its dependents.
     """
     team_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     team_name = models.CharField(max_length=128, unique=True)
     team_logo = models.ImageField(upload_to='team_logos/', null=True, blank=True)
     manager_name = models.CharField(max_length=128, null=True)
     league = models.ForeignKey('League', on_delete=models.CASCADE, related_name='teams_list', null=True)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = DeferredDeletionQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.team_name} - {self.league.name if self.league else 'No League'}"
@@ -10,8 +10,8 @@ class TeamStats(BaseModel):
         team_stat_id (UUIDField): The statistics ID (primary key).
         season (ForeignKey): The season the statistics were recorded.
         league (ForeignKey): The league in which the match was played.
-        team_name (ForeignKey): The name of the team (foreign key).
-        team_logo (ForeignKey): The logo of the team (foreign key).
+        match (ForeignKey): The match these statistics were derived from.
+        team_name (ForeignKey): The team (its name and logo are read from it).
         opposing_team_name (CharField): The name of the opposing team.
         match_outcome (CharField): Indicates the outcome of the match.
         match_goals (IntegerField): Number of goals scored in the match.
@@ -41,8 +41,8 @@ class TeamStats(BaseModel):
     team_stat_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     season = models.ForeignKey('Season', on_delete=models.CASCADE, related_name='team_stats')
     league = models.ForeignKey('League', on_delete=models.CASCADE, related_name='team_stats', null=True)
+    match = models.ForeignKey('Match', on_delete=models.CASCADE, related_name='team_stats', null=True, blank=True)
     team_name = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='team_stats')
-    team_logo = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='team_logo_stats')
     opposing_team_name = models.CharField(null=True, max_length=128)
     match_outcome = models.CharField(max_length=4, choices=MATCH_OUTCOME_CHOICES)
     match_goals = models.IntegerField(default=0)
@@ -52,5 +52,10 @@ class TeamStats(BaseModel):
     match_possession = models.FloatField(null=True, blank=True)
     players = models.ManyToManyField('Player', related_name='team_stats')
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['match', 'team_name'], name='unique_team_stats_per_match'),
+        ]
+
     def __str__(self):
         return f"Stats for {self.team_name.team_name} in {self.season}"
@@ -0,0 +1,27 @@
+from uuid import uuid4
+from django.db import models
+from .base_model import BaseModel
+
+class PlayerTeamSpell(BaseModel):
+    """Represents a period a player spent at a team, derived from their PlayerStats.
+
+    Attributes:
+        spell_id (UUIDField): The spell's ID.
+        player (ForeignKey): The player.
+        team (ForeignKey): The team the player was at.
+        joined_at (DateField): When the player joined the team, if known.
+        left_at (DateField): When the player left the team; empty while still there.
+    """
+    spell_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, related_name='team_spells')
+    team = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='player_spells')
+    joined_at = models.DateField(null=True, blank=True)
+    left_at = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['player', 'joined_at'], name='player_spell_joined_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.player} at {self.team} from {self.joined_at or '?'} to {self.left_at or 'now'}"
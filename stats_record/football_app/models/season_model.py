@@ -1,6 +1,6 @@
 from uuid import uuid4
 from django.db import models
-from .base_model import BaseModel
+from .base_model import BaseModel, DeferredDeletionQuerySet
 
 class Season(BaseModel):
     """Represents a season for a MySQL database.
@@ -12,6 +12,12 @@ class Season(BaseModel):
         start_date (DateField): The start date of the season.
         end_date (DateField): The end date of the season.
         is_current (BooleanField): Indicates if this is the current season.
+        deletion_requested_at (DateTimeField): When deletion was requested; set while
+            the background job deletes the row and its dependents.
+        frozen_at (DateTimeField): When the ended season was last rendered into static artefacts.
+        frozen_manifest (JSONField): The frozen artefacts (storage name, URL, size) by kind,
+            the fingerprint of the data they were rendered from, and when each
+            superseded artefact, kept until caches let go of it, was replaced.
     """
     season_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     league = models.ForeignKey('League', on_delete=models.CASCADE, related_name='seasons')
@@ -19,6 +25,11 @@ class Season(BaseModel):
     start_date = models.DateField()
     end_date = models.DateField()
     is_current = models.BooleanField(default=False)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+    frozen_at = models.DateTimeField(null=True, blank=True, editable=False)
+    frozen_manifest = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = DeferredDeletionQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.league.name} - {self.year}"
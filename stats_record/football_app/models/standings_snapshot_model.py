@@ -0,0 +1,26 @@
+from uuid import uuid4
+from django.db import models
+from .base_model import BaseModel
+
+class StandingsSnapshot(BaseModel):
+    """Represents the league table of a season after one matchday.
+
+    Attributes:
+        snapshot_id (UUIDField): The snapshot's ID.
+        season (ForeignKey): The season the table belongs to.
+        as_of (DateField): The matchday after which the table was taken.
+        standings (JSONField): The ordered table rows (team, played, won, drawn, lost,
+            goals_for, goals_against, goal_difference, points).
+    """
+    snapshot_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    season = models.ForeignKey('Season', on_delete=models.CASCADE, related_name='standings_snapshots')
+    as_of = models.DateField()
+    standings = models.JSONField(default=list, help_text="Ordered league table rows after this matchday")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'as_of'], name='unique_standings_snapshot_per_matchday'),
+        ]
+
+    def __str__(self):
+        return f"Standings of {self.season} on {self.as_of}"
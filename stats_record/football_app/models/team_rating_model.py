@@ -0,0 +1,33 @@
+from uuid import uuid4
+from django.db import models
+from .base_model import BaseModel
+
+class TeamRating(BaseModel):
+    """Represents a team's Elo rating before and after one completed match.
+
+    Attributes:
+        rating_id (UUIDField): The rating's ID.
+        team (ForeignKey): The rated team.
+        match (ForeignKey): The match that moved the rating.
+        match_date (DateTimeField): The match's kick-off, copied to order a team's history.
+        rating_before (FloatField): The team's rating going into the match.
+        rating_after (FloatField): The team's rating after the match.
+    """
+    rating_id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    team = models.ForeignKey('Team', on_delete=models.CASCADE, related_name='ratings')
+    match = models.ForeignKey('Match', on_delete=models.CASCADE, related_name='team_ratings')
+    match_date = models.DateTimeField()
+    rating_before = models.FloatField()
+    rating_after = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'match'], name='unique_team_rating_per_match'),
+        ]
+        indexes = [
+            models.Index(fields=['team', 'match_date'], name='team_rating_team_date_idx'),
+            models.Index(fields=['match_date'], name='team_rating_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} {self.rating_before:.0f} -> {self.rating_after:.0f}"
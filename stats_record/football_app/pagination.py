@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FixturePagination(CursorPagination):
+    """Pages of fixtures in kick-off order; the cursor seeks on the ``match_date`` index instead of counting an offset."""
+    ordering = ('match_date', 'match_id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,74 @@
+SORT_KEYS = {
+    'cumulative': 'cumtime_ms',
+    'tottime': 'tottime_ms',
+    'calls': 'ncalls',
+}
+
+
+def _label(func):
+    filename, lineno, name = func
+    if filename == '~':
+        return name  # built-ins, e.g. "<built-in method time.sleep>"
+    _, _, short = filename.rpartition('site-packages/')
+    return f'{name} ({short}:{lineno})'
+
+
+def top_functions(stats, sort='cumulative', limit=50):
+    """Return the ``limit`` most expensive functions of a ``pstats.Stats``."""
+    rows = [
+        {
+            'function': _label(func),
+            'ncalls': nc,
+            'primitive_calls': cc,
+            'tottime_ms': round(tt * 1000, 3),
+            'cumtime_ms': round(ct * 1000, 3),
+        }
+        for func, (cc, nc, tt, ct, _) in stats.stats.items()
+    ]
+    key = SORT_KEYS.get(sort, 'cumtime_ms')
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:limit]
+
+
+def collapsed_stacks(stats, min_fraction=0.001, max_depth=64):
+    """Return flame-graph input ("frame;frame;frame <microseconds>" per line).
+
+    cProfile only records caller/callee pairs, so full stacks are rebuilt by
+    walking the call graph from the roots and splitting each function's time
+    between its callers in proportion to the time spent under each of them.
+    """
+    entries = stats.stats
+    children = {}
+    for callee, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            children.setdefault(caller, []).append(callee)
+
+    total = sum(tt for (_, _, tt, _, _) in entries.values()) or 1.0
+    lines = {}
+
+    def visit(func, path, fraction):
+        _, _, tt, ct, _ = entries[func]
+        path = path + (_label(func).replace(';', ':'),)
+        self_time = tt * fraction
+        if self_time > 0:
+            lines[path] = lines.get(path, 0.0) + self_time
+        if len(path) >= max_depth:
+            return
+        for child in children.get(func, ()):
+            child_ct = entries[child][3]
+            edge_ct = entries[child][4][func][3]
+            child_fraction = fraction * (edge_ct / child_ct) if child_ct else 0.0
+            if child_fraction * child_ct < total * min_fraction:
+                continue
+            if _label(child).replace(';', ':') in path:
+                continue  # recursion; its time is already counted under the outer call
+            visit(child, path, child_fraction)
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            visit(func, (), 1.0)
+
+    return '\n'.join(
+        f'{";".join(path)} {max(1, round(seconds * 1_000_000))}'
+        for path, seconds in sorted(lines.items())
+    )
@@ -1,7 +1,26 @@
 # serializers.py
 from rest_framework import serializers
+from ..instrumentation import timed
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
 
 class BaseModelSerializer(serializers.ModelSerializer):
     class Meta:
         abstract = True
-        read_only_fields = ['created_by', 'updated_by', 'created_at', 'updated_at']
+        list_serializer_class = TimedListSerializer
+        read_only_fields = ['created_by', 'updated_by', 'created_at', 'updated_at', 'version']
+
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
+    def is_valid(self, *, raise_exception=False):
+        with timed('serializer'):
+            return super().is_valid(raise_exception=raise_exception)
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+
+class PlayerComparisonSerializer(serializers.Serializer):
+    player_id = serializers.UUIDField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    primary_position = serializers.CharField()
+    matches = serializers.IntegerField()
+    minutes_played = serializers.IntegerField()
+    totals = serializers.DictField(child=serializers.IntegerField())
+    rates = serializers.DictField(child=serializers.FloatField(allow_null=True))
+    z_scores = serializers.DictField(child=serializers.FloatField(allow_null=True))
+
+
+class SimilarPlayerSerializer(serializers.Serializer):
+    player_id = serializers.UUIDField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    primary_position = serializers.CharField()
+    score = serializers.FloatField(help_text='Cosine similarity (higher is closer) or euclidean distance (lower is closer)')
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from ..models.match_model import Match
+from ..services.fixture_service import DEFAULT_KICK_OFF
+from .base_serializer import BaseModelSerializer
+
+class FixtureSerializer(BaseModelSerializer):
+    home_team_name = serializers.CharField(source='home_team.team_name', read_only=True)
+    away_team_name = serializers.CharField(source='away_team.team_name', read_only=True)
+
+    class Meta(BaseModelSerializer.Meta):
+        model = Match
+        fields = [
+            'match_id',
+            'match_date',
+            'league',
+            'season',
+            'home_team',
+            'home_team_name',
+            'away_team',
+            'away_team_name',
+            'venue',
+            'status',
+            'home_team_score',
+            'away_team_score',
+            'match_type',
+        ]
+
+
+class FixtureGenerationSerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False, help_text="First matchday; the season start by default")
+    days_between = serializers.IntegerField(default=7, min_value=1, help_text="Days between matchdays")
+    kick_off = serializers.TimeField(default=DEFAULT_KICK_OFF, help_text="Kick-off time of every match")
+    replace = serializers.BooleanField(default=False, help_text="Replace the season's existing scheduled fixtures")
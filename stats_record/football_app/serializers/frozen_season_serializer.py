@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+
+class SeasonFreezeSerializer(serializers.Serializer):
+    force = serializers.BooleanField(default=False, help_text="Re-render even if the season's data did not change")
+
+
+class FrozenArtefactSerializer(serializers.Serializer):
+    url = serializers.CharField(help_text='Immutable URL of the gzipped JSON artefact')
+    size = serializers.IntegerField(help_text='Compressed size in bytes')
+
+
+class FrozenSeasonSerializer(serializers.Serializer):
+    season = serializers.UUIDField()
+    frozen_at = serializers.DateTimeField()
+    artefacts = serializers.DictField(child=FrozenArtefactSerializer())
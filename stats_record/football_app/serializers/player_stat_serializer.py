@@ -1,8 +1,44 @@
 from rest_framework import serializers
 from ..models import PlayerStats
+from ..models.model_player_stat import PER_90_RATES, SUCCESS_RATES
+from ..services.player_stats_service import COUNTER_FIELDS
 from .base_serializer import BaseModelSerializer
 
 class PlayerStatsSerializer(BaseModelSerializer):
+    """Includes the efficiency annotations when the row was loaded ``with_efficiency()``."""
+
     class Meta(BaseModelSerializer.Meta):
         model = PlayerStats
         fields = '__all__'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['minutes_played'] = serializers.IntegerField(read_only=True)
+        for name in [*SUCCESS_RATES, *PER_90_RATES]:
+            fields[name] = serializers.FloatField(read_only=True)
+        return fields
+
+
+class StatIncrementsSerializer(serializers.Serializer):
+    """``{"tackle_success": 1, "duel_fail": -1}``: deltas for PlayerStats counters."""
+
+    def get_fields(self):
+        return {field: serializers.IntegerField(required=False, min_value=-100, max_value=100) for field in COUNTER_FIELDS}
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = sorted(set(data) - set(COUNTER_FIELDS))
+            if unknown:
+                raise serializers.ValidationError({field: ['Not an incrementable counter.'] for field in unknown})
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        increments = {field: delta for field, delta in attrs.items() if delta}
+        if not increments:
+            raise serializers.ValidationError('Give at least one non-zero increment.')
+        return increments
+
+
+class PlayerStatsIncrementSerializer(serializers.Serializer):
+    stat_id = serializers.UUIDField()
+    increments = StatIncrementsSerializer()
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+from ..models.player_team_spell_model import PlayerTeamSpell
+from .base_serializer import BaseModelSerializer
+
+class PlayerTeamSpellSerializer(BaseModelSerializer):
+    team_name = serializers.CharField(source='team.team_name', read_only=True)
+
+    class Meta(BaseModelSerializer.Meta):
+        model = PlayerTeamSpell
+        fields = ['team', 'team_name', 'joined_at', 'left_at']
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+
+class TeamProjectionSerializer(serializers.Serializer):
+    team_id = serializers.UUIDField()
+    team_name = serializers.CharField()
+    points = serializers.IntegerField()
+    goal_difference = serializers.IntegerField()
+    attack = serializers.FloatField(help_text='Scoring strength; 1 is the season average')
+    defence = serializers.FloatField(help_text='Goals conceded relative to the season average; lower is better')
+    expected_points = serializers.FloatField()
+    title_probability = serializers.FloatField()
+    relegation_probability = serializers.FloatField()
+    position_probabilities = serializers.ListField(child=serializers.FloatField(), help_text='Probability of each finishing position, first place first')
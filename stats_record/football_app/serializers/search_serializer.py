@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    score = serializers.FloatField()
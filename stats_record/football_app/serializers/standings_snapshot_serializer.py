@@ -0,0 +1,7 @@
+from ..models.standings_snapshot_model import StandingsSnapshot
+from .base_serializer import BaseModelSerializer
+
+class StandingsSnapshotSerializer(BaseModelSerializer):
+    class Meta(BaseModelSerializer.Meta):
+        model = StandingsSnapshot
+        fields = ['season', 'as_of', 'standings']
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from ..models.team_rating_model import TeamRating
+from .base_serializer import BaseModelSerializer
+
+class TeamRatingSerializer(BaseModelSerializer):
+    opponent = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
+    rating_change = serializers.SerializerMethodField()
+
+    class Meta(BaseModelSerializer.Meta):
+        model = TeamRating
+        fields = ['match', 'match_date', 'opponent', 'score', 'rating_before', 'rating_after', 'rating_change']
+
+    def get_opponent(self, rating) -> str:
+        match = rating.match
+        return match.away_team.team_name if match.home_team_id == rating.team_id else match.home_team.team_name
+
+    def get_score(self, rating) -> str:
+        """The team's goals first."""
+        match = rating.match
+        if match.home_team_id == rating.team_id:
+            return f'{match.home_team_score}-{match.away_team_score}'
+        return f'{match.away_team_score}-{match.home_team_score}'
+
+    def get_rating_change(self, rating) -> float:
+        return round(rating.rating_after - rating.rating_before, 2)
+
+
+class LeagueRatingSerializer(serializers.Serializer):
+    team_id = serializers.UUIDField()
+    team_name = serializers.CharField()
+    rating = serializers.FloatField()
+    rated_at = serializers.DateTimeField(allow_null=True, help_text='Kick-off of the last rated match; empty for unrated teams')
@@ -1,7 +1,10 @@
+from rest_framework import serializers
 from ..models import TeamStats
 from .base_serializer import BaseModelSerializer
 
 class TeamStatsSerializer(BaseModelSerializer):
+    team_logo = serializers.ImageField(source='team_name.team_logo', read_only=True)
+
     class Meta(BaseModelSerializer.Meta):
         model = TeamStats
         fields = '__all__'
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import PlayerStats, PlayerTeamSpell
+
+
+def _spells(rows):
+    """Turn one player's (current_team, previous_team, joined, left, match_date) rows into spells.
+
+    Rows sharing a team and joining date form one spell. Rows of a team with
+    no joining date belong to that team's dated spell under way at their
+    match (or its first one), so a stint is not split in two; a team with no
+    dated rows at all gets one spell starting at the player's first match for
+    it. An open spell is closed when a later one starts. A ``previous_team``
+    with no spell of its own gets one ending when the player joined the next
+    team.
+    """
+    dated = {}
+    undated = defaultdict(list)
+    previous = {}
+    for team_id, previous_team_id, joined, left, match_date in rows:
+        if joined is None:
+            undated[team_id].append((left, timezone.localtime(match_date).date() if match_date is not None else None))
+        else:
+            spell = dated.setdefault((team_id, joined), {'team_id': team_id, 'joined_at': joined, 'left_at': None})
+            _extend(spell, left)
+        if previous_team_id is not None and joined is not None:
+            previous[previous_team_id] = min(joined, previous.get(previous_team_id, joined))
+
+    spells = list(dated.values())
+    for team_id, team_rows in undated.items():
+        team_spells = sorted((spell for spell in dated.values() if spell['team_id'] == team_id), key=lambda spell: spell['joined_at'])
+        if not team_spells:
+            spell = {'team_id': team_id, 'joined_at': min(filter(None, (day for _, day in team_rows)), default=None), 'left_at': None}
+            spells.append(spell)
+        for left, day in team_rows:
+            if team_spells:
+                spell = next(
+                    (dated_spell for dated_spell in reversed(team_spells) if day is not None and dated_spell['joined_at'] <= day),
+                    team_spells[0],
+                )
+            _extend(spell, left)
+
+    teams_with_spells = {spell['team_id'] for spell in spells}
+    for team_id, left in previous.items():
+        if team_id not in teams_with_spells:
+            spells.append({'team_id': team_id, 'joined_at': None, 'left_at': left})
+
+    spells.sort(key=lambda spell: (spell['joined_at'] is not None, spell['joined_at'] or spell['left_at'] or date.min))
+    for spell, following in zip(spells, spells[1:]):
+        if spell['left_at'] is None and following['joined_at'] is not None:
+            spell['left_at'] = following['joined_at']
+    return spells
+
+
+def _extend(spell, left):
+    if left is not None and (spell['left_at'] is None or left > spell['left_at']):
+        spell['left_at'] = left
+
+
+def rebuild_player_spells(player_ids):
+    """Rebuild the PlayerTeamSpells of the given players from their PlayerStats."""
+    rows = defaultdict(list)
+    stats = PlayerStats.objects.filter(player_id__in=player_ids).values_list(
+        'player_id',
+        'current_team_id',
+        'previous_team_id',
+        'joined_team_at',
+        'left_team_at',
+        'match_type__match_date',
+    )
+    for player_id, *row in stats.iterator(chunk_size=2000):
+        rows[player_id].append(row)
+
+    with transaction.atomic():
+        PlayerTeamSpell.objects.filter(player_id__in=player_ids).delete()
+        PlayerTeamSpell.objects.bulk_create([
+            PlayerTeamSpell(player_id=player_id, **spell)
+            for player_id, player_rows in rows.items()
+            for spell in _spells(player_rows)
+        ])
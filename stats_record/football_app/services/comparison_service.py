@@ -0,0 +1,96 @@
+import warnings
+
+import numpy as np
+from django.db.models import Count, F, Sum
+
+from ..models import Player, PlayerStats
+from ..models.model_player_stat import PER_90_RATES, SUCCESS_RATES, efficiency_expressions, minutes_played
+from .player_stats_service import COUNTER_FIELDS
+
+MAX_COMPARED_PLAYERS = 20
+# Players with fewer minutes are compared, but left out of the positional distribution.
+MIN_REFERENCE_MINUTES = 90
+RATE_FIELDS = [*PER_90_RATES, *SUCCESS_RATES]
+
+
+class UnknownPlayers(Exception):
+    def __init__(self, player_ids):
+        self.player_ids = player_ids
+        super().__init__(f'Unknown players: {", ".join(map(str, player_ids))}')
+
+
+def season_totals(season_id):
+    """Season totals, minutes and rates of every player of a season, in one grouped query."""
+    return (
+        PlayerStats.objects.filter(season_played_id=season_id)
+        .values('player_id', 'player__primary_position')
+        .annotate(
+            matches=Count('pk'),
+            minutes_played=Sum(minutes_played()),
+            **{field: Sum(field) for field in COUNTER_FIELDS},
+        )
+        # The counter names now refer to the season totals.
+        .annotate(**efficiency_expressions(minutes=F('minutes_played')))
+        .order_by()
+    )
+
+
+def position_z_scores(positions, values, reference):
+    """Standardise ``values`` (players x metrics, NaN when missing) within each position.
+
+    Means and standard deviations come from the ``reference`` rows of the same
+    position; metrics that do not vary there have no z-score (NaN).
+    """
+    z_scores = np.full_like(values, np.nan)
+    for position in np.unique(positions):
+        rows = positions == position
+        population = values[rows & reference]
+        with warnings.catch_warnings():
+            # All-NaN columns (a rate nobody in the position has) are expected.
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(population, axis=0)
+            std = np.nanstd(population, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_scores[rows] = (values[rows] - mean) / np.where(std > 0, std, np.nan)
+    return z_scores
+
+
+def _number(value, digits=3):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def compare_players(player_ids, season_id):
+    """Side-by-side season totals, rates and position-normalised z-scores of ``player_ids``.
+
+    The z-scores place each player among the season's players of the same
+    primary position who played at least ``MIN_REFERENCE_MINUTES``. Players
+    appear in the order given; those without stats in the season have zero
+    totals and no rates.
+    """
+    players = Player.objects.only('first_name', 'last_name', 'primary_position').in_bulk(player_ids)
+    unknown = [player_id for player_id in player_ids if player_id not in players]
+    if unknown:
+        raise UnknownPlayers(unknown)
+    rows = list(season_totals(season_id))
+    positions = np.array([row['player__primary_position'] for row in rows], dtype=object)
+    values = np.array([[row[field] for field in RATE_FIELDS] for row in rows], dtype=float).reshape(len(rows), len(RATE_FIELDS))
+    reference = np.array([row['minutes_played'] >= MIN_REFERENCE_MINUTES for row in rows], dtype=bool)
+    z_scores = position_z_scores(positions, values, reference)
+    by_player = {row['player_id']: (row, z) for row, z in zip(rows, z_scores)}
+
+    comparison = []
+    for player_id in player_ids:
+        player = players[player_id]
+        row, z = by_player.get(player_id, ({}, [np.nan] * len(RATE_FIELDS)))
+        comparison.append({
+            'player_id': player_id,
+            'first_name': player.first_name,
+            'last_name': player.last_name,
+            'primary_position': player.primary_position,
+            'matches': row.get('matches', 0),
+            'minutes_played': row.get('minutes_played', 0),
+            'totals': {field: row.get(field, 0) for field in COUNTER_FIELDS},
+            'rates': {field: _number(row.get(field)) for field in RATE_FIELDS},
+            'z_scores': {field: _number(value, 2) for field, value in zip(RATE_FIELDS, z)},
+        })
+    return comparison
@@ -0,0 +1,140 @@
+import logging
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from ..models import League, Match, Season, Team
+from .freeze_service import delete_frozen_artefacts, schedule_refreeze
+from .rating_service import update_team_ratings
+from .standings_service import rebuild_standings_snapshots
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 500
+SUPPORTED_ON_DELETE = (models.CASCADE, models.SET_NULL, models.DO_NOTHING)
+
+
+def request_deletion(instance):
+    """Hide ``instance`` right away and hand the actual delete to the background job."""
+    from ..tasks import delete_pending_entity
+
+    model = type(instance)
+    model.objects.filter(pk=instance.pk).update(deletion_requested_at=timezone.now(), version=F('version') + 1)
+    transaction.on_commit(lambda: delete_pending_entity.delay(model._meta.label, str(instance.pk)))
+
+
+def _dependents(model):
+    """Reverse foreign keys into ``model``, including the hidden ones of many-to-many tables."""
+    return [
+        relation
+        for relation in model._meta.get_fields(include_hidden=True)
+        if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+    ]
+
+
+def _check_on_delete(model, seen=None):
+    """Raise ImproperlyConfigured if anything cascading from ``model`` uses an ``on_delete`` the batches cannot honour."""
+    seen = seen if seen is not None else {model}
+    for relation in _dependents(model):
+        if relation.on_delete not in SUPPORTED_ON_DELETE:
+            raise ImproperlyConfigured(
+                f'{relation.related_model._meta.label}.{relation.field.name} uses {relation.on_delete.__name__}, '
+                f'which batched deletion does not support; use CASCADE, SET_NULL or DO_NOTHING.'
+            )
+        if relation.on_delete is models.CASCADE and relation.related_model not in seen:
+            seen.add(relation.related_model)
+            _check_on_delete(relation.related_model, seen)
+
+
+def _delete_rows(model, pks):
+    """``DELETE ... WHERE pk IN (...)`` without loading the rows or sending signals."""
+    pk_field = model._meta.pk
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(pk_field.column)} IN ({", ".join(["%s"] * len(pks))})',
+            [pk_field.get_db_prep_value(pk, connection) for pk in pks],
+        )
+
+
+def _delete_dependents(model, pks, batch_size):
+    """Delete, batch by batch and bottom-up, every row that cascades from the ``pks`` of ``model``.
+
+    Each batch is its own short transaction, so only ``batch_size`` rows are
+    held in memory or locked at a time. Re-running after an interruption
+    picks up where it stopped.
+    """
+    for relation in _dependents(model):
+        related_model = relation.related_model
+        field = relation.field
+        rows = related_model._base_manager.filter(**{f'{field.name}__in': pks})
+        on_delete = relation.on_delete
+        if on_delete is models.DO_NOTHING:
+            continue
+        if on_delete is models.SET_NULL:
+            while rows.exists():
+                batch = list(rows.values_list('pk', flat=True)[:batch_size])
+                related_model._base_manager.filter(pk__in=batch).update(**{field.name: None, 'version': F('version') + 1})
+            continue
+        while True:
+            batch = list(rows.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            _delete_dependents(related_model, batch, batch_size)
+            with transaction.atomic():
+                _delete_rows(related_model, batch)
+
+
+def delete_in_batches(model, pk, batch_size=DELETE_BATCH_SIZE):
+    """Delete a League, Season or Team marked for deletion, its dependents first.
+
+    Raises ImproperlyConfigured, before deleting anything, when a dependent
+    uses an ``on_delete`` other than CASCADE, SET_NULL or DO_NOTHING.
+    """
+    _check_on_delete(model)
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    if instance.deletion_requested_at is None:
+        logger.warning('Skipping %s %s: its deletion is not requested', model._meta.label, pk)
+        return
+
+    # Deleting a team's matches changes the standings of other teams' seasons too.
+    affected_seasons = set()
+    if model is Team:
+        affected_seasons = set(
+            Match.objects.filter(models.Q(home_team_id=pk) | models.Q(away_team_id=pk))
+            .values_list('season_id', flat=True)
+            .distinct()
+        )
+
+    # Ratings after the first deleted result were computed with it.
+    deleted_matches = {
+        League: models.Q(league_id=pk),
+        Season: models.Q(season_id=pk),
+        Team: models.Q(home_team_id=pk) | models.Q(away_team_id=pk),
+    }[model]
+    rated_since = Match.objects.filter(deleted_matches, status=Match.COMPLETED).aggregate(since=Min('match_date'))['since']
+
+    # Frozen artefacts of deleted seasons are no longer listed anywhere.
+    deleted_seasons = {League: models.Q(league_id=pk), Season: models.Q(pk=pk)}.get(model)
+    frozen_seasons = (
+        list(Season._base_manager.filter(deleted_seasons, frozen_at__isnull=False).values_list('pk', flat=True))
+        if deleted_seasons is not None
+        else []
+    )
+
+    _delete_dependents(model, [pk], batch_size)
+    with transaction.atomic():
+        _delete_rows(model, [pk])
+
+    for season_id in frozen_seasons:
+        delete_frozen_artefacts(season_id)
+    for season_id in affected_seasons:
+        rebuild_standings_snapshots(season_id)
+    schedule_refreeze(affected_seasons)
+    if rated_since is not None:
+        update_team_ratings(rated_since)
+    logger.info('Deleted %s %s', model._meta.label, pk)
@@ -0,0 +1,183 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from hashlib import sha256
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from ..models import Match
+
+MATCH_DURATION = timedelta(hours=2)
+DEFAULT_KICK_OFF = time(15, 0)
+DEFAULT_VENUE = 'TBD'
+CALENDAR_PRODID = '-//Football Records//Fixtures//EN'
+
+
+def fixtures(date_from=None, date_to=None, team_id=None, league_id=None):
+    """Matches between two dates (inclusive), optionally of one team or league, in kick-off order.
+
+    Each filter pairs with a ``match_date`` index: ``(league, match_date)``,
+    ``(home_team, match_date)`` and ``(away_team, match_date)``.
+    """
+    matches = Match.objects.all()
+    if date_from is not None:
+        matches = matches.filter(match_date__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to is not None:
+        matches = matches.filter(match_date__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min)))
+    if team_id is not None:
+        matches = matches.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+    if league_id is not None:
+        matches = matches.filter(league_id=league_id)
+    return matches.order_by('match_date')
+
+
+def fixtures_etag(matches):
+    """ETag of a set of fixtures, from one aggregate query.
+
+    Any edit of a match, or a rename of its teams or league, moves one of the
+    ``updated_at``; any delete moves the count.
+    """
+    state = matches.order_by().aggregate(
+        last_updated=Max('updated_at'),
+        home_team_updated=Max('home_team__updated_at'),
+        away_team_updated=Max('away_team__updated_at'),
+        league_updated=Max('league__updated_at'),
+        count=Count('pk'),
+    )
+    return '"%s"' % sha256(':'.join(str(state[key]) for key in sorted(state)).encode()).hexdigest()[:32]
+
+
+def _escape(text):
+    return str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _fold(line):
+    """Fold a content line to 75 octets, as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _ical_time(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def ical_lines(matches, calendar_name):
+    """Stream an iCalendar feed of ``matches`` line by line."""
+    yield from (_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{CALENDAR_PRODID}',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(calendar_name)}',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+    ])
+    rows = matches.values_list(
+        'match_id',
+        'match_date',
+        'updated_at',
+        'venue',
+        'status',
+        'home_team__team_name',
+        'away_team__team_name',
+        'home_team_score',
+        'away_team_score',
+    )
+    for match_id, match_date, updated_at, venue, status, home, away, home_score, away_score in rows.iterator(chunk_size=500):
+        summary = f'{home} vs {away}'
+        if status == Match.COMPLETED and home_score is not None and away_score is not None:
+            summary = f'{home} {home_score}-{away_score} {away}'
+        yield from (_fold(line) for line in [
+            'BEGIN:VEVENT',
+            f'UID:{match_id}@football-records',
+            f'DTSTAMP:{_ical_time(updated_at)}',
+            f'DTSTART:{_ical_time(match_date)}',
+            f'DTEND:{_ical_time(match_date + MATCH_DURATION)}',
+            f'SUMMARY:{_escape(summary)}',
+            f'LOCATION:{_escape(venue)}',
+            'END:VEVENT',
+        ])
+    yield _fold('END:VCALENDAR')
+
+
+def round_robin(team_ids):
+    """Pair teams into a balanced double round-robin with the circle method (Berger tables).
+
+    Returns one list of ``(home, away)`` pairs per matchday. Every team meets
+    every other team once at home and once away, the second half mirroring
+    the first with venues swapped. The mirrored half starts from its second
+    matchday and ends with the first, so that no team plays more than two
+    home or away games in a row across the turn either and, with more than
+    two teams, no pair meets on consecutive matchdays. With an odd number of teams one team rests each
+    matchday.
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    fixed, rotating = teams[-1], len(teams) - 1
+    rounds = []
+    for round_number in range(rotating):
+        partner = teams[round_number]
+        pairs = [(fixed, partner) if round_number % 2 else (partner, fixed)]
+        for offset in range(1, len(teams) // 2):
+            first = teams[(round_number + offset) % rotating]
+            second = teams[(round_number - offset) % rotating]
+            pairs.append((first, second) if offset % 2 == 0 else (second, first))
+        rounds.append([(home, away) for home, away in pairs if home is not None and away is not None])
+    mirrored = [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds + mirrored[1:] + mirrored[:1]
+
+
+def generate_season_fixtures(season, start_date=None, days_between=7, kick_off=DEFAULT_KICK_OFF, replace=False, user=None):
+    """Create a season's double round-robin between ``season.league.teams`` in one ``bulk_create``.
+
+    Matchdays are ``days_between`` days apart from ``start_date`` (the season
+    start by default), and must all fall within the season. Teams pending
+    deletion are left out. Refuses to run when the season already has
+    fixtures, unless ``replace`` is set, in which case scheduled matches are
+    replaced and a season with completed matches is still refused.
+    """
+    team_ids = list(season.league.teams.live().order_by('team_name').values_list('pk', flat=True))
+    if len(team_ids) < 2:
+        raise ValueError('The league needs at least two teams.')
+    start_date = start_date or season.start_date
+    if not season.start_date <= start_date <= season.end_date:
+        raise ValueError(f'The first matchday must be within the season, {season.start_date} to {season.end_date}.')
+    rounds = round_robin(team_ids)
+    last_matchday = start_date + timedelta(days=days_between * (len(rounds) - 1))
+    if last_matchday > season.end_date:
+        raise ValueError(f'The last matchday would be on {last_matchday}, after the season ends on {season.end_date}.')
+
+    matches = [
+        Match(
+            season=season,
+            league_id=season.league_id,
+            home_team_id=home,
+            away_team_id=away,
+            match_date=timezone.make_aware(datetime.combine(start_date + timedelta(days=days_between * matchday), kick_off)),
+            venue=DEFAULT_VENUE,
+            status=Match.SCHEDULED,
+            created_by=user,
+            updated_by=user,
+        )
+        for matchday, pairs in enumerate(rounds)
+        for home, away in pairs
+    ]
+    with transaction.atomic():
+        statuses = set(Match.objects.select_for_update().filter(season=season).values_list('status', flat=True))
+        if Match.COMPLETED in statuses:
+            raise ValueError('The season already has completed matches.')
+        if statuses and not replace:
+            raise ValueError('The season already has fixtures.')
+        Match.objects.filter(season=season).delete()
+        Match.objects.bulk_create(matches)
+    return matches
+
@@ -0,0 +1,177 @@
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta
+from hashlib import sha256
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Match, Player, PlayerStats, Season, StandingsSnapshot, TeamStats
+from ..serializers.fixture_serializer import FixtureSerializer
+from ..serializers.standings_snapshot_serializer import StandingsSnapshotSerializer
+from ..serializers.team_stat_serializer import TeamStatsSerializer
+from .comparison_service import season_totals
+
+logger = logging.getLogger(__name__)
+
+FROZEN_SEASONS_DIR = 'frozen-seasons'
+# Clients and proxies may cache an artefact this long, so superseded ones are kept as long.
+ARTEFACT_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class SeasonNotEnded(Exception):
+    pass
+
+
+def _standings(season):
+    snapshots = StandingsSnapshot.objects.filter(season=season).order_by('as_of')
+    return StandingsSnapshotSerializer(snapshots, many=True).data
+
+
+def _fixtures(season):
+    matches = Match.objects.filter(season=season).select_related('home_team', 'away_team').order_by('match_date', 'match_id')
+    return FixtureSerializer(matches, many=True).data
+
+
+def _team_stats(season):
+    team_stats = TeamStats.objects.filter(season=season).select_related('team_name').prefetch_related('players').order_by('match__match_date', 'team_name__team_name')
+    return TeamStatsSerializer(team_stats, many=True).data
+
+
+def _player_totals(season):
+    names = {
+        player_id: {'first_name': first_name, 'last_name': last_name}
+        for player_id, first_name, last_name in Player.objects.filter(player_stats__season_played=season)
+        .distinct()
+        .values_list('pk', 'first_name', 'last_name')
+    }
+    totals = [{**row, **names.get(row['player_id'], {})} for row in season_totals(season.pk)]
+    totals.sort(key=lambda row: (row.get('last_name', ''), row.get('first_name', ''), str(row['player_id'])))
+    return totals
+
+
+# artefact kind -> renders the season's data
+ARTEFACTS = {
+    'standings': _standings,
+    'fixtures': _fixtures,
+    'team_stats': _team_stats,
+    'player_totals': _player_totals,
+}
+
+
+def season_fingerprint(season_id):
+    """Changes whenever a match, stats row or snapshot of the season is added, edited or deleted."""
+    parts = [
+        model.objects.filter(**{field: season_id}).aggregate(last_updated=Max('updated_at'), count=Count('pk'))
+        for model, field in (
+            (Match, 'season_id'),
+            (PlayerStats, 'season_played_id'),
+            (TeamStats, 'season_id'),
+            (StandingsSnapshot, 'season_id'),
+        )
+    ]
+    return sha256(json.dumps(parts, cls=DjangoJSONEncoder).encode()).hexdigest()[:32]
+
+
+def has_ended(season):
+    return not season.is_current and season.end_date < timezone.localdate()
+
+
+def artefact_name(season_id, kind, digest):
+    return f'{FROZEN_SEASONS_DIR}/{season_id}/{kind}.{digest}.json.gz'
+
+
+def render_artefact(data):
+    """Compact JSON, gzipped without a timestamp so equal data gives equal bytes."""
+    content = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    return gzip.compress(content, mtime=0)
+
+
+def _expire_superseded(superseded, now):
+    """Split ``{name: superseded_at}`` into the artefacts still kept and the names of those expired."""
+    cutoff = now - timedelta(seconds=ARTEFACT_MAX_AGE)
+    kept = {name: superseded_at for name, superseded_at in superseded.items() if datetime.fromisoformat(superseded_at) >= cutoff}
+    return kept, superseded.keys() - kept.keys()
+
+
+def _save_manifest(season, manifest, **fields):
+    Season.objects.filter(pk=season.pk).update(frozen_manifest=manifest, version=F('version') + 1, **fields)
+    season.refresh_from_db(fields=['frozen_at', 'frozen_manifest', 'version'])
+
+
+def purge_superseded_artefacts(season):
+    """Delete the season's artefacts superseded more than ``ARTEFACT_MAX_AGE`` ago."""
+    kept, expired = _expire_superseded(season.frozen_manifest.get('superseded', {}), timezone.now())
+    if expired:
+        _save_manifest(season, {**season.frozen_manifest, 'superseded': kept})
+        for name in expired:
+            default_storage.delete(name)
+
+
+def freeze_season(season, force=False):
+    """Render an ended season's standings, fixtures, team stats and player totals into gzipped JSON artefacts.
+
+    Artefact names carry a hash of their content, so their URLs never serve
+    different data and can be cached forever. Does nothing when the season's
+    data has not changed since it was last frozen, unless ``force`` is set.
+    Artefacts of a previous freeze stay available for ``ARTEFACT_MAX_AGE``,
+    as caches may still point to them. Returns True when the season was
+    (re)frozen.
+    """
+    if not has_ended(season):
+        raise SeasonNotEnded(f'{season} has not ended yet.')
+    fingerprint = season_fingerprint(season.pk)
+    if not force and season.frozen_at is not None and season.frozen_manifest.get('fingerprint') == fingerprint:
+        purge_superseded_artefacts(season)
+        return False
+
+    artefacts = {}
+    for kind, render in ARTEFACTS.items():
+        content = render_artefact(render(season))
+        digest = sha256(content).hexdigest()[:16]
+        name = artefact_name(season.pk, kind, digest)
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(content))
+        artefacts[kind] = {
+            'name': name,
+            'url': reverse('frozen-season-artefact', kwargs={'pk': season.pk, 'filename': f'{kind}.{digest}.json'}),
+            'size': len(content),
+        }
+
+    now = timezone.now()
+    current = {artefact['name'] for artefact in artefacts.values()}
+    superseded = {
+        **season.frozen_manifest.get('superseded', {}),
+        **{artefact['name']: now.isoformat() for artefact in season.frozen_manifest.get('artefacts', {}).values()},
+    }
+    kept, expired = _expire_superseded({name: superseded_at for name, superseded_at in superseded.items() if name not in current}, now)
+    _save_manifest(season, {'fingerprint': fingerprint, 'artefacts': artefacts, 'superseded': kept}, frozen_at=now)
+    for name in expired:
+        default_storage.delete(name)
+    logger.info('Froze %s into %d artefacts', season, len(artefacts))
+    return True
+
+
+def delete_frozen_artefacts(season_id):
+    """Remove every artefact of a season, e.g. once the season itself is deleted."""
+    directory = f'{FROZEN_SEASONS_DIR}/{season_id}'
+    try:
+        _, names = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in names:
+        default_storage.delete(f'{directory}/{name}')
+
+
+def schedule_refreeze(season_ids):
+    """Re-render frozen seasons among ``season_ids`` in the background, after the current transaction commits."""
+    from ..tasks import refreeze_season
+
+    for season_id in Season.objects.filter(pk__in=[pk for pk in season_ids if pk], frozen_at__isnull=False).values_list('pk', flat=True):
+        transaction.on_commit(lambda season_id=season_id: refreeze_season.delay(str(season_id)))
@@ -0,0 +1,56 @@
+from ..models import Match
+from .freeze_service import schedule_refreeze
+from .projection_service import schedule_projection
+from .rating_service import schedule_rating_update
+from .standings_service import matchday_of, update_standings_snapshots
+from .team_stats_service import clear_team_stats, derive_team_stats
+
+
+def match_state(match):
+    """Capture the fields of a match whose change affects derived data."""
+    return {
+        'season_id': match.season_id,
+        'match_date': match.match_date,
+        'status': match.status,
+    }
+
+
+def match_saved(match, previous=None, user=None):
+    """Refresh data derived from match results after a match is created, updated or deleted.
+
+    ``previous`` is the ``match_state`` of the match before the update, so a
+    result that is corrected, moved or un-completed is also taken out again.
+    """
+    exists = match.pk is not None
+    if exists and match.status == Match.COMPLETED:
+        derive_team_stats(match, user)
+    elif exists and previous and previous['status'] == Match.COMPLETED:
+        clear_team_stats(match)
+
+    affected = {}
+    rated_since = []
+    if match.status == Match.COMPLETED:
+        affected[match.season_id] = matchday_of(match.match_date)
+        rated_since.append(match.match_date)
+    if previous and previous['status'] == Match.COMPLETED:
+        day = matchday_of(previous['match_date'])
+        affected[previous['season_id']] = min(day, affected.get(previous['season_id'], day))
+        rated_since.append(previous['match_date'])
+
+    for season_id, since in affected.items():
+        update_standings_snapshots(season_id, since)
+    if rated_since:
+        schedule_rating_update(min(rated_since))
+    seasons = {match.season_id, previous and previous['season_id']} - {None}
+    for season_id in seasons:
+        schedule_projection(season_id)
+    schedule_refreeze(seasons)
+
+
+def player_stats_saved(match_ids, user=None):
+    """Re-derive the TeamStats of the completed matches whose PlayerStats changed, and re-freeze their seasons."""
+    matches = Match.objects.filter(pk__in=match_ids).select_related('home_team', 'away_team')
+    for match in matches:
+        if match.status == Match.COMPLETED:
+            derive_team_stats(match, user)
+    schedule_refreeze({match.season_id for match in matches})
@@ -0,0 +1,178 @@
+import logging
+
+from django.db import connection, transaction
+
+from ..models import PlayerStats, Season, TeamStats
+
+logger = logging.getLogger(__name__)
+
+# model -> the season foreign key its table is partitioned by
+PARTITIONED_MODELS = {
+    PlayerStats: 'season_played',
+    TeamStats: 'season',
+}
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _fetch(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _execute(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _partition_column(model):
+    return model._meta.get_field(PARTITIONED_MODELS[model]).column
+
+
+def partition_name(model, season_id):
+    return f'{model._meta.db_table}_{season_id.hex}'
+
+
+def default_partition_name(model):
+    """The partition of rows whose season has no partition of its own yet."""
+    return f'{model._meta.db_table}_default'
+
+
+def is_partitioned(model):
+    return bool(_fetch('SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass', [model._meta.db_table]))
+
+
+def partitions(model):
+    """Names of the partitions of ``model``'s table, the default partition included."""
+    return {
+        name
+        for name, in _fetch(
+            'SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [model._meta.db_table],
+        )
+    }
+
+
+def convert_to_partitioned(model, season_ids):
+    """Rebuild ``model``'s table as a table partitioned by season, in one transaction.
+
+    Creates one partition per season plus a default partition, copies the
+    rows over and recreates the indexes, unique constraints (widened with the
+    season, as PostgreSQL requires of partitioned tables) and foreign keys.
+    Foreign keys pointing *to* the table cannot be kept, so they are dropped
+    and Django's cascades maintain those rows instead. The table is locked
+    for the duration.
+    """
+    table = model._meta.db_table
+    column = _partition_column(model)
+    pk_column = model._meta.pk.column
+    new_table = f'{table}_partitioned'
+    with transaction.atomic():
+        _execute(f'LOCK TABLE {_quote(table)} IN ACCESS EXCLUSIVE MODE')
+        pk_name, = _fetch("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table])[0]
+        foreign_keys = _fetch(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        unique_constraints = _fetch(
+            "SELECT conname, ARRAY(SELECT attname FROM unnest(conkey) AS key(attnum) "
+            "JOIN pg_attribute ON attrelid = conrelid AND pg_attribute.attnum = key.attnum) "
+            "FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'u'",
+            [table],
+        )
+        indexes = _fetch(
+            'SELECT pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = %s::regclass '
+            'AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)',
+            [table],
+        )
+        referencing = _fetch(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint WHERE confrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+
+        _execute(
+            f'CREATE TABLE {_quote(new_table)} (LIKE {_quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY LIST ({_quote(column)})'
+        )
+        _execute(f'CREATE TABLE {_quote(default_partition_name(model))} PARTITION OF {_quote(new_table)} DEFAULT')
+        for season_id in season_ids:
+            _execute(
+                f'CREATE TABLE {_quote(partition_name(model, season_id))} PARTITION OF {_quote(new_table)} FOR VALUES IN (%s)',
+                [str(season_id)],
+            )
+        _execute(f'INSERT INTO {_quote(new_table)} SELECT * FROM {_quote(table)}')
+
+        for referencing_table, constraint in referencing:
+            logger.warning('Dropping foreign key %s of %s: it cannot reference a partitioned table', constraint, referencing_table)
+            _execute(f'ALTER TABLE {referencing_table} DROP CONSTRAINT {_quote(constraint)}')
+        _execute(f'DROP TABLE {_quote(table)}')
+        _execute(f'ALTER TABLE {_quote(new_table)} RENAME TO {_quote(table)}')
+
+        _execute(f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(pk_name)} PRIMARY KEY ({_quote(pk_column)}, {_quote(column)})')
+        for name, columns in unique_constraints:
+            columns = columns if column in columns else [*columns, column]
+            _execute(f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} UNIQUE ({", ".join(map(_quote, columns))})')
+        for definition, in indexes:
+            _execute(definition)
+        for name, definition in foreign_keys:
+            _execute(f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}')
+
+
+def create_season_partitions(model, season_ids):
+    """Give each season its own partition, moving its rows out of the default partition.
+
+    Returns the names of the partitions created.
+    """
+    table = model._meta.db_table
+    column = _partition_column(model)
+    default = default_partition_name(model)
+    existing = partitions(model)
+    created = []
+    for season_id in season_ids:
+        name = partition_name(model, season_id)
+        if name in existing:
+            continue
+        with transaction.atomic():
+            # A partition cannot be created while the default partition holds
+            # rows that belong to it, so the rows move through a detached table.
+            _execute(f'CREATE TABLE {_quote(name)} (LIKE {_quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            _execute(f'INSERT INTO {_quote(name)} SELECT * FROM {_quote(default)} WHERE {_quote(column)} = %s', [str(season_id)])
+            _execute(f'DELETE FROM {_quote(default)} WHERE {_quote(column)} = %s', [str(season_id)])
+            _execute(f'ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(name)} FOR VALUES IN (%s)', [str(season_id)])
+        created.append(name)
+    return created
+
+
+def partition_stats_tables(convert=False, season_ids=None):
+    """Partition PlayerStats and TeamStats by season (PostgreSQL only).
+
+    With ``convert``, tables that are not partitioned yet are rebuilt as
+    partitioned tables; otherwise they are left alone. Then every season in
+    ``season_ids`` (all seasons by default) gets its partition. Returns
+    ``{table: [partitions created]}``.
+    """
+    if connection.vendor != 'postgresql':
+        raise PartitioningError('Table partitioning needs PostgreSQL.')
+    if season_ids is None:
+        season_ids = list(Season.objects.order_by('start_date').values_list('pk', flat=True))
+
+    created = {}
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(model):
+            if not convert:
+                logger.info('%s is not partitioned; skipping it', table)
+                continue
+            convert_to_partitioned(model, season_ids)
+            created[table] = [partition_name(model, season_id) for season_id in season_ids]
+        else:
+            created[table] = create_season_partitions(model, season_ids)
+    return created
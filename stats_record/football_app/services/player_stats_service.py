@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..models import PlayerStats
+
+# The per-match counters (tackles, duels, goals, cards...) that can be incremented.
+COUNTER_FIELDS = [field.name for field in PlayerStats._meta.concrete_fields if type(field) is models.IntegerField]
+
+
+class UnknownPlayerStats(Exception):
+    def __init__(self, stat_ids):
+        self.stat_ids = stat_ids
+        super().__init__(f'Unknown player stats: {", ".join(map(str, stat_ids))}')
+
+
+def increment_player_stats(increments, user=None):
+    """Add to counters of several PlayerStats rows in a single ``UPDATE``.
+
+    ``increments`` is a list of ``(stat_id, {field: delta})``; deltas for the
+    same row and field are summed. Each counter is computed in the database
+    from its current value (``CASE WHEN pk = ... THEN field + delta``), so
+    concurrent increments are never lost, and only the touched columns are
+    written. Counters do not go below zero. Returns the new values of the
+    touched counters by row.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for stat_id, row_increments in increments:
+        for field, delta in row_increments.items():
+            deltas[stat_id][field] += delta
+    fields = sorted({field for row in deltas.values() for field in row})
+    stat_ids = list(deltas)
+
+    updates = {}
+    for field in fields:
+        rows = [(stat_id, row[field]) for stat_id, row in deltas.items() if row.get(field)]
+        if not rows:
+            continue
+        if len(stat_ids) == 1:
+            updates[field] = Greatest(F(field) + Value(rows[0][1]), Value(0))
+        else:
+            updates[field] = Case(
+                *(When(pk=stat_id, then=Greatest(F(field) + Value(delta), Value(0))) for stat_id, delta in rows),
+                default=F(field),
+            )
+
+    with transaction.atomic():
+        rows = PlayerStats.objects.filter(pk__in=stat_ids)
+        updated = rows.update(**updates, updated_at=timezone.now(), updated_by=user, version=F('version') + 1) if updates else rows.count()
+        if updated != len(stat_ids):
+            found = set(rows.values_list('pk', flat=True))
+            raise UnknownPlayerStats([stat_id for stat_id in stat_ids if stat_id not in found])
+        return {row['stat_id']: row for row in rows.values('stat_id', *fields)}
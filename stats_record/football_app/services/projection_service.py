@@ -0,0 +1,159 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from ..models import Match, Team
+from ..simulation import fit_strengths, one_hot, simulate, simulate_chunk
+
+PROJECTION_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+# Upper bound on one computation; a crashed worker frees its season after this.
+PROJECTION_LOCK_TIMEOUT = 10 * 60
+
+
+def _projection_key(season_id, n_simulations):
+    return f'season-projections:{season_id}:{n_simulations}'
+
+
+def _lock_key(season_id):
+    return f'season-projections-lock:{season_id}'
+
+
+def _results_fingerprint(season_id):
+    """Changes with any edit to the season's matches, such as a new result: one aggregate query."""
+    state = Match.objects.filter(season_id=season_id).aggregate(last_updated=Max('updated_at'), count=Count('pk'))
+    return sha256(f"{state['last_updated']}:{state['count']}".encode()).hexdigest()[:32]
+
+
+def _run_simulations(n_simulations, workers, *arguments):
+    """Split the simulations into one chunk per worker process, each with its own random stream."""
+    chunks = np.array_split(np.arange(n_simulations), max(workers, 1))
+    seeds = np.random.SeedSequence().spawn(len(chunks))
+    tasks = [(len(chunk), seed, *arguments) for chunk, seed in zip(chunks, seeds) if len(chunk)]
+    # Daemonic processes, such as Celery's prefork workers, cannot start a pool.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        results = [simulate(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_chunk, tasks))
+    return sum(counts for counts, _ in results), sum(points for _, points in results)
+
+
+def project_season(season_id, n_simulations=None, workers=None):
+    """Simulate a season's remaining fixtures from a Poisson model fitted to its results.
+
+    Returns the current table, fitted strengths, expected points and the
+    probability of every finishing position by team. Runs in the background
+    (``schedule_projection``); the result is cached with the fingerprint of
+    the results it was fitted to, for ``season_projection`` to serve.
+    """
+    n_simulations = n_simulations or settings.SEASON_PROJECTION_SIMULATIONS
+    workers = settings.SEASON_PROJECTION_WORKERS if workers is None else workers
+    # Taken before reading the matches, so a result saved meanwhile leaves the projection stale.
+    fingerprint = _results_fingerprint(season_id)
+
+    matches = list(
+        Match.objects.filter(season_id=season_id)
+        .order_by('match_date', 'match_id')
+        .values_list('home_team_id', 'away_team_id', 'status', 'home_team_score', 'away_team_score')
+    )
+    team_ids = sorted({team_id for home_id, away_id, *_ in matches for team_id in (home_id, away_id)}, key=str)
+    index = {team_id: position for position, team_id in enumerate(team_ids)}
+    completed = [
+        (index[home_id], index[away_id], home_score, away_score)
+        for home_id, away_id, status, home_score, away_score in matches
+        if status == Match.COMPLETED and home_score is not None and away_score is not None
+    ]
+    remaining = [
+        (index[home_id], index[away_id])
+        for home_id, away_id, status, home_score, away_score in matches
+        if not (status == Match.COMPLETED and home_score is not None and away_score is not None)
+    ]
+
+    n_teams = len(team_ids)
+    home, away, home_goals, away_goals = (np.array(column, dtype=int) for column in zip(*completed)) if completed else [np.zeros(0, dtype=int)] * 4
+    home_matrix, away_matrix = one_hot(home, n_teams), one_hot(away, n_teams)
+    home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+    away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+    points = home_points @ home_matrix + away_points @ away_matrix
+    goals_for = home_goals @ home_matrix + away_goals @ away_matrix
+    goal_difference = goals_for - (away_goals @ home_matrix + home_goals @ away_matrix)
+
+    attack, defence, home_rate, away_rate = fit_strengths(n_teams, home, away, home_goals, away_goals)
+    fixture_home, fixture_away = (np.array(column, dtype=int) for column in zip(*remaining)) if remaining else [np.zeros(0, dtype=int)] * 2
+    home_expected = home_rate * attack[fixture_home] * defence[fixture_away]
+    away_expected = away_rate * attack[fixture_away] * defence[fixture_home]
+
+    position_counts, total_points = _run_simulations(
+        n_simulations, workers, n_teams, points, goal_difference, goals_for, fixture_home, fixture_away, home_expected, away_expected,
+    )
+    names = dict(Team.objects.filter(pk__in=team_ids).values_list('pk', 'team_name'))
+    projection = {
+        'season': season_id,
+        'simulations': n_simulations,
+        'generated_at': timezone.now(),
+        'completed_matches': len(completed),
+        'remaining_matches': len(remaining),
+        'teams': sorted(
+            (
+                {
+                    'team_id': team_id,
+                    'team_name': names.get(team_id, ''),
+                    'points': int(points[position]),
+                    'goal_difference': int(goal_difference[position]),
+                    'attack': round(float(attack[position]), 3),
+                    'defence': round(float(defence[position]), 3),
+                    'expected_points': round(float(total_points[position]) / n_simulations, 1),
+                    'position_probabilities': [round(float(count) / n_simulations, 4) for count in position_counts[position]],
+                }
+                for position, team_id in enumerate(team_ids)
+            ),
+            key=lambda team: (-team['expected_points'], team['team_name']),
+        ),
+    }
+    cache.set(_projection_key(season_id, n_simulations), {'fingerprint': fingerprint, 'projection': projection}, PROJECTION_CACHE_TIMEOUT)
+    return projection
+
+
+def refresh_projection(season_id):
+    """Compute and cache a season's projection, then let the next one be scheduled."""
+    try:
+        project_season(season_id)
+    finally:
+        cache.delete(_lock_key(season_id))
+
+
+def schedule_projection(season_id):
+    """Project the season in the background once the current transaction commits.
+
+    A cache lock keeps it to one computation per season at a time, however
+    many requests or results ask for it meanwhile.
+    """
+    from ..tasks import project_season_task
+
+    def enqueue():
+        if cache.add(_lock_key(season_id), True, PROJECTION_LOCK_TIMEOUT):
+            project_season_task.delay(str(season_id))
+
+    transaction.on_commit(enqueue)
+
+
+def season_projection(season_id):
+    """The season's cached projection, or None until the first one is computed.
+
+    When results changed since it was computed, a new projection is
+    scheduled and the previous one is served until it is ready.
+    """
+    key = _projection_key(season_id, settings.SEASON_PROJECTION_SIMULATIONS)
+    entry = cache.get(key)
+    if entry is None or entry['fingerprint'] != _results_fingerprint(season_id):
+        schedule_projection(season_id)
+        # Without a broker the task has already run.
+        entry = cache.get(key) or entry
+    return entry['projection'] if entry is not None else None
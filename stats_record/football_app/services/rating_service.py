@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+
+from ..models import Match, Team, TeamRating
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20
+# Friendlies move ratings less; other match types use K_FACTOR.
+K_FACTORS = {'friendly': 10}
+HOME_ADVANTAGE = 100
+RATING_BATCH_SIZE = 1000
+
+
+def expected_score(rating, opponent_rating):
+    """Expected points share (win 1, draw 0.5) of a team against an opponent."""
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def goal_margin_multiplier(goal_difference):
+    """Wins by a wider margin move ratings more, as in the World Football Elo ratings."""
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1
+    if goal_difference == 2:
+        return 1.5
+    return (11 + goal_difference) / 8
+
+
+class EloRatings:
+    """Running Elo ratings, fed one completed match at a time in ``match_date`` order."""
+
+    def __init__(self, ratings=None):
+        self.ratings = dict(ratings or {})
+
+    def rating(self, team_id):
+        return self.ratings.get(team_id, INITIAL_RATING)
+
+    def add_result(self, home_id, away_id, home_score, away_score, match_type=None):
+        """Rate one match; returns the home and away ``(rating_before, rating_after)``."""
+        home, away = self.rating(home_id), self.rating(away_id)
+        result = 1 if home_score > away_score else 0.5 if home_score == away_score else 0
+        change = (
+            K_FACTORS.get(match_type, K_FACTOR)
+            * goal_margin_multiplier(home_score - away_score)
+            * (result - expected_score(home + HOME_ADVANTAGE, away))
+        )
+        self.ratings[home_id], self.ratings[away_id] = home + change, away - change
+        return (home, home + change), (away, away - change)
+
+
+def latest_ratings(teams=None, before=None):
+    """Each team's rating after its last rated match (before ``before``), in one query."""
+    ratings = TeamRating.objects.filter(team=OuterRef('pk'))
+    if before is not None:
+        ratings = ratings.filter(match_date__lt=before)
+    latest = ratings.order_by('-match_date', '-match_id')
+    teams = Team.objects.all() if teams is None else teams
+    return teams.annotate(
+        rating=Subquery(latest.values('rating_after')[:1]),
+        rated_at=Subquery(latest.values('match_date')[:1]),
+    )
+
+
+def _replay(elo, matches):
+    """Stream completed matches through ``elo``, writing the ratings in batches."""
+    pending = []
+    rows = matches.order_by('match_date', 'match_id').values_list(
+        'match_id', 'match_date', 'home_team_id', 'away_team_id', 'home_team_score', 'away_team_score', 'match_type'
+    )
+    for match_id, match_date, home_id, away_id, home_score, away_score, match_type in rows.iterator(chunk_size=2000):
+        for team_id, (before, after) in zip((home_id, away_id), elo.add_result(home_id, away_id, home_score, away_score, match_type)):
+            pending.append(TeamRating(team_id=team_id, match_id=match_id, match_date=match_date, rating_before=before, rating_after=after))
+        if len(pending) >= RATING_BATCH_SIZE:
+            TeamRating.objects.bulk_create(pending)
+            pending = []
+    TeamRating.objects.bulk_create(pending)
+
+
+def _completed_matches():
+    return Match.objects.filter(status=Match.COMPLETED, home_team_score__isnull=False, away_team_score__isnull=False)
+
+
+def rebuild_team_ratings():
+    """Rate every completed match of every league in one streaming pass.
+
+    Memory is bounded by the number of teams (their running ratings) plus one
+    batch of rows to write, however long the history.
+    """
+    with transaction.atomic():
+        TeamRating.objects.all().delete()
+        _replay(EloRatings(), _completed_matches())
+
+
+def update_team_ratings(since):
+    """Re-rate the matches played at ``since`` or later.
+
+    Starts from each team's rating before ``since``, so rating the latest
+    match only replays that match, while a corrected older result also
+    carries through to every later match.
+    """
+    with transaction.atomic():
+        ratings = latest_ratings(before=since).filter(rating__isnull=False).values_list('pk', 'rating')
+        elo = EloRatings(ratings)
+        TeamRating.objects.filter(match_date__gte=since).delete()
+        _replay(elo, _completed_matches().filter(match_date__gte=since))
+
+
+def schedule_rating_update(since):
+    """Re-rate from ``since`` in the background once the current transaction commits."""
+    from ..tasks import update_ratings_since
+
+    transaction.on_commit(lambda: update_ratings_since.delay(since.isoformat()))
+
+
+def league_teams(league):
+    return Team.objects.filter(Q(leagues=league) | Q(league=league)).distinct()
@@ -0,0 +1,76 @@
+from difflib import SequenceMatcher
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from ..models import League, Player, Team
+
+SEARCH_TYPES = ['player', 'team', 'league']
+PREFIX_BOOST = 1.0
+
+# type -> (rows searched, searched name columns); teams and leagues pending deletion are left out
+SEARCHABLE = {
+    'player': (Player.objects.all, ['first_name', 'last_name']),
+    'team': (Team.objects.live, ['team_name']),
+    'league': (League.objects.live, ['name']),
+}
+
+
+def _display_name(kind, row):
+    return ' '.join(row[1:]) if kind == 'player' else row[1]
+
+
+def _postgres_search(kind, terms, limit):
+    """Rank rows by trigram word similarity, with rows whose name starts with a term first.
+
+    Every term has to match one of the columns, either fuzzily (``%>``, served by
+    the ``*_trgm`` GIN indexes) or as a prefix (served by the ``*_prefix`` indexes).
+    """
+    rows, columns = SEARCHABLE[kind]
+    queryset = rows()
+    scores = []
+    for term in terms:
+        matches = Q()
+        for column in columns:
+            matches |= Q(**{f'{column}__trigram_word_similar': term}) | Q(**{f'{column}__istartswith': term})
+            scores.append(TrigramWordSimilarity(term, column))
+            scores.append(Case(When(**{f'{column}__istartswith': term}, then=Value(PREFIX_BOOST)), default=Value(0.0)))
+        queryset = queryset.filter(matches)
+    score = Greatest(*scores, output_field=FloatField()) if len(scores) > 1 else scores[0]
+    rows = queryset.annotate(score=score).order_by(F('score').desc(), *columns).values_list('pk', *columns, 'score')[:limit]
+    return [(row[0], _display_name(kind, row), row[-1]) for row in rows]
+
+
+def _term_score(term, words):
+    """Prefix matches score above PREFIX_BOOST; otherwise the best fuzzy ratio against any word."""
+    if any(word.startswith(term) for word in words):
+        return PREFIX_BOOST + len(term) / max(len(word) for word in words)
+    return max((SequenceMatcher(None, term, word).ratio() for word in words), default=0)
+
+
+def _fallback_search(kind, terms, limit, threshold=0.6):
+    """In-memory fuzzy search for databases without pg_trgm, such as SQLite in development."""
+    rows, columns = SEARCHABLE[kind]
+    results = []
+    for row in rows().values_list('pk', *columns).iterator():
+        words = ' '.join(filter(None, row[1:])).lower().split()
+        term_scores = [_term_score(term, words) for term in terms]
+        if term_scores and min(term_scores) >= threshold:
+            results.append((row[0], _display_name(kind, row), min(term_scores)))
+    results.sort(key=lambda result: (-result[2], result[1]))
+    return results[:limit]
+
+
+def search(query, types=SEARCH_TYPES, limit=10):
+    """Search players, teams and leagues by name; returns up to ``limit`` results, best first."""
+    terms = query.lower().split()
+    find = _postgres_search if connection.vendor == 'postgresql' else _fallback_search
+    results = [
+        {'type': kind, 'id': pk, 'name': name, 'score': round(score, 3)}
+        for kind in types
+        for pk, name, score in find(kind, terms, limit)
+    ]
+    results.sort(key=lambda result: -result['score'])
+    return results[:limit]
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import PlayerStats
+from .comparison_service import MIN_REFERENCE_MINUTES, RATE_FIELDS, position_z_scores, season_totals
+
+SIMILARITY_METRICS = ['cosine', 'euclidean']
+SIMILARITY_INDEX_TIMEOUT = 24 * 60 * 60
+# How far back a refresh looks for rows saved around the previous one.
+INDEX_REFRESH_MARGIN = timedelta(minutes=1)
+
+
+def _index_key(season_id):
+    return f'similarity-index:{season_id}'
+
+
+def _player_vectors(season_id, player_ids=None):
+    """``{player_id: (position, matches, minutes, rates)}`` from one grouped query."""
+    rows = season_totals(season_id)
+    if player_ids is not None:
+        rows = rows.filter(player_id__in=player_ids)
+    return {
+        row['player_id']: (
+            row['player__primary_position'],
+            row['matches'],
+            row['minutes_played'],
+            np.array([row[field] for field in RATE_FIELDS], dtype=float),
+        )
+        for row in rows
+    }
+
+
+def season_index(season_id):
+    """The season's rate vectors by player, kept in the cache and refreshed incrementally.
+
+    Players with stats (or a player record) changed since the index was
+    built are recomputed, and so are players whose row count no longer
+    matches the index, which is how deleted rows show; players left without
+    rows are dropped. Rows saved within ``INDEX_REFRESH_MARGIN`` of a refresh
+    are checked again on the next one, in case their transaction committed
+    after the refresh read the table.
+    """
+    now = timezone.now()
+    key = _index_key(season_id)
+    index = cache.get(key)
+    if index is None:
+        index = {'players': _player_vectors(season_id)}
+    else:
+        season_rows = PlayerStats.objects.filter(season_played_id=season_id)
+        since = index['as_of'] - INDEX_REFRESH_MARGIN
+        dirty = set(
+            season_rows.filter(Q(updated_at__gte=since) | Q(player__updated_at__gte=since))
+            .values_list('player_id', flat=True)
+            .distinct()
+        )
+        rows = dict(season_rows.values('player_id').annotate(rows=Count('pk')).values_list('player_id', 'rows').order_by())
+        dirty.update(pk for pk, count in rows.items() if pk not in index['players'] or index['players'][pk][1] != count)
+        removed = index['players'].keys() - rows.keys()
+        if not dirty and not removed:
+            return index['players']
+        for pk in removed:
+            del index['players'][pk]
+        index['players'].update(_player_vectors(season_id, dirty) if dirty else {})
+    index['as_of'] = now
+    cache.set(key, index, SIMILARITY_INDEX_TIMEOUT)
+    return index['players']
+
+
+def nearest_neighbours(vectors, targets, k, metric='cosine'):
+    """The ``k`` rows of ``vectors`` nearest to each row of ``targets``, for all targets at once.
+
+    Returns ``(indices, scores)``, both ``len(targets) x k`` and nearest first:
+    cosine similarities (higher is closer) or euclidean distances (lower is closer).
+    """
+    k = min(k, len(vectors))
+    if metric == 'cosine':
+        vector_norms = np.linalg.norm(vectors, axis=1)
+        target_norms = np.linalg.norm(targets, axis=1)
+        scores = (targets @ vectors.T) / np.outer(np.where(target_norms > 0, target_norms, 1), np.where(vector_norms > 0, vector_norms, 1))
+        distances = -scores
+    else:
+        squared = (targets ** 2).sum(axis=1)[:, None] + (vectors ** 2).sum(axis=1)[None, :] - 2 * targets @ vectors.T
+        scores = distances = np.sqrt(np.maximum(squared, 0))
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    nearest = np.take_along_axis(nearest, np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1), axis=1)
+    return nearest, np.take_along_axis(scores, nearest, axis=1)
+
+
+def similar_players(player_id, season_id, k=10, metric='cosine'):
+    """Players of the same position whose season rates are most like ``player_id``'s.
+
+    Rates are standardised within the position, a missing rate counting as
+    average, and candidates need ``MIN_REFERENCE_MINUTES``. Returns
+    ``[(player_id, score)]`` nearest first, or None when the player has no
+    stats in the season.
+    """
+    players = season_index(season_id)
+    if player_id not in players:
+        return None
+    position = players[player_id][0]
+    ids = [pk for pk, (player_position, _, minutes, _) in players.items() if player_position == position and (minutes >= MIN_REFERENCE_MINUTES or pk == player_id)]
+    values = np.array([players[pk][3] for pk in ids], dtype=float).reshape(len(ids), len(RATE_FIELDS))
+    reference = np.array([players[pk][2] >= MIN_REFERENCE_MINUTES for pk in ids], dtype=bool)
+    vectors = np.nan_to_num(position_z_scores(np.full(len(ids), position, dtype=object), values, reference))
+
+    target = ids.index(player_id)
+    candidates = np.array([row for row in range(len(ids)) if row != target], dtype=int)
+    if not len(candidates):
+        return []
+    [nearest], [scores] = nearest_neighbours(vectors[candidates], vectors[[target]], k, metric)
+    return [(ids[candidates[row]], round(float(score), 4)) for row, score in zip(nearest, scores)]
@@ -0,0 +1,143 @@
+from datetime import datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Match, Season, StandingsSnapshot
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+SNAPSHOT_BATCH_SIZE = 100
+
+
+class LeagueTable:
+    """Running league table, fed one completed match at a time."""
+
+    def __init__(self, standings=()):
+        self.rows = {row['team_id']: dict(row) for row in standings}
+
+    def row(self, team_id, team_name):
+        if team_id not in self.rows:
+            self.rows[team_id] = {
+                'team_id': team_id,
+                'team_name': team_name,
+                'played': 0,
+                'won': 0,
+                'drawn': 0,
+                'lost': 0,
+                'goals_for': 0,
+                'goals_against': 0,
+                'goal_difference': 0,
+                'points': 0,
+            }
+        return self.rows[team_id]
+
+    def add_result(self, home_id, home_name, away_id, away_name, home_score, away_score):
+        for row, scored, conceded in (
+            (self.row(home_id, home_name), home_score, away_score),
+            (self.row(away_id, away_name), away_score, home_score),
+        ):
+            row['played'] += 1
+            row['goals_for'] += scored
+            row['goals_against'] += conceded
+            row['goal_difference'] = row['goals_for'] - row['goals_against']
+            if scored > conceded:
+                row['won'] += 1
+                row['points'] += POINTS_FOR_WIN
+            elif scored == conceded:
+                row['drawn'] += 1
+                row['points'] += POINTS_FOR_DRAW
+            else:
+                row['lost'] += 1
+
+    def standings(self):
+        return sorted(
+            (dict(row) for row in self.rows.values()),
+            key=lambda row: (-row['points'], -row['goal_difference'], -row['goals_for'], row['team_name']),
+        )
+
+
+def matchday_of(match_date):
+    return timezone.localtime(match_date).date()
+
+
+def completed_results(season_id, since=None):
+    """Completed results of a season in ``match_date`` order, as lightweight tuples."""
+    matches = Match.objects.filter(
+        season_id=season_id,
+        status=Match.COMPLETED,
+        home_team_score__isnull=False,
+        away_team_score__isnull=False,
+    )
+    if since is not None:
+        matches = matches.filter(match_date__gte=timezone.make_aware(datetime.combine(since, time.min)))
+    return matches.order_by('match_date').values_list(
+        'match_date',
+        'home_team_id',
+        'home_team__team_name',
+        'away_team_id',
+        'away_team__team_name',
+        'home_team_score',
+        'away_team_score',
+    )
+
+
+def _replay(season_id, table, results):
+    """Stream results into ``table``, writing a snapshot at the end of each matchday."""
+    pending = []
+    current_day = None
+    for match_date, home_id, home_name, away_id, away_name, home_score, away_score in results.iterator(chunk_size=2000):
+        day = matchday_of(match_date)
+        if current_day is not None and day != current_day:
+            pending.append(StandingsSnapshot(season_id=season_id, as_of=current_day, standings=table.standings()))
+            if len(pending) >= SNAPSHOT_BATCH_SIZE:
+                StandingsSnapshot.objects.bulk_create(pending)
+                pending = []
+        current_day = day
+        table.add_result(str(home_id), home_name, str(away_id), away_name, home_score, away_score)
+    if current_day is not None:
+        pending.append(StandingsSnapshot(season_id=season_id, as_of=current_day, standings=table.standings()))
+    StandingsSnapshot.objects.bulk_create(pending)
+
+
+def _lock_season(season_id):
+    """Serialise snapshot writers of a season until the transaction ends.
+
+    Concurrent rewrites would each delete the same matchdays and then insert
+    them twice, failing on the unique (season, as_of) constraint.
+    """
+    list(Season.objects.select_for_update().filter(pk=season_id).values_list('pk', flat=True))
+
+
+def rebuild_standings_snapshots(season_id):
+    """Rebuild every snapshot of a season in one pass over its completed matches."""
+    with transaction.atomic():
+        _lock_season(season_id)
+        StandingsSnapshot.objects.filter(season_id=season_id).delete()
+        _replay(season_id, LeagueTable(), completed_results(season_id))
+
+
+def update_standings_snapshots(season_id, since):
+    """Rewrite the snapshots of matchday ``since`` and later.
+
+    Starts from the last snapshot before ``since``, so recording the latest
+    matchday only replays that matchday's matches.
+    """
+    with transaction.atomic():
+        _lock_season(season_id)
+        previous = (
+            StandingsSnapshot.objects.filter(season_id=season_id, as_of__lt=since)
+            .order_by('-as_of')
+            .values_list('standings', flat=True)
+            .first()
+        )
+        StandingsSnapshot.objects.filter(season_id=season_id, as_of__gte=since).delete()
+        _replay(season_id, LeagueTable(previous or ()), completed_results(season_id, since=since))
+
+
+def standings_as_of(season_id, as_of=None):
+    """Return the snapshot of the last matchday on or before ``as_of`` (latest if omitted)."""
+    snapshots = StandingsSnapshot.objects.filter(season_id=season_id)
+    if as_of is not None:
+        snapshots = snapshots.filter(as_of__lte=as_of)
+    return snapshots.order_by('-as_of').first()
@@ -0,0 +1,107 @@
+import re
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Match, PlayerStats, TeamStats
+
+DERIVED_FIELDS = [
+    'season',
+    'league',
+    'opposing_team_name',
+    'match_outcome',
+    'match_goals',
+    'match_concided_goals',
+    'match_goal_scored_time',
+    'match_goal_concided_time',
+    'updated_by',
+    'updated_at',
+    'version',
+]
+
+
+def _minute(goal_time):
+    """Sort key for goal times recorded as 12, "45+2" or "90'"."""
+    digits = re.findall(r'\d+', str(goal_time))
+    return tuple(int(part) for part in digits) or (0,)
+
+
+def _outcome(scored, conceded):
+    if scored > conceded:
+        return TeamStats.WIN
+    if scored == conceded:
+        return TeamStats.DRAW
+    return TeamStats.LOSS
+
+
+def derive_team_stats(match, user=None):
+    """Build both teams' TeamStats of a completed match from the match and its PlayerStats.
+
+    Goals and outcome come from the match score, goal times and the squad
+    from the PlayerStats recorded for the match. Runs a fixed number of
+    queries whatever the squad size, in a single transaction. Possession is
+    not derivable and is kept as entered.
+    """
+    if match.status != Match.COMPLETED or match.home_team_score is None or match.away_team_score is None:
+        return []
+
+    sides = [
+        (match.home_team, match.away_team, match.home_team_score, match.away_team_score),
+        (match.away_team, match.home_team, match.away_team_score, match.home_team_score),
+    ]
+    now = timezone.now()
+
+    with transaction.atomic():
+        existing = {
+            stats.team_name_id: stats
+            for stats in TeamStats.objects.select_for_update().filter(match=match)
+        }
+        players = defaultdict(set)
+        goal_times = defaultdict(list)
+        player_rows = PlayerStats.objects.filter(
+            match_type=match,
+            current_team_id__in=[match.home_team_id, match.away_team_id],
+        ).values_list('current_team_id', 'player_id', 'goal_scored_time')
+        for team_id, player_id, times in player_rows:
+            players[team_id].add(player_id)
+            goal_times[team_id].extend(times or [])
+
+        created, updated = [], []
+        for team, opponent, scored, conceded in sides:
+            stats = existing.get(team.pk)
+            if stats is None:
+                stats = TeamStats(match=match, team_name=team, created_by=user)
+                created.append(stats)
+            else:
+                stats.version = F('version') + 1
+                updated.append(stats)
+            stats.season_id = match.season_id
+            stats.league_id = match.league_id
+            stats.opposing_team_name = opponent.team_name
+            stats.match_outcome = _outcome(scored, conceded)
+            stats.match_goals = scored
+            stats.match_concided_goals = conceded
+            stats.match_goal_scored_time = sorted(goal_times[team.pk], key=_minute)
+            stats.match_goal_concided_time = sorted(goal_times[opponent.pk], key=_minute)
+            stats.updated_by = user
+            stats.updated_at = now
+
+        TeamStats.objects.bulk_create(created)
+        TeamStats.objects.bulk_update(updated, DERIVED_FIELDS)
+
+        team_stats = created + updated
+        Squad = TeamStats.players.through
+        Squad.objects.filter(teamstats__in=team_stats).delete()
+        Squad.objects.bulk_create([
+            Squad(teamstats_id=stats.pk, player_id=player_id)
+            for stats in team_stats
+            for player_id in players[stats.team_name_id]
+        ])
+    return team_stats
+
+
+def clear_team_stats(match):
+    """Remove the derived TeamStats of a match that is no longer completed."""
+    TeamStats.objects.filter(match=match).delete()
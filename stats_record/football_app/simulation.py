@@ -0,0 +1,80 @@
+"""
+Poisson model of football scores and Monte Carlo simulation of a season's remaining fixtures.
+
+Plain NumPy on team indices, without Django, so chunks of simulations can
+run in worker processes.
+"""
+import numpy as np
+
+# Pseudo-matches of league-average scoring added to every team, so a team
+# with a handful of results is not rated on those alone.
+PRIOR_MATCHES = 2
+FIT_ITERATIONS = 50
+
+
+def one_hot(indices, size):
+    matrix = np.zeros((len(indices), size))
+    matrix[np.arange(len(indices)), indices] = 1
+    return matrix
+
+
+def fit_strengths(n_teams, home, away, home_goals, away_goals):
+    """Fit attack and defence strengths of a Poisson model to completed results.
+
+    Expected goals are ``home_rate * attack[home] * defence[away]`` for the
+    home team and ``away_rate * attack[away] * defence[home]`` for the away
+    team, with attack and defence averaging 1; fitted by maximum likelihood
+    with the usual fixed-point iteration. Returns
+    ``(attack, defence, home_rate, away_rate)``.
+    """
+    home, away = np.asarray(home, dtype=int), np.asarray(away, dtype=int)
+    home_goals, away_goals = np.asarray(home_goals, dtype=float), np.asarray(away_goals, dtype=float)
+    matches = max(len(home), 1)
+    home_rate = max(home_goals.sum(), 1) / matches
+    away_rate = max(away_goals.sum(), 1) / matches
+    home_matrix, away_matrix = one_hot(home, n_teams), one_hot(away, n_teams)
+    scored = home_goals @ home_matrix + away_goals @ away_matrix + PRIOR_MATCHES * (home_rate + away_rate) / 2
+    conceded = away_goals @ home_matrix + home_goals @ away_matrix + PRIOR_MATCHES * (home_rate + away_rate) / 2
+
+    attack, defence = np.ones(n_teams), np.ones(n_teams)
+    for _ in range(FIT_ITERATIONS):
+        exposure = home_rate * (defence[away] @ home_matrix) + away_rate * (defence[home] @ away_matrix)
+        attack = scored / (exposure + PRIOR_MATCHES * (home_rate + away_rate) / 2)
+        attack /= attack.mean()
+        exposure = away_rate * (attack[away] @ home_matrix) + home_rate * (attack[home] @ away_matrix)
+        defence = conceded / (exposure + PRIOR_MATCHES * (home_rate + away_rate) / 2)
+        defence /= defence.mean()
+    return attack, defence, home_rate, away_rate
+
+
+def simulate(n_simulations, seed, n_teams, points, goal_difference, goals_for, home, away, home_expected, away_expected):
+    """Play the remaining fixtures ``n_simulations`` times; returns ``(position_counts, total_points)``.
+
+    ``points``, ``goal_difference`` and ``goals_for`` are the current table by
+    team index, ``home``/``away`` the teams of each remaining fixture and
+    ``*_expected`` their expected goals. ``position_counts[team, position]``
+    counts the simulations in which the team finished in that position (0 is
+    first), ranked on points, goal difference, goals scored, then by lot.
+    """
+    rng = np.random.default_rng(seed)
+    home_matrix, away_matrix = one_hot(home, n_teams), one_hot(away, n_teams)
+    home_goals = rng.poisson(home_expected, size=(n_simulations, len(home)))
+    away_goals = rng.poisson(away_expected, size=(n_simulations, len(away)))
+    home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+    away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+
+    final_points = points + home_points @ home_matrix + away_points @ away_matrix
+    final_difference = goal_difference + (home_goals - away_goals) @ home_matrix + (away_goals - home_goals) @ away_matrix
+    final_goals = goals_for + home_goals @ home_matrix + away_goals @ away_matrix
+    # One sortable key per team: points, then goal difference, then goals scored, then a random draw.
+    key = final_points * 1e9 + (final_difference + 5e3) * 1e4 + np.minimum(final_goals, 9999) + rng.random(final_points.shape)
+    positions = np.argsort(np.argsort(-key, axis=1), axis=1)
+
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    np.add.at(position_counts, (np.broadcast_to(np.arange(n_teams), positions.shape), positions), 1)
+    return position_counts, final_points.sum(axis=0)
+
+
+def simulate_chunk(arguments):
+    """``simulate`` with its arguments as one tuple, for ``Executor.map``."""
+    return simulate(*arguments)
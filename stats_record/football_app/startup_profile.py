@@ -0,0 +1,66 @@
+"""Measures how long a worker takes to boot, per installed app.
+
+Run as ``python -m football_app.startup_profile`` in a fresh interpreter (see
+``manage.py profile_startup``): once Django is set up there is nothing left to measure.
+"""
+import json
+import time
+
+
+def measure_startup():
+    """Boot Django and time settings, each app's import/models/ready(), middleware and URLconf."""
+    start = time.perf_counter()
+    timings = {'apps': {}}
+
+    from django.conf import settings
+    settings.INSTALLED_APPS  # noqa: B018 - imports the settings module
+    timings['settings'] = time.perf_counter() - start
+
+    from django.apps.config import AppConfig
+
+    original_create = AppConfig.create.__func__
+    original_import_models = AppConfig.import_models
+
+    def create(cls, entry):
+        began = time.perf_counter()
+        config = original_create(cls, entry)
+        app = timings['apps'][config.label] = {'entry': entry, 'import': time.perf_counter() - began}
+        original_ready = config.ready
+
+        def ready():
+            began = time.perf_counter()
+            original_ready()
+            app['ready'] = time.perf_counter() - began
+
+        config.ready = ready
+        return config
+
+    def import_models(self):
+        began = time.perf_counter()
+        original_import_models(self)
+        timings['apps'][self.label]['models'] = time.perf_counter() - began
+
+    AppConfig.create = classmethod(create)
+    AppConfig.import_models = import_models
+
+    began = time.perf_counter()
+    import django
+    django.setup(set_prefix=False)
+    timings['setup'] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+    WSGIHandler()
+    timings['middleware'] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    from django.urls import get_resolver
+    get_resolver().url_patterns  # noqa: B018 - imports the URLconf and every view
+    timings['urlconf'] = time.perf_counter() - began
+
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == '__main__':
+    print(json.dumps(measure_startup()))
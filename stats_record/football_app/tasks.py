@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from celery import shared_task
+from django.apps import apps
+from django.db import IntegrityError
+
+from .models import Season
+from .services.deletion_service import delete_in_batches
+from .services.freeze_service import freeze_season
+from .services.projection_service import refresh_projection
+from .services.rating_service import update_team_ratings
+
+
+@shared_task(acks_late=True)
+def delete_pending_entity(model_label, pk):
+    """Delete a League, Season or Team marked for deletion, with its dependents, in batches."""
+    delete_in_batches(apps.get_model(model_label), pk)
+
+
+@shared_task(acks_late=True, autoretry_for=(IntegrityError,), retry_backoff=True, max_retries=5)
+def update_ratings_since(since):
+    """Re-rate the matches played at ``since`` (ISO 8601) or later.
+
+    Two overlapping replays can collide on the ratings they write; the
+    loser retries and replays again on top of the winner's ratings.
+    """
+    update_team_ratings(datetime.fromisoformat(since))
+
+
+@shared_task(acks_late=True)
+def refreeze_season(season_id):
+    """Re-render a frozen season's artefacts if its data changed since they were rendered."""
+    season = Season.objects.filter(pk=season_id, frozen_at__isnull=False).first()
+    if season is not None:
+        freeze_season(season)
+
+
+@shared_task(acks_late=True)
+def project_season_task(season_id):
+    """Simulate a season's remaining fixtures and cache the projection."""
+    refresh_projection(season_id)
@@ -1,3 +1,1196 @@
-from django.test import TestCase
+import tempfile
+from importlib import import_module
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, models, transaction
+from django.db.models.signals import post_delete
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from stats_record import settings_api
+
+from . import throttling
+from .models import CustomUser, League, Match, Player, PlayerStats, PlayerTeamSpell, Season, Team, TeamRating, TeamStats
+from .models.base_model import ConcurrentUpdateError
+from .models.model_player_stat import EFFICIENCY_FIELDS
+from .services.career_service import rebuild_player_spells
+from .services.comparison_service import UnknownPlayers, compare_players
+from .services.deletion_service import delete_in_batches
+from .services.fixture_service import round_robin
+from .services.freeze_service import ARTEFACT_MAX_AGE, freeze_season
+from .services.partition_service import PartitioningError, partition_stats_tables
+from .services.projection_service import refresh_projection
+from .services.rating_service import HOME_ADVANTAGE, INITIAL_RATING, EloRatings, rebuild_team_ratings, update_team_ratings
+from .services.standings_service import matchday_of, rebuild_standings_snapshots, standings_as_of, update_standings_snapshots
+from .services.team_stats_service import derive_team_stats
+from .simulation import fit_strengths, simulate
+from .throttling import ScopedThrottle, SlidingWindowThrottle, throttle_scope
+from .views.base_view import PreconditionFailed
+from .views.player_stat_view import MAX_INCREMENT_BATCH
+
+
+class BaseModelSaveTests(TestCase):
+    """BaseModel.save only writes the fields changed since the row was loaded."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username='operator', email='operator@example.com')
+        league = League.objects.create(name='League', country='NG', founded_year=1990)
+        home = Team.objects.create(team_name='Home', league=league)
+        away = Team.objects.create(team_name='Away', league=league)
+        season = Season.objects.create(league=league, year='2024/2025', start_date=date(2024, 8, 1), end_date=date(2025, 5, 30))
+        match = Match.objects.create(
+            season=season,
+            league=league,
+            home_team=home,
+            away_team=away,
+            match_date=datetime(2024, 9, 1, 15, tzinfo=timezone.utc),
+            venue='Stadium',
+        )
+        player = Player.objects.create(first_name='Ada', last_name='Eze', height=1.8, team=home, league=league, primary_position='MID')
+        cls.stats = PlayerStats.objects.create(
+            player=player,
+            current_team=home,
+            season_played=season,
+            match_type=match,
+            opposing_team='Away',
+            goal_scored_time=['12'],
+        )
+
+    def load(self):
+        return PlayerStats.objects.get(pk=self.stats.pk)
+
+    def updates(self, queries):
+        return [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+
+    def test_update_writes_only_changed_fields(self):
+        stats = self.load()
+        stats.tackle_success = 3
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+
+        [sql] = self.updates(queries)
+        assigned = sql.split(' WHERE ')[0]
+        self.assertIn('"tackle_success"', assigned)
+        self.assertIn('"updated_at"', assigned)
+        self.assertIn('"updated_by_id"', assigned)
+        self.assertNotIn('"goal_scored_time"', assigned)
+        self.assertNotIn('"opposing_team"', assigned)
+        self.assertEqual(self.load().tackle_success, 3)
+
+    def test_unchanged_instance_is_not_written(self):
+        stats = self.load()
+        stats.tackle_success = stats.tackle_success
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+        self.assertEqual(len(queries), 0)
+
+    def test_created_instance_is_tracked(self):
+        team = Team.objects.create(team_name='New')
+        with CaptureQueriesContext(connection) as queries:
+            team.save()
+        self.assertEqual(len(queries), 0)
+
+        team.manager_name = 'Coach'
+        with CaptureQueriesContext(connection) as queries:
+            team.save()
+        [sql] = self.updates(queries)
+        self.assertIn('"manager_name"', sql)
+        self.assertNotIn('"team_name"', sql.split(' WHERE ')[0])
+
+    def test_in_place_json_change_is_detected(self):
+        stats = self.load()
+        stats.goal_scored_time.append('80')
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+
+        [sql] = self.updates(queries)
+        self.assertIn('"goal_scored_time"', sql)
+        self.assertEqual(self.load().goal_scored_time, ['12', '80'])
+
+    def test_saved_values_become_the_new_baseline(self):
+        stats = self.load()
+        stats.duel_fail = 2
+        stats.save()
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+        self.assertEqual(len(queries), 0)
+
+    def test_explicit_update_fields_are_kept(self):
+        stats = self.load()
+        stats.tackle_success = 4
+        stats.duel_fail = 5
+        with CaptureQueriesContext(connection) as queries:
+            stats.save(update_fields=['duel_fail'])
+
+        [sql] = self.updates(queries)
+        self.assertNotIn('"tackle_success"', sql)
+        self.assertEqual(self.load().tackle_success, 0)
+        self.assertEqual(stats.get_changed_fields(), ['tackle_success'])
+
+    def test_updated_by_is_kept_unless_a_user_is_given(self):
+        stats = self.load()
+        stats.updated_by = self.user
+        stats.save()
+
+        stats = self.load()
+        stats.duel_success = 1
+        stats.save()
+        self.assertEqual(self.load().updated_by, self.user)
+
+        other = CustomUser.objects.create(username='other', email='other@example.com')
+        stats.duel_success = 2
+        stats.save(user=other)
+        self.assertEqual(self.load().updated_by, other)
+
+    def test_refresh_from_db_resets_the_baseline(self):
+        stats = self.load()
+        PlayerStats.objects.filter(pk=stats.pk).update(tackle_fail=7)
+        stats.refresh_from_db()
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+        self.assertEqual(len(queries), 0)
+
+    def test_deferred_field_set_after_load_is_written(self):
+        stats = PlayerStats.objects.only('pk', 'tackle_success').get(pk=self.stats.pk)
+        stats.opposing_team = 'Rivals'
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+
+        [sql] = self.updates(queries)
+        self.assertIn('"opposing_team"', sql)
+        self.assertEqual(self.load().opposing_team, 'Rivals')
+
+
+def create_player_stats():
+    """A league, two teams, a season and a match, with one player's PlayerStats for the match."""
+    league = League.objects.create(name='League', country='NG', founded_year=1990)
+    home = Team.objects.create(team_name='Home', league=league)
+    away = Team.objects.create(team_name='Away', league=league)
+    season = Season.objects.create(league=league, year='2024/2025', start_date=date(2024, 8, 1), end_date=date(2025, 5, 30))
+    match = Match.objects.create(
+        season=season,
+        league=league,
+        home_team=home,
+        away_team=away,
+        match_date=datetime(2024, 9, 1, 15, tzinfo=timezone.utc),
+        venue='Stadium',
+    )
+    player = Player.objects.create(first_name='Ada', last_name='Eze', height=1.8, team=home, league=league, primary_position='MID')
+    return PlayerStats.objects.create(
+        player=player,
+        current_team=home,
+        season_played=season,
+        match_type=match,
+        opposing_team='Away',
+        goal_scored_time=['12'],
+    )
+
+
+class PlayerStatsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username='operator', email='operator@example.com')
+        cls.stats = create_player_stats()
+
+    def load(self):
+        return PlayerStats.objects.get(pk=self.stats.pk)
+
+    def updates(self, queries):
+        return [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+
+
+class OptimisticConcurrencyTests(PlayerStatsTestCase):
+    """Updates are conditional on the version the row was loaded with."""
+
+    def test_update_bumps_version_conditionally(self):
+        stats = self.load()
+        version = stats.version
+        stats.tackle_success = 1
+        with CaptureQueriesContext(connection) as queries:
+            stats.save()
+
+        [sql] = self.updates(queries)
+        self.assertIn('"version" = %d' % version, sql.split(' WHERE ')[1])
+        self.assertEqual(stats.version, version + 1)
+        self.assertEqual(self.load().version, version + 1)
+
+    def test_stale_update_raises(self):
+        first, second = self.load(), self.load()
+        first.tackle_success = 1
+        first.save()
+
+        second.duel_fail = 1
+        with self.assertRaises(ConcurrentUpdateError), transaction.atomic():
+            second.save()
+        self.assertEqual(second.version, first.version - 1)
+        self.assertEqual(self.load().duel_fail, 0)
+
+
+class IfMatchTests(PlayerStatsTestCase):
+    """The detail views expose the version as ETag and honour If-Match."""
+
+    def setUp(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        self.url = f'/player-stats/{self.stats.pk}/'
+
+    def test_etag_and_if_match(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(etag, f'"{self.load().version}"')
+
+        response = self.client.patch(self.url, {'tackle_success': 2}, content_type='application/json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.patch(self.url, {'tackle_success': 3}, content_type='application/json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.load().tackle_success, 2)
+
+    def test_version_is_read_only(self):
+        version = self.load().version
+        response = self.client.patch(self.url, {'version': 99, 'duel_fail': 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], version + 1)
+
+
+class ConcurrentUpdateResponseTests(PlayerStatsTestCase):
+    """A save that loses an optimistic-concurrency race answers 412 from any API view, not 500."""
+
+    def test_stale_save_in_an_update(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        with mock.patch.object(PlayerStats, 'save', side_effect=ConcurrentUpdateError('stale')):
+            response = self.client.patch(f'/player-stats/{self.stats.pk}/', {'tackle_success': 2}, content_type='application/json')
+        self.assertEqual(response.status_code, 412)
+
+    def test_stale_save_outside_the_detail_views(self):
+        # e.g. the password hash upgrade during login saving a user edited in between
+        self.user.set_password('secret-password')
+        self.user.save()
+        with mock.patch.object(CustomUser, 'check_password', side_effect=ConcurrentUpdateError('stale')):
+            response = self.client.post('/login/', {'email': self.user.email, 'password': 'secret-password'})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()['detail'], PreconditionFailed.default_detail)
+
+
+class PlayerStatsIncrementTests(PlayerStatsTestCase):
+    """Counters are incremented in the database, one row or a batch at a time."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        player = Player.objects.create(
+            first_name='Bola', last_name='Ade', height=1.7, team=cls.stats.current_team, league=cls.stats.match_type.league, primary_position='DEF'
+        )
+        cls.other = PlayerStats.objects.create(
+            player=player,
+            current_team=cls.stats.current_team,
+            season_played=cls.stats.season_played,
+            match_type=cls.stats.match_type,
+            opposing_team='Away',
+        )
+
+    def setUp(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+
+    def post(self, url, data):
+        return self.client.post(url, data, content_type='application/json')
+
+    def test_single_increment(self):
+        response = self.post(f'/player-stats/{self.stats.pk}/increment/', {'tackle_success': 2, 'duel_fail': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'stat_id': str(self.stats.pk), 'duel_fail': 1, 'tackle_success': 2})
+
+        response = self.post(f'/player-stats/{self.stats.pk}/increment/', {'duel_fail': -5})
+        self.assertEqual(response.json()['duel_fail'], 0)
+        stats = self.load()
+        self.assertEqual((stats.tackle_success, stats.duel_fail, stats.updated_by), (2, 0, self.user))
+
+    def test_batch_increment_sums_deltas_per_row(self):
+        response = self.post('/player-stats/increments/', [
+            {'stat_id': str(self.stats.pk), 'increments': {'tackle_success': 1}},
+            {'stat_id': str(self.other.pk), 'increments': {'duel_success': 3}},
+            {'stat_id': str(self.stats.pk), 'increments': {'tackle_success': 2}},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.load().tackle_success, 3)
+        self.assertEqual(PlayerStats.objects.get(pk=self.other.pk).duel_success, 3)
+
+    def test_unknown_ids(self):
+        unknown = '00000000-0000-0000-0000-000000000000'
+        self.assertEqual(self.post(f'/player-stats/{unknown}/increment/', {'tackle_success': 1}).status_code, 404)
+
+        response = self.post('/player-stats/increments/', [
+            {'stat_id': str(self.stats.pk), 'increments': {'tackle_success': 1}},
+            {'stat_id': unknown, 'increments': {'tackle_success': 1}},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'stat_id': [f'Unknown player stats: {unknown}']})
+        self.assertEqual(self.load().tackle_success, 0)
+
+    def test_batch_size_is_capped(self):
+        item = {'stat_id': str(self.stats.pk), 'increments': {'tackle_success': 1}}
+        self.assertEqual(self.post('/player-stats/increments/', [item] * (MAX_INCREMENT_BATCH + 1)).status_code, 400)
+        self.assertEqual(self.load().tackle_success, 0)
+
+        self.assertEqual(self.post('/player-stats/increments/', [item] * MAX_INCREMENT_BATCH).status_code, 200)
+        self.assertEqual(self.load().tackle_success, MAX_INCREMENT_BATCH)
+
+    def test_increments_refresh_derived_team_stats(self):
+        Match.objects.filter(pk=self.stats.match_type_id).update(status=Match.COMPLETED, home_team_score=1, away_team_score=0)
+        self.post(f'/player-stats/{self.stats.pk}/increment/', {'tackle_success': 1})
+        home_stats = TeamStats.objects.get(match_id=self.stats.match_type_id, team_name_id=self.stats.current_team_id)
+        self.assertEqual(home_stats.match_goal_scored_time, ['12'])
+        self.assertEqual(set(home_stats.players.values_list('pk', flat=True)), {self.stats.player_id, self.other.player_id})
+
+
+class EloRatingsTests(TestCase):
+    """Elo ratings move by the points won above expectation, more for wider margins."""
+
+    def test_ratings_are_zero_sum(self):
+        elo = EloRatings()
+        (home_before, home_after), (away_before, away_after) = elo.add_result('home', 'away', 2, 1)
+        self.assertEqual((home_before, away_before), (INITIAL_RATING, INITIAL_RATING))
+        self.assertGreater(home_after, INITIAL_RATING)
+        self.assertAlmostEqual(home_after + away_after, 2 * INITIAL_RATING)
+        self.assertEqual(elo.rating('home'), home_after)
+
+    def test_home_draw_between_equal_teams_costs_the_home_team(self):
+        (_, home_after), _ = EloRatings().add_result('home', 'away', 1, 1)
+        self.assertLess(home_after, INITIAL_RATING)
+
+    def test_wider_margins_and_friendlies(self):
+        _, (_, narrow) = EloRatings().add_result('home', 'away', 0, 1)
+        _, (_, wide) = EloRatings().add_result('home', 'away', 0, 4)
+        _, (_, friendly) = EloRatings().add_result('home', 'away', 0, 1, 'friendly')
+        self.assertGreater(wide - INITIAL_RATING, narrow - INITIAL_RATING)
+        self.assertAlmostEqual(friendly - INITIAL_RATING, (narrow - INITIAL_RATING) / 2)
+
+    def test_expected_result_moves_little(self):
+        elo = EloRatings({'home': INITIAL_RATING + 400 - HOME_ADVANTAGE})
+        (before, after), _ = elo.add_result('home', 'away', 1, 0)
+        self.assertLess(after - before, 2)
+
+
+class TeamRatingReplayTests(TestCase):
+    """Re-rating from a corrected match gives the ratings of a full rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        league = League.objects.create(name='League', country='NG', founded_year=1990)
+        cls.teams = [Team.objects.create(team_name=f'Team {number}', league=league) for number in range(3)]
+        season = Season.objects.create(league=league, year='2024/2025', start_date=date(2024, 8, 1), end_date=date(2025, 5, 30))
+        kick_off = datetime(2024, 9, 1, 15, tzinfo=timezone.utc)
+        cls.matches = [
+            Match.objects.create(
+                season=season,
+                league=league,
+                home_team=cls.teams[home],
+                away_team=cls.teams[away],
+                match_date=kick_off + timedelta(weeks=week),
+                venue='Stadium',
+                status=Match.COMPLETED,
+                home_team_score=home_score,
+                away_team_score=away_score,
+            )
+            for week, (home, away, home_score, away_score) in enumerate([(0, 1, 2, 0), (1, 2, 1, 1), (2, 0, 0, 3), (0, 2, 1, 2)])
+        ]
+
+    def ratings(self):
+        return list(TeamRating.objects.order_by('match_date', 'team_id').values_list('team_id', 'match_id', 'rating_before', 'rating_after'))
+
+    def test_replay_after_correction_matches_rebuild(self):
+        rebuild_team_ratings()
+        corrected = self.matches[1]
+        corrected.home_team_score = 3
+        corrected.save()
+
+        update_team_ratings(corrected.match_date)
+        replayed = self.ratings()
+        rebuild_team_ratings()
+        self.assertEqual(len(replayed), 2 * len(self.matches))
+        for row, expected in zip(replayed, self.ratings()):
+            self.assertEqual(row[:2], expected[:2])
+            self.assertAlmostEqual(row[2], expected[2])
+            self.assertAlmostEqual(row[3], expected[3])
+
+    def test_earlier_ratings_are_kept(self):
+        rebuild_team_ratings()
+        before = self.ratings()[:2]
+        update_team_ratings(self.matches[1].match_date)
+        self.assertEqual(self.ratings()[:2], before)
+
+    def test_command_rejects_a_bad_since(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_team_ratings', since='last week')
+
+
+class SimulationTests(TestCase):
+    """The Poisson fit and the Monte Carlo simulation of the remaining fixtures."""
+
+    def test_strengths_follow_results(self):
+        attack, defence, home_rate, away_rate = fit_strengths(3, [0, 1, 2, 0], [1, 2, 0, 2], [4, 1, 0, 3], [0, 1, 2, 0])
+        self.assertAlmostEqual(attack.mean(), 1)
+        self.assertAlmostEqual(defence.mean(), 1)
+        self.assertEqual(attack.argmax(), 0)
+        self.assertEqual(defence.argmin(), 0)
+        self.assertEqual((home_rate, away_rate), (2, 0.75))
+
+    def test_position_probabilities_sum_to_one(self):
+        home, away = np.array([0, 1, 2, 3, 0, 1]), np.array([1, 0, 3, 2, 2, 3])
+        counts, total_points = simulate(1000, 1, 4, np.array([6, 4, 3, 0]), np.zeros(4), np.zeros(4), home, away, np.full(6, 1.4), np.full(6, 1.1))
+        self.assertEqual(counts.sum(axis=0).tolist(), [1000] * 4)
+        self.assertEqual(counts.sum(axis=1).tolist(), [1000] * 4)
+        self.assertTrue((total_points >= np.array([6, 4, 3, 0]) * 1000).all())
+
+    def test_table_is_fixed_when_no_fixtures_remain(self):
+        none = np.zeros(0, dtype=int)
+        counts, total_points = simulate(100, 1, 3, np.array([3, 9, 6]), np.zeros(3), np.zeros(3), none, none, np.zeros(0), np.zeros(0))
+        self.assertEqual(counts.tolist(), [[0, 0, 100], [100, 0, 0], [0, 100, 0]])
+        self.assertEqual(total_points.tolist(), [300, 900, 600])
+
+
+@override_settings(SEASON_PROJECTION_SIMULATIONS=500, SEASON_PROJECTION_WORKERS=1)
+class SeasonProjectionsTests(PlayerStatsTestCase):
+    """Projections are computed in the background and served from the cache."""
+
+    def setUp(self):
+        cache.clear()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        self.season = self.stats.season_played
+        self.url = f'/seasons/{self.season.pk}/projections/'
+
+    def test_accepted_until_computed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+
+        refresh_projection(self.season.pk)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['remaining_matches'], 1)
+        for team in response.json()['teams']:
+            self.assertAlmostEqual(sum(team['position_probabilities']), 1, places=3)
+
+    def test_stale_projection_is_served_while_recomputed(self):
+        refresh_projection(self.season.pk)
+        match = self.stats.match_type
+        match.status, match.home_team_score, match.away_team_score = Match.COMPLETED, 2, 0
+        match.save()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['remaining_matches'], 1)
+        self.assertEqual(len(callbacks), 1)
+
+        refresh_projection(self.season.pk)
+        self.assertEqual(self.client.get(self.url).json()['completed_matches'], 1)
+
+
+class PlayerStatsSeasonTests(PlayerStatsTestCase):
+    """Every PlayerStats row has a season, the key its table is partitioned by."""
+
+    def setUp(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+
+    def test_season_is_required(self):
+        data = {
+            'player': str(self.stats.player_id),
+            'current_team': str(self.stats.current_team_id),
+            'match_type': str(self.stats.match_type_id),
+            'opposing_team': 'Away',
+        }
+        response = self.client.post('/player-stats/', data, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('season_played', response.json())
+
+        response = self.client.post('/player-stats/', {**data, 'season_played': str(self.stats.season_played_id)}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+
+@skipIf(connection.vendor == 'postgresql', 'Checks the refusal on databases without declarative partitioning.')
+class PartitioningGuardTests(TestCase):
+    """Partitioning refuses to run its PostgreSQL DDL on other databases."""
+
+    def test_service_refuses(self):
+        with self.assertRaises(PartitioningError):
+            partition_stats_tables(convert=True)
+
+    def test_command_fails(self):
+        with self.assertRaises(CommandError):
+            call_command('partition_stats_tables', '--convert')
+
+
+class FrozenArtefactRetentionTests(PlayerStatsTestCase):
+    """Re-freezing keeps the superseded artefacts for as long as they may be cached."""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.season = self.stats.season_played
+
+    def artefact_names(self):
+        return {artefact['name'] for artefact in self.season.frozen_manifest['artefacts'].values()}
+
+    def test_superseded_artefacts_are_kept_then_purged(self):
+        freeze_season(self.season)
+        first = self.artefact_names()
+        stats = self.load()
+        stats.goal_scored = 2
+        stats.save()
+
+        freeze_season(self.season)
+        replaced = first - self.artefact_names()
+        self.assertTrue(replaced)
+        self.assertEqual(set(self.season.frozen_manifest['superseded']), replaced)
+        self.assertTrue(all(default_storage.exists(name) for name in replaced))
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=ARTEFACT_MAX_AGE + 1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.assertFalse(freeze_season(self.season))
+        self.assertEqual(self.season.frozen_manifest['superseded'], {})
+        self.assertFalse(any(default_storage.exists(name) for name in replaced))
+        self.assertTrue(all(default_storage.exists(name) for name in self.artefact_names()))
+
+
+class ClientThrottle(SlidingWindowThrottle):
+    rate = '60/min'
+
+    def get_cache_key(self, request, view):
+        return 'throttle-test'
+
+
+class SlidingWindowThrottleTests(TestCase):
+    """Requests are counted in the cache; leases and refusals are kept per process."""
+
+    # The start of a window.
+    START = 60 * 1000
+
+    def setUp(self):
+        cache.clear()
+        throttling._leases.clear()
+        self.addCleanup(throttling._leases.clear)
+
+    def allow(self, at, rate=None):
+        throttle = ClientThrottle()
+        if rate is not None:
+            throttle.rate = rate
+            throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+        throttle.timer = lambda: self.START + at
+        return throttle.allow_request(None, None), throttle
+
+    def test_limit_is_enforced(self):
+        granted = [self.allow(second / 2)[0] for second in range(100)]
+        self.assertEqual(granted.count(True), 60)
+        self.assertEqual(granted[60:], [False] * 40)
+        self.assertEqual(cache.get(f'throttle-test:{self.START // 60}'), 60)
+
+    def test_partial_lease_is_given_back(self):
+        window = self.START // 60
+        self.allow(0, '100/min')
+        # Another process spent almost all of the window since.
+        cache.incr(f'throttle-test:{window}', 96)
+        allowed, _ = self.allow(1, '100/min')
+        self.assertTrue(allowed)
+        self.assertEqual(cache.get(f'throttle-test:{window}'), 100)
+        self.assertEqual([self.allow(2, '100/min')[0] for _ in range(4)], [True, True, False, False])
+        self.assertEqual(cache.get(f'throttle-test:{window}'), 100)
+
+    def test_refused_clients_wait_in_process(self):
+        for second in range(60):
+            self.allow(second / 4)
+        allowed, throttle = self.allow(20)
+        self.assertFalse(allowed)
+        # The next window, plus the time for the previous one's weight to fall under the limit.
+        self.assertEqual(throttle.wait(), 41)
+
+        cache.clear()
+        self.assertFalse(self.allow(60.5)[0])
+        self.assertTrue(self.allow(61)[0])
+
+    def test_unused_lease_is_given_back_in_the_next_window(self):
+        self.allow(0)
+        self.allow(1)
+        left = throttling._leases['throttle-test'].remaining
+        self.assertGreater(left, 0)
+        counted = cache.get(f'throttle-test:{self.START // 60}')
+
+        self.allow(60)
+        self.assertEqual(cache.get(f'throttle-test:{self.START // 60}'), counted - left)
+
+    def test_client_moving_between_processes_keeps_most_of_its_limit(self):
+        granted = 0
+        for second in range(60):
+            if second % 2 == 0:
+                # A new process, leaving the previous one's lease unused.
+                throttling._leases.clear()
+            granted += self.allow(second)[0]
+        self.assertGreaterEqual(granted, 54)
+
+
+class ThrottleScopeTests(TestCase):
+    """``throttle_scope`` limits plain Django views."""
+
+    def setUp(self):
+        cache.clear()
+        throttling._leases.clear()
+        self.addCleanup(throttling._leases.clear)
+        rates = mock.patch.dict(ScopedThrottle.THROTTLE_RATES, {'test': '2/min'})
+        rates.start()
+        self.addCleanup(rates.stop)
+
+    def test_over_the_limit_answers_429_with_retry_after(self):
+        view = throttle_scope('test')(lambda request: HttpResponse('ok'))
+        request = RequestFactory().get('/calendar.ics', REMOTE_ADDR='192.0.2.1')
+
+        self.assertEqual([view(request).status_code for _ in range(2)], [200, 200])
+        response = view(request)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+        request.META['REMOTE_ADDR'] = '192.0.2.2'
+        self.assertEqual(view(request).status_code, 200)
+
+    def test_clients_with_a_token_are_limited_per_user(self):
+        view = throttle_scope('test')(lambda request: HttpResponse('ok'))
+        tokens = [RefreshToken.for_user(CustomUser.objects.create(username=name, email=f'{name}@example.com')).access_token for name in ('one', 'two')]
+        requests = [RequestFactory().get('/calendar.ics', REMOTE_ADDR='192.0.2.1', HTTP_AUTHORIZATION=f'Bearer {token}') for token in tokens]
+        self.assertEqual([view(requests[0]).status_code for _ in range(3)], [200, 200, 429])
+        self.assertEqual(view(requests[1]).status_code, 200)
+
+    @override_settings(MIDDLEWARE=settings_api.MIDDLEWARE)
+    def test_calendars_on_the_api_workers(self):
+        # The API workers run without the authentication middleware, so requests have no user.
+        league = League.objects.create(name='League', country='NG', founded_year=1990)
+        team = Team.objects.create(team_name='Home', league=league)
+        rates = mock.patch.dict(ScopedThrottle.THROTTLE_RATES, {'export': '2/min'})
+        rates.start()
+        self.addCleanup(rates.stop)
+        for url in (f'/teams/{team.pk}/fixtures.ics', f'/leagues/{league.pk}/fixtures.ics'):
+            cache.clear()
+            throttling._leases.clear()
+            self.assertEqual([self.client.get(url).status_code for _ in range(3)], [200, 200, 429])
+
+
+class StandingsSnapshotTests(TestCase):
+    """A snapshot of the table is kept per matchday and rewritten from a corrected result on."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username='operator', email='operator@example.com')
+        league = League.objects.create(name='League', country='NG', founded_year=1990)
+        cls.teams = [Team.objects.create(team_name=f'Team {number}', league=league) for number in range(3)]
+        cls.season = Season.objects.create(league=league, year='2024/2025', start_date=date(2024, 8, 1), end_date=date(2025, 5, 30))
+        kick_off = datetime(2024, 9, 1, 15, tzinfo=timezone.utc)
+        cls.matches = [
+            Match.objects.create(
+                season=cls.season,
+                league=league,
+                home_team=cls.teams[home],
+                away_team=cls.teams[away],
+                match_date=kick_off + timedelta(weeks=week),
+                venue='Stadium',
+                status=Match.COMPLETED,
+                home_team_score=home_score,
+                away_team_score=away_score,
+            )
+            for week, (home, away, home_score, away_score) in enumerate([(0, 1, 2, 0), (1, 2, 1, 1), (2, 0, 0, 3)])
+        ]
+
+    def points(self, snapshot):
+        return {row['team_name']: row['points'] for row in snapshot.standings}
+
+    def test_snapshot_per_matchday(self):
+        rebuild_standings_snapshots(self.season.pk)
+        self.assertEqual(
+            [self.points(standings_as_of(self.season.pk, matchday_of(match.match_date))) for match in self.matches],
+            [
+                {'Team 0': 3, 'Team 1': 0},
+                {'Team 0': 3, 'Team 1': 1, 'Team 2': 1},
+                {'Team 0': 6, 'Team 1': 1, 'Team 2': 1},
+            ],
+        )
+        self.assertEqual(standings_as_of(self.season.pk).as_of, date(2024, 9, 15))
+        self.assertEqual(standings_as_of(self.season.pk, date(2024, 9, 10)).as_of, date(2024, 9, 8))
+
+    def test_as_of_before_the_first_matchday_is_empty(self):
+        rebuild_standings_snapshots(self.season.pk)
+        self.assertIsNone(standings_as_of(self.season.pk, date(2024, 8, 31)))
+
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        response = self.client.get(f'/seasons/{self.season.pk}/standings/?as_of=2024-08-31')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'season': str(self.season.pk), 'as_of': None, 'standings': []})
+
+    def test_corrected_result_rewrites_later_snapshots(self):
+        rebuild_standings_snapshots(self.season.pk)
+        first = standings_as_of(self.season.pk, date(2024, 9, 1))
+        corrected = self.matches[1]
+        corrected.home_team_score = 2
+        corrected.save()
+
+        update_standings_snapshots(self.season.pk, matchday_of(corrected.match_date))
+        self.assertEqual(standings_as_of(self.season.pk, date(2024, 9, 1)).pk, first.pk)
+        self.assertEqual(self.points(standings_as_of(self.season.pk, date(2024, 9, 8))), {'Team 0': 3, 'Team 1': 3, 'Team 2': 0})
+        self.assertEqual(self.points(standings_as_of(self.season.pk)), {'Team 0': 6, 'Team 1': 3, 'Team 2': 0})
+
+
+class TeamStatsDerivationTests(PlayerStatsTestCase):
+    """Both teams' TeamStats of a completed match are derived from the score and the PlayerStats."""
+
+    def setUp(self):
+        self.match = self.stats.match_type
+        self.match.status, self.match.home_team_score, self.match.away_team_score = Match.COMPLETED, 2, 1
+        self.match.save()
+
+    def stats_by_team(self):
+        return {stats.team_name.team_name: stats for stats in TeamStats.objects.filter(match=self.match).select_related('team_name')}
+
+    def test_both_teams_are_derived(self):
+        derive_team_stats(self.match)
+        home, away = self.stats_by_team()['Home'], self.stats_by_team()['Away']
+        self.assertEqual((home.match_outcome, home.match_goals, home.match_concided_goals), (TeamStats.WIN, 2, 1))
+        self.assertEqual((away.match_outcome, away.match_goals, away.match_concided_goals), (TeamStats.LOSS, 1, 2))
+        self.assertEqual((home.opposing_team_name, away.opposing_team_name), ('Away', 'Home'))
+        self.assertEqual((home.match_goal_scored_time, away.match_goal_concided_time), (['12'], ['12']))
+        self.assertEqual(list(home.players.values_list('pk', flat=True)), [self.stats.player_id])
+        self.assertFalse(away.players.exists())
+
+    def test_rederiving_updates_the_same_rows(self):
+        derive_team_stats(self.match)
+        before = {name: stats.pk for name, stats in self.stats_by_team().items()}
+        self.match.away_team_score = 2
+        self.match.save()
+
+        derive_team_stats(self.match)
+        after = self.stats_by_team()
+        self.assertEqual({name: stats.pk for name, stats in after.items()}, before)
+        self.assertEqual(after['Home'].match_outcome, TeamStats.DRAW)
+
+    def test_endpoint_derives_completed_matches_only(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        response = self.client.post(f'/matches/{self.match.pk}/team-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(row['match_outcome'] for row in response.json()), [TeamStats.LOSS, TeamStats.WIN])
+
+        Match.objects.filter(pk=self.match.pk).update(status='scheduled')
+        response = self.client.post(f'/matches/{self.match.pk}/team-stats/')
+        self.assertEqual(response.status_code, 400)
+
+    def hand_entered(self, possession):
+        return TeamStats.objects.create(
+            season=self.match.season,
+            team_name=self.match.home_team,
+            opposing_team_name='Away',
+            match_outcome=TeamStats.WIN,
+            match_possession=possession,
+        )
+
+    def link_team_stats(self):
+        import_module('football_app.migrations.0013_link_team_stats_to_matches').link_team_stats(apps, None)
+
+    def test_hand_entered_stats_are_linked_to_their_match(self):
+        stats = self.hand_entered(55.0)
+        self.link_team_stats()
+        stats.refresh_from_db()
+        self.assertEqual(stats.match_id, self.match.pk)
+
+        derive_team_stats(self.match)
+        self.assertEqual(TeamStats.objects.filter(team_name=self.match.home_team).count(), 1)
+        self.assertEqual(self.stats_by_team()['Home'].match_possession, 55.0)
+
+    def test_hand_entered_stats_superseded_by_derived_ones_are_removed(self):
+        derive_team_stats(self.match)
+        stats = self.hand_entered(55.0)
+        self.link_team_stats()
+        self.assertFalse(TeamStats.objects.filter(pk=stats.pk).exists())
+        self.assertEqual(self.stats_by_team()['Home'].match_possession, 55.0)
+
+
+class MinutesPlayedTests(PlayerStatsTestCase):
+    """Stoppage time of the substitution minutes counts towards the minutes played."""
+
+    def minutes(self, **fields):
+        PlayerStats.objects.filter(pk=self.stats.pk).update(**fields)
+        return PlayerStats.objects.with_efficiency().get(pk=self.stats.pk).minutes_played
+
+    def test_added_time_is_counted(self):
+        self.assertEqual(self.minutes(start_match=True, sub_out_at=90, sub_out_added_time=4), 94)
+        self.assertEqual(self.minutes(start_match=False, sub_in_at=45, sub_in_added_time=2, sub_out_at=None, sub_out_added_time=None), 43)
+        self.assertEqual(self.minutes(start_match=False, sub_in_at=None, sub_in_added_time=None), 0)
+
+    def test_migration_keeps_the_added_time(self):
+        migration = import_module('football_app.migrations.0004_typed_player_stats_and_team_spells')
+        self.assertEqual((migration.parse_minute_text("45+2'"), migration.parse_added_time_text("45+2'")), (45, 2))
+        self.assertEqual((migration.parse_minute_text('63'), migration.parse_added_time_text('63')), (63, None))
+        self.assertEqual((migration.format_minute(45, 2), migration.format_minute(63, None)), ('45+2', '63'))
+
+
+class EfficiencyMetricsTests(PlayerStatsTestCase):
+    """Success rates and per-90 rates are annotated in SQL, NULL when there is nothing to divide by."""
+
+    def efficiency(self, pk=None, **fields):
+        PlayerStats.objects.filter(pk=pk or self.stats.pk).update(**fields)
+        return PlayerStats.objects.with_efficiency().values(*EFFICIENCY_FIELDS).get(pk=pk or self.stats.pk)
+
+    def test_rates(self):
+        row = self.efficiency(start_match=True, sub_out_at=45, tackle_success=3, tackle_fail=1, goal_scored=1, shoot_success=2, shoot_fail=1)
+        self.assertEqual(row['minutes_played'], 45)
+        self.assertAlmostEqual(row['tackle_success_rate'], 0.75)
+        self.assertAlmostEqual(row['shot_success_rate'], 2 / 3)
+        self.assertAlmostEqual(row['goals_per_90'], 2.0)
+        self.assertAlmostEqual(row['shots_per_90'], 6.0)
+        self.assertEqual(row['assists_per_90'], 0.0)
+
+    def test_nothing_to_divide_by_is_null(self):
+        row = self.efficiency(start_match=False, sub_in_at=None, goal_scored=1, tackle_success=0, tackle_fail=0)
+        self.assertEqual(row['minutes_played'], 0)
+        self.assertIsNone(row['goals_per_90'])
+        self.assertIsNone(row['tackle_success_rate'])
+
+    def test_filter_and_order_on_the_rates(self):
+        other = PlayerStats.objects.create(
+            player=Player.objects.create(first_name='Bo', last_name='Obi', height=1.7, team=self.stats.current_team, league=self.stats.player.league, primary_position='MID'),
+            current_team=self.stats.current_team,
+            season_played=self.stats.season_played,
+            match_type=self.stats.match_type,
+            opposing_team='Away',
+        )
+        self.efficiency(start_match=True, tackle_success=1, tackle_fail=3)
+        self.efficiency(other.pk, start_match=True, tackle_success=4, tackle_fail=1)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+
+        response = self.client.get('/player-stats/', {'minutes_played__gte': 90, 'ordering': '-tackle_success_rate'})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertEqual([(row['stat_id'], row['tackle_success_rate']) for row in rows], [(str(other.pk), 0.8), (str(self.stats.pk), 0.25)])
+
+        response = self.client.get('/player-stats/', {'tackle_success_rate__gte': 0.5})
+        self.assertEqual([row['stat_id'] for row in response.json()], [str(other.pk)])
+
+
+class CareerSpellsTests(PlayerStatsTestCase):
+    """A player's team spells are rebuilt from the joining and leaving dates of their PlayerStats."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.player, cls.home, cls.away = cls.stats.player, cls.stats.current_team, cls.stats.match_type.away_team
+
+    def add_stats(self, day, team, **fields):
+        match = Match.objects.create(
+            season=self.stats.season_played,
+            league=self.stats.match_type.league,
+            home_team=self.home,
+            away_team=self.away,
+            match_date=datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc).replace(hour=15),
+            venue='Stadium',
+        )
+        return PlayerStats.objects.create(player=self.player, current_team=team, season_played=self.stats.season_played, match_type=match, opposing_team='Away', **fields)
+
+    def spells(self):
+        rebuild_player_spells([self.player.pk])
+        spells = PlayerTeamSpell.objects.filter(player=self.player).select_related('team')
+        return sorted(((spell.team.team_name, spell.joined_at, spell.left_at) for spell in spells), key=lambda spell: spell[1] or date.min)
+
+    def test_dated_spells_are_closed_by_the_next_one(self):
+        former = Team.objects.create(team_name='Former', league=self.home.league)
+        self.add_stats(date(2024, 9, 8), self.home, joined_team_at=date(2024, 7, 1), previous_team=former)
+        self.add_stats(date(2024, 12, 15), self.away, joined_team_at=date(2024, 12, 1))
+        self.add_stats(date(2025, 2, 1), self.home, joined_team_at=date(2025, 1, 10), left_team_at=date(2025, 3, 1))
+        self.assertEqual(self.spells(), [
+            ('Former', None, date(2024, 7, 1)),
+            ('Home', date(2024, 7, 1), date(2024, 12, 1)),
+            ('Away', date(2024, 12, 1), date(2025, 1, 10)),
+            ('Home', date(2025, 1, 10), date(2025, 3, 1)),
+        ])
+
+    def test_undated_rows_join_the_spell_under_way(self):
+        self.add_stats(date(2024, 9, 8), self.home, joined_team_at=date(2024, 7, 1), left_team_at=date(2024, 11, 1))
+        self.add_stats(date(2025, 2, 1), self.home, joined_team_at=date(2025, 1, 10))
+        self.add_stats(date(2025, 2, 15), self.home, left_team_at=date(2025, 4, 1))
+        # Before any dated spell: counted in the team's first one.
+        self.add_stats(date(2024, 6, 1), self.home, left_team_at=date(2024, 11, 20))
+        self.assertEqual(self.spells(), [
+            ('Home', date(2024, 7, 1), date(2024, 11, 20)),
+            ('Home', date(2025, 1, 10), date(2025, 4, 1)),
+        ])
+
+    def test_team_without_dated_rows_gets_one_spell_from_the_first_match(self):
+        self.add_stats(date(2024, 10, 1), self.home)
+        self.add_stats(date(2024, 8, 20), self.home)
+        self.assertEqual(self.spells(), [('Home', date(2024, 8, 20), None)])
+
+
+class SearchTests(TestCase):
+    """Names starting with the search text rank above fuzzy matches; typos still match."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username='operator', email='operator@example.com')
+        league = League.objects.create(name='Premier League', country='NG', founded_year=1990)
+        cls.omar = Team.objects.create(team_name='Omar United', league=league)
+        cls.mark = Player.objects.create(first_name='Mark', last_name='Noble', height=1.8, team=cls.omar, league=league, primary_position='MID')
+        cls.rashford = Player.objects.create(first_name='Marcus', last_name='Rashford', height=1.8, team=cls.omar, league=league, primary_position='FWD')
+
+    def setUp(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+
+    def results(self, **params):
+        response = self.client.get('/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['name']) for result in response.json()['results']]
+
+    def test_prefix_matches_rank_above_fuzzy_ones(self):
+        self.assertEqual(self.results(q='mar'), [('player', 'Mark Noble'), ('player', 'Marcus Rashford'), ('team', 'Omar United')])
+
+    def test_typos_match(self):
+        self.assertEqual(self.results(q='rashfrod'), [('player', 'Marcus Rashford')])
+        self.assertEqual(self.results(q='zzz'), [])
+
+    def test_type_filter(self):
+        self.assertEqual(self.results(q='mar', type='team'), [('team', 'Omar United')])
+        self.assertEqual(self.results(q='premier', type='player,league'), [('league', 'Premier League')])
+        self.assertEqual(self.client.get('/search/', {'q': 'mar', 'type': 'coach'}).status_code, 400)
+
+    def test_limit(self):
+        self.assertEqual(self.results(q='mar', limit=1), [('player', 'Mark Noble')])
+        self.assertEqual(self.client.get('/search/', {'q': 'mar', 'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/search/', {'q': 'm'}).status_code, 400)
+
+
+class FixtureTests(TestCase):
+    """The fixture list pages by cursor; the calendar feeds are escaped, folded and served with an ETag."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username='operator', email='operator@example.com')
+        cls.league = League.objects.create(name='League', country='NG', founded_year=1990)
+        cls.home = Team.objects.create(team_name='Smith, Jones; United', league=cls.league)
+        cls.away = Team.objects.create(team_name='Away', league=cls.league)
+        today = django_timezone.localdate()
+        cls.season = Season.objects.create(league=cls.league, year=str(today.year), start_date=today - timedelta(days=30), end_date=today + timedelta(days=300))
+        cls.matches = [
+            Match.objects.create(
+                season=cls.season,
+                league=cls.league,
+                home_team=cls.home,
+                away_team=cls.away,
+                match_date=django_timezone.now() + timedelta(days=7 * week + 1),
+                venue='Main Stand\nNorth Road',
+            )
+            for week in range(5)
+        ]
+
+    def test_cursor_pagination(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        response = self.client.get('/fixtures/', {'page_size': 2, 'team': str(self.home.pk)})
+        self.assertEqual(response.status_code, 200)
+        seen = [fixture['match_id'] for fixture in response.json()['results']]
+        self.assertEqual(len(seen), 2)
+        while response.json()['next']:
+            response = self.client.get(response.json()['next'])
+            seen += [fixture['match_id'] for fixture in response.json()['results']]
+        self.assertEqual(seen, [str(match.pk) for match in self.matches])
+
+        response = self.client.get('/fixtures/', {'to': str(django_timezone.localdate() + timedelta(days=9))})
+        self.assertEqual([fixture['match_id'] for fixture in response.json()['results']], [str(match.pk) for match in self.matches[:2]])
+        self.assertIsNone(response.json()['next'])
+        self.assertEqual(self.client.get('/fixtures/', {'from': '2024-13-01'}).status_code, 400)
+
+    def calendar(self, **headers):
+        return self.client.get(f'/teams/{self.home.pk}/fixtures.ics', headers=headers)
+
+    def test_calendar_etag(self):
+        response = self.calendar()
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.calendar(if_none_match=etag).status_code, 304)
+
+        self.home.team_name = 'Renamed'
+        self.home.save()
+        response = self.calendar(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.matches[0].delete()
+        self.assertNotEqual(self.calendar()['ETag'], etag)
+
+    def test_calendar_escapes_text(self):
+        content = b''.join(self.calendar().streaming_content).decode()
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n') and content.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(content.count('BEGIN:VEVENT'), 5)
+        self.assertIn('SUMMARY:Smith\\, Jones\\; United vs Away\r\n', content)
+        self.assertIn('LOCATION:Main Stand\\nNorth Road\r\n', content)
+        self.assertIn('X-WR-CALNAME:Smith\\, Jones\\; United fixtures\r\n', content)
+
+    def test_long_lines_are_folded_between_characters(self):
+        self.home.team_name = 'Ñandú Éire ' * 8
+        self.home.save()
+        content = b''.join(self.calendar().streaming_content).decode()
+        lines = content[:-2].split('\r\n')
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        self.assertTrue(any(line.startswith(' ') for line in lines))
+        self.assertIn(f'SUMMARY:{self.home.team_name} vs Away\r\n', content.replace('\r\n ', ''))
+
+
+class RoundRobinTests(TestCase):
+    """The generated double round-robin is complete and balanced across the whole season."""
+
+    def test_every_pair_meets_once_at_each_venue(self):
+        for count in range(2, 22):
+            teams = list(range(count))
+            rounds = round_robin(teams)
+            self.assertEqual(len(rounds), 2 * (count - 1 + count % 2))
+            self.assertEqual(sorted(pair for pairs in rounds for pair in pairs), [(home, away) for home in teams for away in teams if home != away])
+            for pairs in rounds:
+                playing = [team for pair in pairs for team in pair]
+                self.assertEqual(len(playing), len(set(playing)))
+
+    def test_no_team_plays_three_home_or_away_games_in_a_row(self):
+        for count in range(4, 22):
+            rounds = round_robin(range(count))
+            for team in range(count):
+                venues = ''.join('H' if home == team else 'A' for pairs in rounds for home, away in pairs if team in (home, away))
+                self.assertNotIn('HHH', venues, f'{count} teams')
+                self.assertNotIn('AAA', venues, f'{count} teams')
+            for pairs, following in zip(rounds, rounds[1:]):
+                self.assertFalse({frozenset(pair) for pair in pairs} & {frozenset(pair) for pair in following}, f'{count} teams')
+
+
+class BatchedDeletionTests(PlayerStatsTestCase):
+    """Leagues, seasons and teams are hidden at once and deleted with their dependents in raw batches."""
+
+    def setUp(self):
+        match = self.stats.match_type
+        match.status, match.home_team_score, match.away_team_score = Match.COMPLETED, 1, 0
+        match.save()
+        derive_team_stats(match)
+        self.league, self.home = match.league, match.home_team
+
+    def request_deletion(self, instance):
+        type(instance).objects.filter(pk=instance.pk).update(deletion_requested_at=django_timezone.now())
+
+    def test_endpoint_hides_the_row_and_schedules_the_deletion(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.delete(f'/teams/{self.home.pk}/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.client.get(f'/teams/{self.home.pk}/').status_code, 404)
+        self.assertTrue(Team._base_manager.filter(pk=self.home.pk).exists())
+
+    def test_league_and_its_dependents_are_deleted(self):
+        self.request_deletion(self.league)
+        delete_in_batches(League, self.league.pk, batch_size=1)
+        for model in (League, Season, Team, Match, Player, PlayerStats, TeamStats, TeamStats.players.through, TeamRating):
+            self.assertFalse(model._base_manager.exists(), model._meta.label)
+
+    def test_team_deletion_keeps_the_rest_of_the_league(self):
+        self.request_deletion(self.home)
+        delete_in_batches(Team, self.home.pk)
+        self.assertEqual(list(Team.objects.values_list('team_name', flat=True)), ['Away'])
+        self.assertFalse(Match.objects.exists() or PlayerStats.objects.exists())
+        self.assertTrue(Season.objects.exists())
+
+    def test_rows_are_deleted_without_signals(self):
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=PlayerStats)
+        self.addCleanup(post_delete.disconnect, receiver, sender=PlayerStats)
+        self.request_deletion(self.home)
+        delete_in_batches(Team, self.home.pk)
+        self.assertFalse(PlayerStats.objects.exists())
+        receiver.assert_not_called()
+
+    def test_deletion_must_be_requested(self):
+        with self.assertLogs('football_app.services.deletion_service', 'WARNING'):
+            delete_in_batches(League, self.league.pk)
+        self.assertTrue(League.objects.filter(pk=self.league.pk).exists())
+        self.assertTrue(PlayerStats.objects.exists())
+
+    def test_unsupported_on_delete_is_refused_before_deleting(self):
+        self.request_deletion(self.league)
+        with mock.patch.object(Match._meta.get_field('player_stats'), 'on_delete', models.PROTECT):
+            with self.assertRaises(ImproperlyConfigured):
+                delete_in_batches(League, self.league.pk)
+        self.assertTrue(Team._base_manager.exists() and PlayerStats.objects.exists())
+
+
+class PlayerComparisonTests(PlayerStatsTestCase):
+    """Rates are compared as z-scores among the season's players of the same position."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.stats.delete()
+        match = cls.stats.match_type
+        cls.players = {}
+        for name, position, goals, start in [('Mid0', 'MID', 0, True), ('Mid1', 'MID', 1, True), ('Mid2', 'MID', 2, True), ('Sub', 'MID', 3, False), ('Def', 'DEF', 9, True)]:
+            player = Player.objects.create(first_name=name, last_name='X', height=1.8, team=match.home_team, league=match.league, primary_position=position)
+            PlayerStats.objects.create(
+                player=player,
+                current_team=match.home_team,
+                season_played=match.season,
+                match_type=match,
+                opposing_team='Away',
+                start_match=start,
+                sub_in_at=None if start else 60,
+                goal_scored=goals,
+            )
+            cls.players[name] = player.pk
+        cls.idle = Player.objects.create(first_name='Idle', last_name='X', height=1.8, team=match.home_team, league=match.league, primary_position='MID').pk
+        cls.season = match.season
+
+    def compare(self, *names):
+        return {row['first_name']: row for row in compare_players([self.players.get(name, self.idle) for name in names], self.season.pk)}
+
+    def test_z_scores_within_the_position(self):
+        rows = self.compare('Mid0', 'Mid2', 'Sub', 'Def')
+        # Mid0..Mid2 score 0, 1 and 2 per 90: mean 1, standard deviation sqrt(2/3).
+        self.assertEqual(rows['Mid0']['z_scores']['goals_per_90'], -1.22)
+        self.assertEqual(rows['Mid2']['z_scores']['goals_per_90'], 1.22)
+        # The substitute's 30 minutes are compared but leave the distribution alone: 9 per 90.
+        self.assertEqual(rows['Sub']['rates']['goals_per_90'], 9.0)
+        self.assertEqual(rows['Sub']['z_scores']['goals_per_90'], round(8 / (2 / 3) ** 0.5, 2))
+        # The only defender has nothing to be compared with.
+        self.assertIsNone(rows['Def']['z_scores']['goals_per_90'])
+        # Nobody attempted a tackle.
+        self.assertIsNone(rows['Mid2']['z_scores']['tackle_success_rate'])
+
+    def test_players_without_stats_and_unknown_players(self):
+        rows = self.compare('Mid1', 'Idle')
+        self.assertEqual((rows['Idle']['matches'], rows['Idle']['minutes_played'], rows['Idle']['totals']['goal_scored']), (0, 0, 0))
+        self.assertIsNone(rows['Idle']['rates']['goals_per_90'])
+        self.assertIsNone(rows['Idle']['z_scores']['goals_per_90'])
+        with self.assertRaises(UnknownPlayers):
+            compare_players([self.players['Mid1'], self.stats.season_played_id], self.season.pk)
+
+    def test_endpoint(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        ids = [self.players['Mid2'], self.players['Mid0']]
+        response = self.client.get('/players/compare/', {'ids': ','.join(map(str, ids)), 'season': str(self.season.pk)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['first_name'] for row in response.json()['players']], ['Mid2', 'Mid0'])
+        response = self.client.get('/players/compare/', {'ids': str(self.season.pk), 'season': str(self.season.pk)})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,185 @@
+import threading
+from functools import wraps
+from math import ceil
+
+from django.core.cache.backends.redis import RedisCache
+from django.http import JsonResponse
+from rest_framework import throttling
+
+from .authentication import get_request_user_id
+
+# Clients under this share of their limit lease several requests at once, so
+# most of their requests are admitted in-process without a trip to the cache.
+LEASE_BELOW = 0.5
+# Share of the headroom left under LEASE_BELOW leased at a time. A lease is
+# counted up front, so one held by a process the client no longer reaches
+# costs the client at most LEASE_BELOW * LEASE_FRACTION of its limit.
+LEASE_FRACTION = 0.1
+# Leases kept per process before those of past windows are dropped.
+MAX_LEASES = 10000
+
+_leases = {}
+_leases_lock = threading.Lock()
+
+
+class _Lease:
+    __slots__ = ('window', 'remaining', 'estimate', 'blocked_until')
+
+    def __init__(self, window, remaining, estimate, blocked_until=0.0):
+        self.window = window
+        self.remaining = remaining
+        self.estimate = estimate
+        self.blocked_until = blocked_until
+
+
+def _add_to_window(cache, key, previous_key, amount, timeout, returned=0):
+    """Add ``amount`` to a window's counter; returns ``(current, previous)`` window counts.
+
+    ``returned`` requests, leased but not used, are first taken off the
+    previous window's counter. On Redis this is one pipelined round trip
+    (Django's ``incr`` costs two and cannot set an expiry). Integers are
+    stored unpickled by Django's Redis serializer, so the counters stay
+    readable through the cache API.
+    """
+    if isinstance(cache, RedisCache):
+        key, previous_key = cache.make_and_validate_key(key), cache.make_and_validate_key(previous_key)
+        pipeline = cache._cache.get_client(key, write=True).pipeline()
+        pipeline.incrby(key, amount)
+        pipeline.expire(key, timeout)
+        if returned:
+            pipeline.decrby(previous_key, returned)
+        pipeline.get(previous_key)
+        current, _, *_, previous = pipeline.execute()
+        return int(current), max(int(previous or 0), 0)
+    # Other backends, e.g. the local memory cache in development.
+    cache.add(key, 0, timeout)
+    if returned:
+        try:
+            cache.decr(previous_key, returned)
+        except ValueError:
+            pass
+    return cache.incr(key, amount), max(cache.get(previous_key, 0), 0)
+
+
+class SlidingWindowThrottle(throttling.SimpleRateThrottle):
+    """Sliding-window rate limit counted in the cache (Redis in production), shared by all processes.
+
+    Requests are counted per fixed window; the previous window's count is
+    weighted by how much of it still overlaps the sliding window. Clients
+    well under their limit lease a batch of requests from the shared
+    counter and spend it in-process; leased requests are counted up front,
+    so the limit holds across processes and leases only make a client
+    reach it slightly early. What is left of a lease when its window ends
+    is given back. Refused clients are refused in-process too, until their
+    wait is over.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        window = int(window)
+        with _leases_lock:
+            lease = _leases.get(self.key)
+            if lease is not None and lease.blocked_until > self.now:
+                self._wait = lease.blocked_until - self.now
+                return self.throttle_failure()
+            if lease is not None and lease.window == window and lease.remaining > 0:
+                lease.remaining -= 1
+                return True
+            unused = 0
+            if lease is not None and lease.window == window - 1:
+                unused, lease.remaining = lease.remaining, 0
+        estimate = lease.estimate if lease is not None and lease.window == window else None
+        return self._reserve(window, elapsed, estimate, unused)
+
+    def _lease_size(self, estimate):
+        if estimate is None:
+            return 1
+        return max(1, int((self.num_requests * LEASE_BELOW - estimate) * LEASE_FRACTION))
+
+    def _reserve(self, window, elapsed, estimate, unused=0):
+        size = self._lease_size(estimate)
+        key, previous_key = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+        current, previous = _add_to_window(self.cache, key, previous_key, size, self.duration * 2, returned=unused)
+        overlap = previous * (1 - elapsed / self.duration)
+        granted = min(size, int(self.num_requests - (overlap + current - size)))
+        if granted < size:
+            # Give back what cannot be used, so refused requests do not count.
+            current, _ = _add_to_window(self.cache, key, previous_key, max(granted, 0) - size, self.duration * 2)
+        if granted <= 0:
+            self._wait = self._wait_for(previous, current, elapsed)
+            self._keep_lease(_Lease(window, 0, overlap + current, self.now + self._wait))
+            return self.throttle_failure()
+        self._keep_lease(_Lease(window, granted - 1, overlap + current))
+        return True
+
+    def _keep_lease(self, lease):
+        with _leases_lock:
+            if len(_leases) >= MAX_LEASES:
+                for stale in [key for key, held in _leases.items() if held.window < lease.window and held.blocked_until <= self.now]:
+                    del _leases[stale]
+            _leases[self.key] = lease
+
+    def _wait_for(self, previous, current, elapsed):
+        """Seconds until the sliding window has room for one more request."""
+        room = self.num_requests - 1
+        if current <= room:
+            return max(0.0, self.duration * (1 - (room - current) / previous) - elapsed) if previous else 0.0
+        return self.duration - elapsed + max(0.0, self.duration * (1 - room / current))
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class AnonThrottle(throttling.AnonRateThrottle, SlidingWindowThrottle):
+    """``anon`` rate, per IP address of anonymous clients."""
+
+
+class UserThrottle(throttling.UserRateThrottle, SlidingWindowThrottle):
+    """``user`` rate, per authenticated user; anonymous clients fall under ``AnonThrottle``."""
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return super().get_cache_key(request, view)
+
+
+class ScopedThrottle(throttling.ScopedRateThrottle, SlidingWindowThrottle):
+    """Rate of the view's ``throttle_scope``, per user or, for anonymous clients, per IP address."""
+
+
+class _ViewThrottle(ScopedThrottle):
+    """``ScopedThrottle`` for plain Django views, which may run without ``request.user``.
+
+    The API workers leave out the authentication middleware, so the client is
+    identified from its JWT or session the way ``ReplicaRoutingMiddleware``
+    does, without loading the user.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': get_request_user_id(request) or self.get_ident(request)}
+
+
+def throttle_scope(scope):
+    """Apply the ``scope`` rate to a plain Django view, answering 429 once a client exceeds it."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            throttle = _ViewThrottle()
+            if not throttle.allow_request(request, wrapper):
+                response = JsonResponse({'detail': 'Request was throttled.'}, status=429)
+                if throttle.wait() is not None:
+                    response['Retry-After'] = str(ceil(throttle.wait()))
+                return response
+            return view_func(request, *args, **kwargs)
+
+        wrapper.throttle_scope = scope
+        return wrapper
+
+    return decorator
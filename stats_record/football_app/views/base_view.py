@@ -1,7 +1,24 @@
 # base_views.py
 
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.views import exception_handler as drf_exception_handler
 from django.utils import timezone
+from django.utils.http import parse_etags
+from ..models.base_model import ConcurrentUpdateError
+from ..services.deletion_service import request_deletion
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource was changed since you last fetched it; fetch it again and retry.'
+    default_code = 'precondition_failed'
+
+def exception_handler(exc, context):
+    """DRF's exception handler, answering 412 to a ``ConcurrentUpdateError`` from any save."""
+    if isinstance(exc, ConcurrentUpdateError):
+        exc = PreconditionFailed()
+    return drf_exception_handler(exc, context)
 
 class ReadOnly(permissions.BasePermission):
     """
@@ -17,7 +34,42 @@ class BaseListCreateView(generics.ListCreateAPIView):
         serializer.save(created_by=self.request.user, updated_by=self.request.user, updated_at=timezone.now())
 
 class BaseRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+    """Responses carry the row's ``version`` as ETag; updates honour ``If-Match`` and answer 412 on conflict."""
     permission_classes = [permissions.IsAuthenticated | ReadOnly]
 
     def perform_update(self, serializer):
+        self.check_if_match(serializer.instance)
         serializer.save(updated_by=self.request.user, updated_at=timezone.now())
+
+    def check_if_match(self, instance):
+        if_match = self.request.headers.get('If-Match')
+        if if_match is None:
+            return
+        etags = [etag.removeprefix('W/') for etag in parse_etags(if_match)]
+        if '*' not in etags and version_etag(instance.version) not in etags:
+            raise PreconditionFailed()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        version = response.data.get('version') if isinstance(getattr(response, 'data', None), dict) else None
+        if version is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = version_etag(version)
+        return response
+
+def version_etag(version):
+    return f'"{version}"'
+
+class DeferredDeleteMixin:
+    """For models deleted in the background (League, Season, Team).
+
+    Rows pending deletion are hidden, and DELETE marks the row and answers
+    202 while a background job removes it and its dependents in batches.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().live()
+
+    def destroy(self, request, *args, **kwargs):
+        request_deletion(self.get_object())
+        return Response({"detail": "Deletion scheduled."}, status=status.HTTP_202_ACCEPTED)
+
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from uuid import UUID
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from .permissions import IsSuperAdminOrDenyDelete
+from ..models import League, Team
+from ..pagination import FixturePagination
+from ..serializers.fixture_serializer import FixtureSerializer
+from ..services.fixture_service import fixtures, fixtures_etag, ical_lines
+from ..throttling import throttle_scope
+
+CALENDAR_HISTORY = timedelta(days=365)
+CALENDAR_MAX_AGE = 15 * 60
+
+
+def _date_param(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Use the YYYY-MM-DD format.'})
+    return parsed
+
+
+class FixtureListView(generics.ListAPIView):
+    """Matches in kick-off order, filtered by ``?from=``/``?to=`` (YYYY-MM-DD, inclusive), ``?team=`` and ``?league=``.
+
+    ``from`` defaults to today, so the default is the upcoming fixtures. Paginated by cursor
+    (``?page_size=``, up to 500); follow ``next`` for the following page.
+    """
+    serializer_class = FixtureSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+    pagination_class = FixturePagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        date_from = _date_param(params, 'from') or timezone.localdate()
+        date_to = _date_param(params, 'to')
+        if date_to is not None and date_to < date_from:
+            raise ValidationError({'to': 'Must not be before from.'})
+        filters = {}
+        for name in ('team', 'league'):
+            if params.get(name):
+                try:
+                    filters[f'{name}_id'] = UUID(params[name])
+                except ValueError:
+                    raise ValidationError({name: 'Must be a valid UUID.'})
+        return fixtures(date_from, date_to, **filters).select_related('home_team', 'away_team')
+
+
+def _calendar_response(request, calendar_name, matches):
+    """Stream ``matches`` as iCalendar, or answer 304 when the client's ETag is still current."""
+    etag = fixtures_etag(matches)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = StreamingHttpResponse(ical_lines(matches, calendar_name), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="fixtures.ics"'
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=CALENDAR_MAX_AGE)
+    return response
+
+
+@require_GET
+@throttle_scope('export')
+def team_fixtures_calendar(request, pk):
+    """Public iCalendar feed of a team's fixtures, from a year ago onwards."""
+    team = get_object_or_404(Team.objects.live().only('team_name'), pk=pk)
+    matches = fixtures(timezone.localdate() - CALENDAR_HISTORY, team_id=team.pk)
+    return _calendar_response(request, f'{team.team_name} fixtures', matches)
+
+
+@require_GET
+@throttle_scope('export')
+def league_fixtures_calendar(request, pk):
+    """Public iCalendar feed of a league's fixtures, from a year ago onwards."""
+    league = get_object_or_404(League.objects.live().only('name'), pk=pk)
+    matches = fixtures(timezone.localdate() - CALENDAR_HISTORY, league_id=league.pk)
+    return _calendar_response(request, f'{league.name} fixtures', matches)
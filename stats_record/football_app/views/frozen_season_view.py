@@ -0,0 +1,77 @@
+import gzip
+import re
+
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_GET
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from .permissions import IsSuperAdminOrReadOnly
+from ..models.season_model import Season
+from ..serializers.frozen_season_serializer import FrozenSeasonSerializer, SeasonFreezeSerializer
+from ..services.freeze_service import ARTEFACT_MAX_AGE, ARTEFACTS, SeasonNotEnded, artefact_name, freeze_season
+
+ARTEFACT_FILENAME = re.compile(rf'^({"|".join(ARTEFACTS)})\.([0-9a-f]{{16}})\.json$')
+
+
+class SeasonFreezeView(generics.GenericAPIView):
+    """The static artefacts of an ended season; POST (superadmins) renders them.
+
+    Their URLs change whenever their content does, so clients read this
+    manifest and may cache the artefacts forever.
+    """
+    queryset = Season.objects.live()
+    serializer_class = SeasonFreezeSerializer
+    permission_classes = [IsSuperAdminOrReadOnly]
+
+    def get(self, request, *args, **kwargs):
+        season = self.get_object()
+        if season.frozen_at is None:
+            raise NotFound('The season is not frozen.')
+        return Response(self._manifest(season))
+
+    def post(self, request, *args, **kwargs):
+        season = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            freeze_season(season, force=serializer.validated_data['force'])
+        except SeasonNotEnded as error:
+            raise ValidationError({'season': str(error)})
+        return Response(self._manifest(season))
+
+    def _manifest(self, season):
+        artefacts = {
+            kind: {'url': self.request.build_absolute_uri(artefact['url']), 'size': artefact['size']}
+            for kind, artefact in season.frozen_manifest['artefacts'].items()
+        }
+        return FrozenSeasonSerializer({'season': season.pk, 'frozen_at': season.frozen_at, 'artefacts': artefacts}).data
+
+
+@require_GET
+def frozen_season_artefact(request, pk, filename):
+    """Public, immutable gzipped JSON artefact of a frozen season; the name carries a hash of the content."""
+    match = ARTEFACT_FILENAME.match(filename)
+    if match is None:
+        raise Http404()
+    kind, digest = match.groups()
+    etag = f'"{digest}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        name = artefact_name(pk, kind, digest)
+        if not default_storage.exists(name):
+            raise Http404()
+        with default_storage.open(name) as artefact:
+            content = artefact.read()
+        response = HttpResponse(content_type='application/json')
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response['Content-Encoding'] = 'gzip'
+        else:
+            content = gzip.decompress(content)
+        response.content = content
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=ARTEFACT_MAX_AGE, immutable=True)
+    return response
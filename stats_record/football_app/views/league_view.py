@@ -1,16 +1,16 @@
 from .permissions import IsSuperAdminOrReadOnly
 from ..models.league_model import League
 from ..serializers.league_serializer import LeagueSerializer
-from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
+from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView, DeferredDeleteMixin
 
 
-class LeagueListCreateView(BaseListCreateView):
+class LeagueListCreateView(DeferredDeleteMixin, BaseListCreateView):
     queryset = League.objects.all()
     serializer_class = LeagueSerializer
     permission_classes = [IsSuperAdminOrReadOnly]
 
 
-class LeagueDetailView(BaseRetrieveUpdateDestroyView):
+class LeagueDetailView(DeferredDeleteMixin, BaseRetrieveUpdateDestroyView):
     queryset = League.objects.all()
     serializer_class = LeagueSerializer
     permission_classes = [IsSuperAdminOrReadOnly]
@@ -1,6 +1,14 @@
+from django.db import transaction
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .permissions import IsSuperAdminOrDenyDelete
+from ..models import TeamStats
 from ..models.match_model import Match
 from ..serializers.match_serializer import MatchSerializer
+from ..serializers import TeamStatsSerializer
+from ..services.match_service import match_saved, match_state
+from ..services.team_stats_service import derive_team_stats
 from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
 
 class MatchListCreateView(BaseListCreateView):
@@ -8,8 +16,42 @@ class MatchListCreateView(BaseListCreateView):
     serializer_class = MatchSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            match_saved(serializer.instance, user=self.request.user)
+
 class MatchDetailView(BaseRetrieveUpdateDestroyView):
     queryset = Match.objects.all()
     serializer_class = MatchSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
-    
\ No newline at end of file
+
+    def perform_update(self, serializer):
+        previous = match_state(serializer.instance)
+        with transaction.atomic():
+            super().perform_update(serializer)
+            match_saved(serializer.instance, previous, user=self.request.user)
+
+    def perform_destroy(self, instance):
+        previous = match_state(instance)
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            match_saved(instance, previous, user=self.request.user)
+
+class MatchTeamStatsView(generics.GenericAPIView):
+    """Both teams' TeamStats of a match; POST re-derives them from the match and its PlayerStats."""
+    queryset = Match.objects.select_related('home_team', 'away_team')
+    serializer_class = TeamStatsSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        match = self.get_object()
+        team_stats = TeamStats.objects.filter(match=match).select_related('team_name').prefetch_related('players')
+        return Response(self.get_serializer(team_stats, many=True).data)
+
+    def post(self, request, *args, **kwargs):
+        match = self.get_object()
+        if match.status != Match.COMPLETED:
+            raise ValidationError({'status': 'Team stats can only be derived from a completed match.'})
+        derive_team_stats(match, user=request.user)
+        return self.get(request, *args, **kwargs)
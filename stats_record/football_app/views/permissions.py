@@ -26,3 +26,12 @@ class IsSuperAdminOrDenyDelete(permissions.BasePermission):
             # Only allow delete if the user is superadmin
             return request.user.is_authenticated and request.user.is_superuser
         return request.user.is_authenticated  # Allow others to create, update, and view
+
+
+class IsSuperAdmin(permissions.BasePermission):
+    """
+    Custom permission to only allow superadmins, whatever the method.
+    Used for diagnostics such as on-demand request profiling.
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.is_superuser
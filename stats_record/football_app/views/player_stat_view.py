@@ -1,14 +1,107 @@
+from django.db import transaction
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics
+from rest_framework.filters import OrderingFilter
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
 from .permissions import IsSuperAdminOrDenyDelete
+from ..filters import PlayerStatsFilter
 from ..models import PlayerStats
+from ..models.model_player_stat import EFFICIENCY_FIELDS
 from ..serializers import PlayerStatsSerializer
+from ..serializers.player_stat_serializer import PlayerStatsIncrementSerializer, StatIncrementsSerializer
+from ..services.career_service import rebuild_player_spells
+from ..services.match_service import player_stats_saved
+from ..services.player_stats_service import UnknownPlayerStats, increment_player_stats
 from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
 
 class PlayerStatsListCreateView(BaseListCreateView):
-    queryset = PlayerStats.objects.all()
+    """Rows come annotated with minutes played, success rates and per-90 rates, computed in SQL.
+
+    Filter with ``?season_played=<id>&minutes_played__gte=60&tackle_success_rate__gte=0.7``
+    and rank with ``?ordering=-tackle_success_rate``.
+    """
+    queryset = PlayerStats.objects.with_efficiency()
     serializer_class = PlayerStatsSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = PlayerStatsFilter
+    ordering_fields = [*EFFICIENCY_FIELDS, 'created_at', 'updated_at']
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            player_stats_saved([serializer.instance.match_type_id], user=self.request.user)
+        rebuild_player_spells([serializer.instance.player_id])
 
 class PlayerStatsDetailView(BaseRetrieveUpdateDestroyView):
-    queryset = PlayerStats.objects.all()
+    queryset = PlayerStats.objects.with_efficiency()
     serializer_class = PlayerStatsSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def perform_update(self, serializer):
+        previous_match_id = serializer.instance.match_type_id
+        previous_player_id = serializer.instance.player_id
+        with transaction.atomic():
+            super().perform_update(serializer)
+            player_stats_saved({previous_match_id, serializer.instance.match_type_id}, user=self.request.user)
+        # The counters changed, so the efficiency annotations loaded with the row are stale.
+        efficiency = self.get_queryset().filter(pk=serializer.instance.pk).values(*EFFICIENCY_FIELDS).get()
+        for name, value in efficiency.items():
+            setattr(serializer.instance, name, value)
+        rebuild_player_spells({previous_player_id, serializer.instance.player_id})
+
+    def perform_destroy(self, instance):
+        match_id, player_id = instance.match_type_id, instance.player_id
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            player_stats_saved([match_id], user=self.request.user)
+        rebuild_player_spells([player_id])
+
+MAX_INCREMENT_BATCH = 500
+
+def _match_ids(stat_ids):
+    return set(PlayerStats.objects.filter(pk__in=stat_ids).values_list('match_type_id', flat=True))
+
+
+class PlayerStatsIncrementView(generics.GenericAPIView):
+    """Atomically add to counters of one PlayerStats row: ``{"tackle_success": 1, "duel_fail": 1}``.
+
+    Only the given columns are written, from their current database value, so
+    operators entering the same match concurrently never overwrite each other.
+    """
+    queryset = PlayerStats.objects.all()
+    serializer_class = StatIncrementsSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            counters = increment_player_stats([(kwargs['pk'], serializer.validated_data)], user=request.user)
+        except UnknownPlayerStats:
+            raise NotFound()
+        player_stats_saved(_match_ids(counters), user=request.user)
+        return Response(counters[kwargs['pk']])
+
+class PlayerStatsBatchIncrementView(generics.GenericAPIView):
+    """Atomically add to counters of several PlayerStats rows in one ``UPDATE``.
+
+    Takes ``[{"stat_id": ..., "increments": {"tackle_success": 1}}, ...]``.
+    """
+    serializer_class = PlayerStatsIncrementSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False, max_length=MAX_INCREMENT_BATCH)
+        serializer.is_valid(raise_exception=True)
+        try:
+            counters = increment_player_stats(
+                [(item['stat_id'], item['increments']) for item in serializer.validated_data],
+                user=request.user,
+            )
+        except UnknownPlayerStats as error:
+            raise ValidationError({'stat_id': [f'Unknown player stats: {stat_id}' for stat_id in error.stat_ids]})
+        player_stats_saved(_match_ids(counters), user=request.user)
+        return Response(list(counters.values()))
+
@@ -1,9 +1,22 @@
-from requests import Response
+from uuid import UUID
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.db.models import F
 from .permissions import IsSuperAdminOrDenyDelete
 from ..models.player_model import Player
+from ..models.player_team_spell_model import PlayerTeamSpell
+from ..models.season_model import Season
+from ..models.model_player_stat import PlayerStats
+from ..serializers.comparison_serializer import PlayerComparisonSerializer, SimilarPlayerSerializer
 from ..serializers.player_serializer import PlayerSerializer
+from ..serializers.player_team_spell_serializer import PlayerTeamSpellSerializer
 from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.generics import get_object_or_404
+from ..services.comparison_service import MAX_COMPARED_PLAYERS, UnknownPlayers, compare_players
+from ..services.similarity_service import SIMILARITY_METRICS, similar_players
+
+MAX_SIMILAR_PLAYERS = 50
 
 
 class PlayerListCreateView(BaseListCreateView):
@@ -37,3 +50,105 @@ class PlayerDetailView(BaseRetrieveUpdateDestroyView):
         self.perform_update(serializer)
 
         return Response(serializer.data)
+
+
+class PlayerCareerView(generics.ListAPIView):
+    """Teams a player has played for, in joining order."""
+    serializer_class = PlayerTeamSpellSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return PlayerTeamSpell.objects.none()
+        player = get_object_or_404(Player.objects.only('pk'), pk=self.kwargs['pk'])
+        return (
+            PlayerTeamSpell.objects.filter(player=player)
+            .select_related('team')
+            .only('team__team_name', 'joined_at', 'left_at')
+            .order_by(F('joined_at').asc(nulls_first=True))
+        )
+
+
+def _uuid_param(value, name):
+    try:
+        return UUID(value.strip())
+    except ValueError:
+        raise ValidationError({name: f'"{value}" is not a valid id.'})
+
+
+class PlayerCompareView(generics.GenericAPIView):
+    """Compare players' season totals, per-90 and success rates side by side.
+
+    ``?ids=<id>,<id>,...&season=<id>``. Rates also come as z-scores against
+    the season's players of the same position, so a defender's tackles are
+    judged among defenders.
+    """
+    serializer_class = PlayerComparisonSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        ids = [value for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        if not ids:
+            raise ValidationError({'ids': 'Give the ids of the players to compare.'})
+        player_ids = list(dict.fromkeys(_uuid_param(value, 'ids') for value in ids))
+        if len(player_ids) > MAX_COMPARED_PLAYERS:
+            raise ValidationError({'ids': f'Compare at most {MAX_COMPARED_PLAYERS} players.'})
+        if 'season' not in request.query_params:
+            raise ValidationError({'season': 'Give the season to compare.'})
+        season = get_object_or_404(Season.objects.only('pk'), pk=_uuid_param(request.query_params['season'], 'season'))
+
+        try:
+            comparison = compare_players(player_ids, season.pk)
+        except UnknownPlayers as error:
+            raise ValidationError({'ids': [f'Unknown player: {player_id}' for player_id in error.player_ids]})
+        return Response({'season': season.pk, 'players': self.get_serializer(comparison, many=True).data})
+
+
+class SimilarPlayersView(generics.GenericAPIView):
+    """Players of the same position with the most similar season rates.
+
+    ``?k=`` neighbours (10 by default), ``?metric=cosine|euclidean`` and
+    ``?season=<id>``, by default the player's latest season with stats.
+    """
+    queryset = Player.objects.all()
+    serializer_class = SimilarPlayerSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        player = get_object_or_404(Player.objects.only('pk'), pk=kwargs['pk'])
+        try:
+            k = int(request.query_params.get('k', 10))
+        except ValueError:
+            raise ValidationError({'k': 'Enter a whole number.'})
+        if not 1 <= k <= MAX_SIMILAR_PLAYERS:
+            raise ValidationError({'k': f'Enter a number between 1 and {MAX_SIMILAR_PLAYERS}.'})
+        metric = request.query_params.get('metric', 'cosine')
+        if metric not in SIMILARITY_METRICS:
+            raise ValidationError({'metric': f'Use {" or ".join(SIMILARITY_METRICS)}.'})
+
+        if 'season' in request.query_params:
+            season_id = get_object_or_404(Season.objects.only('pk'), pk=_uuid_param(request.query_params['season'], 'season')).pk
+        else:
+            season_id = (
+                PlayerStats.objects.filter(player=player)
+                .order_by('-season_played__start_date')
+                .values_list('season_played_id', flat=True)
+                .first()
+            )
+        neighbours = similar_players(player.pk, season_id, k, metric) if season_id else None
+        if neighbours is None:
+            raise ValidationError({'season': 'The player has no stats in this season.'})
+
+        players = Player.objects.only('first_name', 'last_name', 'primary_position').in_bulk([pk for pk, _ in neighbours])
+        results = [
+            {
+                'player_id': pk,
+                'first_name': players[pk].first_name,
+                'last_name': players[pk].last_name,
+                'primary_position': players[pk].primary_position,
+                'score': score,
+            }
+            for pk, score in neighbours
+            if pk in players
+        ]
+        return Response({'season': season_id, 'metric': metric, 'results': self.get_serializer(results, many=True).data})
@@ -0,0 +1,40 @@
+from rest_framework import generics
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from .permissions import IsSuperAdminOrDenyDelete
+from ..models import League, Team, TeamRating
+from ..serializers.team_rating_serializer import LeagueRatingSerializer, TeamRatingSerializer
+from ..services.rating_service import INITIAL_RATING, latest_ratings, league_teams
+
+
+class TeamRatingHistoryView(generics.ListAPIView):
+    """A team's Elo rating before and after each of its completed matches, oldest first."""
+    serializer_class = TeamRatingSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return TeamRating.objects.none()
+        team = get_object_or_404(Team.objects.live().only('pk'), pk=self.kwargs['pk'])
+        return (
+            TeamRating.objects.filter(team=team)
+            .select_related('match__home_team', 'match__away_team')
+            .order_by('match_date', 'match_id')
+        )
+
+
+class LeagueRatingsView(generics.GenericAPIView):
+    """Current Elo ratings of a league's teams, strongest first; unrated teams start at the initial rating."""
+    queryset = League.objects.live()
+    serializer_class = LeagueRatingSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        league = self.get_object()
+        teams = latest_ratings(league_teams(league).live()).order_by('team_name')
+        ratings = [
+            {'team_id': team_id, 'team_name': team_name, 'rating': round(rating or INITIAL_RATING, 1), 'rated_at': rated_at}
+            for team_id, team_name, rating, rated_at in teams.values_list('pk', 'team_name', 'rating', 'rated_at')
+        ]
+        ratings.sort(key=lambda row: -row['rating'])
+        return Response(self.get_serializer(ratings, many=True).data)
@@ -0,0 +1,94 @@
+from hashlib import sha256
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+API_INFO = openapi.Info(
+    title="Football Stats",
+    default_version='v1',
+    description="API documentation",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@yourapi.local"),
+    license=openapi.License(name="BSD License"),
+)
+
+SCHEMA_FORMATS = {
+    'json': OpenAPICodecJson,
+    'yaml': OpenAPICodecYaml,
+}
+
+# CODE_VERSION when neither the environment nor git tells the deployed version
+UNVERSIONED = 'dev'
+
+_rendered_schemas = {}
+
+
+def schema_artefact_path(schema_format):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / settings.CODE_VERSION / f'swagger.{schema_format}'
+
+
+def generate_schema(schema_format):
+    """Walk every view and serializer and encode the resulting OpenAPI document."""
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+    return SCHEMA_FORMATS[schema_format]([]).encode(schema)
+
+
+def get_rendered_schema(schema_format):
+    """Return the encoded schema for the running code version.
+
+    Uses the artefact written by ``manage.py generate_openapi_schema`` at
+    deploy time when present, otherwise generates the schema once per process.
+    Without a known version an artefact could be left over from another
+    deploy, so it is not used.
+    """
+    key = (settings.CODE_VERSION, schema_format)
+    if key not in _rendered_schemas:
+        artefact = schema_artefact_path(schema_format)
+        if settings.CODE_VERSION != UNVERSIONED and artefact.exists():
+            _rendered_schemas[key] = artefact.read_bytes()
+        else:
+            _rendered_schemas[key] = generate_schema(schema_format)
+    return _rendered_schemas[key]
+
+
+BaseSchemaView = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+
+class CachedSchemaView(BaseSchemaView):
+    """Serves the precomputed schema with an ETag of its content, cached for ``OPENAPI_SCHEMA_MAX_AGE``.
+
+    Without a known ``CODE_VERSION`` clients revalidate on every use instead.
+
+    The Swagger/ReDoc pages themselves are left to drf_yasg: they do not walk
+    the endpoints and fetch the document from the spec URL served here.
+    """
+
+    def get(self, request, version='', format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)):
+            return super().get(request, version, format)
+
+        schema_format = 'yaml' if isinstance(renderer, SwaggerYAMLRenderer) else 'json'
+        schema = get_rendered_schema(schema_format)
+        etag = f'"{sha256(schema).hexdigest()[:16]}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(schema, content_type=renderer.media_type)
+        response['ETag'] = etag
+        if settings.CODE_VERSION == UNVERSIONED:
+            response['Cache-Control'] = 'public, no-cache'
+        else:
+            response['Cache-Control'] = f'public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}'
+        return response
@@ -0,0 +1,39 @@
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .permissions import IsSuperAdminOrDenyDelete
+from ..serializers.search_serializer import SearchResultSerializer
+from ..services.search_service import SEARCH_TYPES, search
+
+MIN_QUERY_LENGTH = 2
+MAX_LIMIT = 50
+
+
+class SearchView(generics.GenericAPIView):
+    """Typo-tolerant, prefix-aware search over player, team and league names.
+
+    ``?q=`` is the search text, ``?type=player,team`` restricts the result
+    types and ``?limit=`` caps the number of results (10 by default).
+    """
+    serializer_class = SearchResultSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            raise ValidationError({'q': f'Enter at least {MIN_QUERY_LENGTH} characters.'})
+
+        types = request.query_params.get('type')
+        types = types.split(',') if types else SEARCH_TYPES
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            raise ValidationError({'type': f'Unknown types: {", ".join(sorted(unknown))}. Use {", ".join(SEARCH_TYPES)}.'})
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': 'Enter a whole number.'})
+        if limit < 1:
+            raise ValidationError({'limit': 'Enter a positive number.'})
+
+        return Response({'query': query, 'results': self.get_serializer(search(query, types, limit), many=True).data})
@@ -1,16 +1,113 @@
-from .permissions import IsSuperAdminOrDenyDelete
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from .permissions import IsSuperAdmin, IsSuperAdminOrDenyDelete
 from ..models.season_model import Season
+from ..serializers.fixture_serializer import FixtureGenerationSerializer
+from ..serializers.projection_serializer import TeamProjectionSerializer
 from ..serializers.season_serializer import SeasonSerializer
-from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
+from ..serializers.standings_snapshot_serializer import StandingsSnapshotSerializer
+from ..services.fixture_service import generate_season_fixtures
+from ..services.projection_service import season_projection
+from ..services.standings_service import standings_as_of
+from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView, DeferredDeleteMixin
 
 
-class SeasonListCreateView(BaseListCreateView):
+class SeasonListCreateView(DeferredDeleteMixin, BaseListCreateView):
     queryset = Season.objects.all()
     serializer_class = SeasonSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
 
 
-class SeasonDetailView(BaseRetrieveUpdateDestroyView):
+class SeasonDetailView(DeferredDeleteMixin, BaseRetrieveUpdateDestroyView):
     queryset = Season.objects.all()
     serializer_class = SeasonSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
+
+
+class SeasonStandingsView(generics.GenericAPIView):
+    """League table of a season after the last matchday on or before ``?as_of=YYYY-MM-DD``."""
+    queryset = Season.objects.live()
+    serializer_class = StandingsSnapshotSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        season = self.get_object()
+        as_of = request.query_params.get('as_of')
+        if as_of is not None:
+            try:
+                as_of = parse_date(as_of)
+            except ValueError:
+                as_of = None
+            if as_of is None:
+                raise ValidationError({'as_of': 'Use the YYYY-MM-DD format.'})
+
+        snapshot = standings_as_of(season.pk, as_of)
+        if snapshot is None:
+            return Response({'season': season.pk, 'as_of': None, 'standings': []})
+        return Response(self.get_serializer(snapshot).data)
+
+
+class SeasonGenerateFixturesView(generics.GenericAPIView):
+    """Generate a season's double round-robin between its league's teams in one insert."""
+    queryset = Season.objects.live().select_related('league')
+    serializer_class = FixtureGenerationSerializer
+    permission_classes = [IsSuperAdmin]
+
+    def post(self, request, *args, **kwargs):
+        season = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            matches = generate_season_fixtures(season, user=request.user, **serializer.validated_data)
+        except ValueError as error:
+            raise ValidationError({'detail': str(error)})
+        return Response(
+            {
+                'season': season.pk,
+                'created': len(matches),
+                'first_match': matches[0].match_date,
+                'last_match': matches[-1].match_date,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+
+DEFAULT_RELEGATION_PLACES = 3
+
+
+class SeasonProjectionsView(generics.GenericAPIView):
+    """Title and relegation probabilities from simulating the season's remaining fixtures.
+
+    ``?relegation_places=`` sets how many teams go down (3 by default).
+    Projections are computed in the background when results change; until
+    the first one is ready the view answers 202.
+    """
+    queryset = Season.objects.live()
+    serializer_class = TeamProjectionSerializer
+    permission_classes = [IsSuperAdminOrDenyDelete]
+
+    def get(self, request, *args, **kwargs):
+        season = self.get_object()
+        try:
+            relegation_places = int(request.query_params.get('relegation_places', DEFAULT_RELEGATION_PLACES))
+        except ValueError:
+            raise ValidationError({'relegation_places': 'Enter a whole number.'})
+        if relegation_places < 0:
+            raise ValidationError({'relegation_places': 'Enter zero or more.'})
+
+        projection = season_projection(season.pk)
+        if projection is None:
+            return Response({'detail': 'Projections are being computed.'}, status=status.HTTP_202_ACCEPTED, headers={'Retry-After': '10'})
+        teams = [
+            {
+                **team,
+                'title_probability': team['position_probabilities'][0] if team['position_probabilities'] else 0,
+                'relegation_probability': round(sum(team['position_probabilities'][-relegation_places:]) if relegation_places else 0, 4),
+            }
+            for team in projection['teams']
+        ]
+        return Response({**projection, 'teams': self.get_serializer(teams, many=True).data})
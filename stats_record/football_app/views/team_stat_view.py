@@ -1,15 +1,29 @@
 from .permissions import IsSuperAdminOrDenyDelete
 from ..models import TeamStats
 from ..serializers import TeamStatsSerializer
+from ..services.freeze_service import schedule_refreeze
 from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
 
 class TeamStatsListCreateView(BaseListCreateView):
-    queryset = TeamStats.objects.all()
+    queryset = TeamStats.objects.select_related('team_name').prefetch_related('players')
     serializer_class = TeamStatsSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        schedule_refreeze([serializer.instance.season_id])
+
 class TeamStatsDetailView(BaseRetrieveUpdateDestroyView):
-    queryset = TeamStats.objects.all()
+    queryset = TeamStats.objects.select_related('team_name').prefetch_related('players')
     serializer_class = TeamStatsSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
-    
\ No newline at end of file
+
+    def perform_update(self, serializer):
+        previous_season_id = serializer.instance.season_id
+        super().perform_update(serializer)
+        schedule_refreeze({previous_season_id, serializer.instance.season_id})
+
+    def perform_destroy(self, instance):
+        season_id = instance.season_id
+        super().perform_destroy(instance)
+        schedule_refreeze([season_id])
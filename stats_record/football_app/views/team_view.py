@@ -1,15 +1,15 @@
 from .permissions import IsSuperAdminOrDenyDelete
 from rest_framework import status
-from requests import Response
+from rest_framework.response import Response
 from ..models import Team
 from ..serializers import TeamSerializer
-from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView
+from .base_view import BaseListCreateView, BaseRetrieveUpdateDestroyView, DeferredDeleteMixin
 
-class TeamListCreateView(BaseListCreateView):
+class TeamListCreateView(DeferredDeleteMixin, BaseListCreateView):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
 
-class TeamDetailView(BaseRetrieveUpdateDestroyView):
+class TeamDetailView(DeferredDeleteMixin, BaseRetrieveUpdateDestroyView):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = [IsSuperAdminOrDenyDelete]
@@ -0,0 +1,32 @@
+"""Gunicorn configuration for the API workers.
+
+Run with ``gunicorn -c gunicorn.conf.py stats_record.wsgi``.
+"""
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+
+# Prometheus multiprocess mode: every worker writes its samples here.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    # Samples of workers from a previous run would be aggregated forever.
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    # Open database connections before the worker accepts its first request.
+    from football_app.db_pool import prewarm_connections
+
+    prewarm_connections()
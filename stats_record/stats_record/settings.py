@@ -11,17 +11,21 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+
+from django.core.exceptions import ImproperlyConfigured
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Load environment variables from .env file
+# Load environment variables from .env file (production workers get them from the environment)
 env_path = Path('.') / '.env'
-load_dotenv(dotenv_path=env_path)
+if env_path.exists():
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
 
 
 # Quick-start development settings - unsuitable for production
@@ -51,6 +55,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 # Third Party Apps
@@ -73,13 +78,17 @@ LOCAL_APPS = ["football_app"]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'football_app.middleware.metrics_middleware.PrometheusMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'football_app.middleware.query_budget_middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'football_app.middleware.profiling_middleware.ProfilingMiddleware',
+    'football_app.middleware.replica_middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'stats_record.urls'
@@ -133,6 +142,106 @@ else:
     }
 }
 
+# Read replicas: comma-separated hosts, or SQLite file names when DEVELOPMENT is on.
+# GET requests to football_app views read from them (see football_app.db_router).
+DATABASE_REPLICA_ALIASES = []
+for index, replica in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{index}'
+    if DEVELOPMENT:
+        DATABASES[alias] = {**DATABASES['default'], 'NAME': BASE_DIR / replica.strip()}
+    else:
+        DATABASES[alias] = {**DATABASES['default'], 'HOST': replica.strip()}
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICA_ALIASES.append(alias)
+
+DATABASE_ROUTERS = ['football_app.db_router.PrimaryReplicaRouter']
+
+# Connection reuse, per environment:
+#   'persistent' (default): keep connections for DB_CONN_MAX_AGE seconds, health-checked before reuse
+#   'pool': psycopg 3 connection pool (psycopg[pool]), PostgreSQL only
+#   'off': a new connection (and TLS handshake) for every request
+DB_CONNECTION_MODE = os.environ.get('DB_CONNECTION_MODE', 'persistent')
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 300))
+DB_POOL_OPTIONS = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+}
+
+if DB_CONNECTION_MODE == 'pool' and find_spec('psycopg_pool') is None:
+    raise ImproperlyConfigured("DB_CONNECTION_MODE='pool' needs psycopg[pool] (see requirements.txt).")
+
+for database in DATABASES.values():
+    use_pool = DB_CONNECTION_MODE == 'pool' and database['ENGINE'] == 'django.db.backends.postgresql'
+    if use_pool:
+        database['OPTIONS'] = {**database.get('OPTIONS', {}), 'pool': DB_POOL_OPTIONS}
+    elif DB_CONNECTION_MODE != 'off':
+        database['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+        database['CONN_HEALTH_CHECKS'] = True
+
+# Seconds during which a user's reads stay on the primary after a write (read-your-writes)
+REPLICA_STICKINESS_SECONDS = int(os.environ.get('REPLICA_STICKINESS_SECONDS', 15))
+
+# Cache
+# Backends are wrapped to export hit/miss counts to Prometheus (see football_app.cache)
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'football_app.cache.InstrumentedRedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'football_app.cache.InstrumentedLocMemCache',
+        }
+    }
+
+# Celery runs background jobs such as the batched deletes of leagues, seasons and teams.
+# Without a broker (local development) tasks run inline in the request.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
+# Prometheus metrics; set PROMETHEUS_MULTIPROC_DIR when running several gunicorn workers
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+
+def _git_revision(git_dir):
+    """The checked-out commit, read from the repository files rather than by running git at startup."""
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+        if not head.startswith('ref: '):
+            return head[:12]
+        ref = head.removeprefix('ref: ')
+        if (git_dir / ref).exists():
+            return (git_dir / ref).read_text().strip()[:12]
+        for line in (git_dir / 'packed-refs').read_text().splitlines():
+            if line.endswith(f' {ref}'):
+                return line.split()[0][:12]
+    except OSError:
+        pass
+    return None
+
+
+# Deployed code version; invalidates the precomputed OpenAPI schema (manage.py generate_openapi_schema).
+# Defaults to the checked-out git commit; 'dev' when neither is known, and the schema is then revalidated on every use.
+CODE_VERSION = os.environ.get('CODE_VERSION') or _git_revision(BASE_DIR.parent / '.git') or 'dev'
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', BASE_DIR / 'openapi')
+OPENAPI_SCHEMA_MAX_AGE = int(os.environ.get('OPENAPI_SCHEMA_MAX_AGE', 86400))
+
+# Monte Carlo season projections: simulations per projection and worker processes sharing them
+SEASON_PROJECTION_SIMULATIONS = int(os.environ.get('SEASON_PROJECTION_SIMULATIONS', 20000))
+SEASON_PROJECTION_WORKERS = int(os.environ.get('SEASON_PROJECTION_WORKERS', min(4, os.cpu_count() or 1)))
+
+# On-demand profiling (?_profile=1, superadmins only); profiles are also written here when set
+PROFILE_STORAGE_DIR = os.environ.get('PROFILE_STORAGE_DIR')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -141,11 +250,40 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Also answers 412 when a save loses an optimistic-concurrency race, see football_app.models.base_model
+    'EXCEPTION_HANDLER': 'football_app.views.base_view.exception_handler',
+    # Sliding-window limits counted in the cache (Redis), see football_app.throttling
+    'DEFAULT_THROTTLE_CLASSES': (
+        'football_app.throttling.AnonThrottle',
+        'football_app.throttling.UserThrottle',
+        'football_app.throttling.ScopedThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.environ.get('THROTTLE_RATE_ANON', '60/min'),
+        'user': os.environ.get('THROTTLE_RATE_USER', '600/min'),
+        'login': os.environ.get('THROTTLE_RATE_LOGIN', '10/min'),
+        'export': os.environ.get('THROTTLE_RATE_EXPORT', '60/hour'),
+    },
 }
 
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
+    'USER_ID_FIELD': 'user_id',
+}
+
+# Per-request query budgets, keyed by URL name (see QueryBudgetMiddleware)
+QUERY_BUDGET = {
+    'DEFAULT': {
+        'queries': int(os.environ.get('QUERY_BUDGET_QUERIES', 50)),
+        'db_time_ms': float(os.environ.get('QUERY_BUDGET_DB_TIME_MS', 250)),
+    },
+    'VIEWS': {
+        'player-stats-list-create': {'queries': 20, 'db_time_ms': 500},
+        'team-stats-list-create': {'queries': 20, 'db_time_ms': 500},
+    },
+    'SLOWEST_STATEMENTS': 5,
+    'SERVER_TIMING': os.environ.get('SERVER_TIMING', 'True').lower() == 'true',
 }
 
 # Password validation
@@ -179,13 +317,19 @@ AWS_S3_OBJECT_PARAMETERS = {
 
 AWS_LOCATION = 'static'
 
-# Static files storage
-STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
-STATIC_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/{AWS_LOCATION}/'
+# Media files (e.g. frozen season artefacts) go to S3 when a bucket is configured, else to MEDIA_ROOT
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+if AWS_STORAGE_BUCKET_NAME:
+    DEFAULT_STORAGE = {'BACKEND': 'storages.backends.s3boto3.S3Boto3Storage', 'OPTIONS': {'location': 'media'}}
+    MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/media/'
+else:
+    DEFAULT_STORAGE = {'BACKEND': 'django.core.files.storage.FileSystemStorage'}
+    MEDIA_URL = '/media/'
 
-# Media files storage
-DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
-MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/media/'
+STORAGES = {
+    'default': DEFAULT_STORAGE,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
 
 
 # Internationalization
@@ -0,0 +1,48 @@
+"""
+Settings profile for API workers.
+
+Loads only what serving the JSON API needs: no admin, API documentation,
+sessions, messages, browsable API or apps that no request path uses, which
+keeps cold starts short when autoscaling. The admin and the documentation are
+served by a separate process running the full ``stats_record.settings``.
+
+Use with ``DJANGO_SETTINGS_MODULE=stats_record.settings_api``; measure with
+``python manage.py profile_startup --profile stats_record.settings_api``.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+API_WORKER_EXCLUDED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_countries',
+    'phonenumber_field',
+    'corsheaders',
+    'djoser',
+    'djcelery_email',
+    'drf_yasg',
+    'rest_framework.authtoken',
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_WORKER_EXCLUDED_APPS]
+
+# JWT only: no session, CSRF or message handling.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    )
+]
+
+ROOT_URLCONF = 'stats_record.urls_api'
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+}
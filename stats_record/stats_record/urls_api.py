@@ -0,0 +1,77 @@
+"""
+URL configuration of the API itself.
+
+Served alone by API workers running ``stats_record.settings_api``; the full
+``stats_record.urls`` adds the admin and the API documentation on top.
+"""
+from django.urls import path
+from football_app.views.player_stat_view import (
+    PlayerStatsBatchIncrementView,
+    PlayerStatsDetailView,
+    PlayerStatsIncrementView,
+    PlayerStatsListCreateView,
+)
+from football_app.views.team_view import TeamListCreateView, TeamDetailView
+from football_app.views.team_stat_view import TeamStatsListCreateView, TeamStatsDetailView
+from football_app.views.user_view import UserListCreateView, UserDetailView
+from football_app.views.registration_and_login import LoginView, RegisterView
+from football_app.views.match_view import MatchDetailView, MatchListCreateView, MatchTeamStatsView
+from football_app.views.league_view import LeagueDetailView, LeagueListCreateView
+from football_app.views.search_view import SearchView
+from football_app.views.fixture_view import FixtureListView, league_fixtures_calendar, team_fixtures_calendar
+from football_app.views.frozen_season_view import SeasonFreezeView, frozen_season_artefact
+from football_app.views.player_view import (
+    PlayerCareerView,
+    PlayerCompareView,
+    PlayerDetailView,
+    PlayerListCreateView,
+    SimilarPlayersView,
+)
+from football_app.views.season_view import (
+    SeasonDetailView,
+    SeasonGenerateFixturesView,
+    SeasonListCreateView,
+    SeasonProjectionsView,
+    SeasonStandingsView,
+)
+from football_app.views.metrics_view import metrics_view
+from football_app.views.rating_view import LeagueRatingsView, TeamRatingHistoryView
+
+urlpatterns = [
+    path('register/', RegisterView.as_view(), name='register'),
+    path('login/', LoginView.as_view(), name='login'),
+    path('player-stats/', PlayerStatsListCreateView.as_view(), name='player-stats-list-create'),
+    path('player-stats/<uuid:pk>/', PlayerStatsDetailView.as_view(), name='player-stats-detail'),
+    path('player-stats/<uuid:pk>/increment/', PlayerStatsIncrementView.as_view(), name='player-stats-increment'),
+    path('player-stats/increments/', PlayerStatsBatchIncrementView.as_view(), name='player-stats-batch-increment'),
+    path('teams/', TeamListCreateView.as_view(), name='team-list-create'),
+    path('teams/<uuid:pk>/', TeamDetailView.as_view(), name='team-detail'),
+    path('teams/<uuid:pk>/rating-history/', TeamRatingHistoryView.as_view(), name='team-rating-history'),
+    path('team-stats/', TeamStatsListCreateView.as_view(), name='team-stats-list-create'),
+    path('team-stats/<uuid:pk>/', TeamStatsDetailView.as_view(), name='team-stats-detail'),
+    path('users/', UserListCreateView.as_view(), name='user-list-create'),
+    path('users/<uuid:pk>/', UserDetailView.as_view(), name='user-detail'),
+    path('matches/', MatchListCreateView.as_view(), name='match-list-create'),
+    path('matches/<uuid:pk>/', MatchDetailView.as_view(), name='match-detail'),
+    path('matches/<uuid:pk>/team-stats/', MatchTeamStatsView.as_view(), name='match-team-stats'),
+    path('leagues/', LeagueListCreateView.as_view(), name='league-list-create'),
+    path('leagues/<uuid:pk>/', LeagueDetailView.as_view(), name='league-detail'),
+    path('leagues/<uuid:pk>/ratings/', LeagueRatingsView.as_view(), name='league-ratings'),
+    path('players/', PlayerListCreateView.as_view(), name='player-list-create'),
+    path('players/compare/', PlayerCompareView.as_view(), name='player-compare'),
+    path('players/<uuid:pk>/', PlayerDetailView.as_view(), name='player-detail'),
+    path('players/<uuid:pk>/career/', PlayerCareerView.as_view(), name='player-career'),
+    path('players/<uuid:pk>/similar/', SimilarPlayersView.as_view(), name='player-similar'),
+    path('seasons/', SeasonListCreateView.as_view(), name='season-list-create'),
+    path('seasons/<uuid:pk>/', SeasonDetailView.as_view(), name='season-detail'),
+    path('seasons/<uuid:pk>/standings/', SeasonStandingsView.as_view(), name='season-standings'),
+    path('seasons/<uuid:pk>/frozen/', SeasonFreezeView.as_view(), name='season-frozen'),
+    path('seasons/<uuid:pk>/frozen/<str:filename>', frozen_season_artefact, name='frozen-season-artefact'),
+    path('seasons/<uuid:pk>/projections/', SeasonProjectionsView.as_view(), name='season-projections'),
+    path('seasons/<uuid:pk>/generate-fixtures/', SeasonGenerateFixturesView.as_view(), name='season-generate-fixtures'),
+    path('fixtures/', FixtureListView.as_view(), name='fixture-list'),
+    path('teams/<uuid:pk>/fixtures.ics', team_fixtures_calendar, name='team-fixtures-calendar'),
+    path('leagues/<uuid:pk>/fixtures.ics', league_fixtures_calendar, name='league-fixtures-calendar'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('metrics', metrics_view, name='metrics'),
+]